@@ -0,0 +1,90 @@
+"""
+Benchmark de carga de eventos.
+
+Genera un data.json grande (eventos de 1 a 4 horas que empiezan en horas en punto
+elegidas al azar a lo largo de un año, como los que crea la UI) y mide Scheduler.load_events con el parseo rápido de fechas
+(fromisoformat + memo) frente al parseo con dateutil para cada texto.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_load [--events 20000] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dateutil.parser import parse
+
+import hotel_planner.models.event as event_module
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.models.resource import Item, Room
+
+
+def build_payload(n: int, seed: int = 1) -> dict:
+    rnd = random.Random(seed)
+    base = datetime(2026, 1, 1, 8, 0)
+    rooms = [f"Sala {i}" for i in range(40)]
+    events = []
+    for i in range(n):
+        start = base + timedelta(hours=rnd.randint(0, 24 * 365))
+        end = start + timedelta(hours=rnd.randint(1, 4))
+        events.append({
+            "name": f"Evento {i}",
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "resources": [{"name": rnd.choice(rooms).lower(), "quantity": 1},
+                          {"name": "silla", "quantity": rnd.randint(1, 20)}],
+            "recurrence": None,
+        })
+    return {"version": 1, "events": events}
+
+
+def build_inventory() -> Inventory:
+    inv = Inventory()
+    for i in range(40):
+        inv.add_resource(Room(f"Sala {i}", capacity=50))
+    inv.add_resource(Item("Silla", quantity=100000))
+    return inv
+
+
+def time_load(path: Path, repeat: int, validate: bool) -> float:
+    best = None
+    for _ in range(repeat):
+        event_module._PARSE_MEMO.clear()
+        sched = Scheduler(build_inventory())
+        t0 = time.perf_counter()
+        sched.load_events(path, validate=validate)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--events", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.json"
+        path.write_text(json.dumps(build_payload(args.events)), encoding="utf-8")
+        print(f"{args.events} eventos, mejor de {args.repeat} ({path.stat().st_size / 1e6:.1f} MB)")
+
+        for validate in (False, True):
+            fast = time_load(path, args.repeat, validate)
+            original = event_module.parse_datetime
+            event_module.parse_datetime = parse   # línea base: dateutil para todo
+            try:
+                slow = time_load(path, args.repeat, validate)
+            finally:
+                event_module.parse_datetime = original
+            label = "validate=True " if validate else "validate=False"
+            print(f"  {label}  dateutil: {slow:.3f}s  fromisoformat+memo: {fast:.3f}s  (x{slow / fast:.1f})")
+
+
+if __name__ == "__main__":
+    main()
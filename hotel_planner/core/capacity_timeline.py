@@ -0,0 +1,162 @@
+"""
+Línea temporal de ocupación de un recurso.
+
+Función escalonada guardada como treap de fronteras: cada nodo es un instante con
+la variación neta de cantidad reservada (+q al empezar un evento, -q al acabar).
+Cada subárbol mantiene la suma de variaciones y el máximo prefijo, de modo que
+"máximo reservado a la vez en [start, end)" se calcula en O(log n).
+Las claves pueden ser cualquier valor ordenable; el Scheduler usa enteros
+(segundos desde EPOCH, ver Event.start_ts).
+"""
+from hotel_planner.core import treap
+
+
+class _BoundaryNode(treap.TreapNode):
+    __slots__ = ("delta", "total", "best")
+
+    def __init__(self, key, delta):
+        super().__init__(key)
+        self.delta = delta
+        self.total = delta   # suma de deltas del subárbol
+        self.best = delta    # máximo prefijo (no vacío) del subárbol en orden
+
+    def pull(self):
+        left, right = self.left, self.right
+        if left is None:
+            total = self.delta
+            best = total
+        else:
+            total = left.total + self.delta
+            best = left.best if left.best > total else total
+        if right is not None:
+            if total + right.best > best:
+                best = total + right.best
+            total += right.total
+        self.total = total
+        self.best = best
+
+
+class CapacityTimeline:
+    """Ocupación acumulada de un recurso a lo largo del tiempo (intervalos [start, end))."""
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __repr__(self):
+        return f"<CapacityTimeline: {self._size} fronteras>"
+
+    def _apply(self, key, delta):
+        if not delta:
+            return
+        self._root, node = treap.erase(self._root, key)
+        if node is not None:
+            self._size -= 1
+            delta += node.delta
+        if delta:
+            self._root = treap.insert(self._root, _BoundaryNode(key, delta))
+            self._size += 1
+
+    def add(self, start, end, quantity: int):
+        """Reserva quantity unidades durante [start, end)."""
+        self._apply(start, quantity)
+        self._apply(end, -quantity)
+
+    def remove(self, start, end, quantity: int):
+        """Deshace una reserva previa de add()."""
+        self._apply(start, -quantity)
+        self._apply(end, quantity)
+
+    def extend(self, boundaries):
+        """
+        Aplica muchas fronteras (instante, delta) de golpe. Con la línea vacía agrupa
+        por instante, ordena una vez y construye el árbol equilibrado en O(n log n).
+        """
+        if self._root is not None:
+            for key, delta in boundaries:
+                self._apply(key, delta)
+            return
+        merged = {}
+        for key, delta in boundaries:
+            merged[key] = merged.get(key, 0) + delta
+        nodes = [_BoundaryNode(key, delta) for key, delta in sorted(merged.items()) if delta]
+        self._root = treap.build(nodes)
+        self._size = len(nodes)
+
+    def level_at(self, t) -> int:
+        """Cantidad reservada en el instante t (suma de fronteras <= t)."""
+        total = 0
+        node = self._root
+        while node is not None:
+            if node.key <= t:
+                total += node.delta
+                if node.left is not None:
+                    total += node.left.total
+                node = node.right
+            else:
+                node = node.left
+        return total
+
+    def max_over(self, start, end) -> int:
+        """Máximo reservado simultáneamente en algún instante de [start, end)."""
+        if self._root is None or start >= end:
+            return 0
+        before, rest = treap.split(self._root, start)
+        inside, after = treap.split(rest, end)
+        base = before.total if before is not None else 0
+        if inside is None:
+            peak = base
+        else:
+            # si hay frontera exactamente en start, el nivel previo no cuenta
+            first = inside
+            while first.left is not None:
+                first = first.left
+            peak = base + inside.best
+            if first.key != start and base > peak:
+                peak = base
+        self._root = treap.merge(treap.merge(before, inside), after)
+        return peak
+
+    def boundaries(self, start=None, end=None):
+        """Itera (instante, delta) de las fronteras en [start, end) en orden."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                if start is not None and node.key < start:
+                    node = node.right
+                    continue
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if end is not None and node.key >= end:
+                break
+            yield (node.key, node.delta)
+            node = node.right
+
+    def segments(self, start, end):
+        """
+        Recorre la función escalonada en [start, end) y produce tramos
+        (seg_start, seg_end, nivel) contiguos que cubren todo el rango.
+        """
+        if start >= end:
+            return
+        level = self.level_at(start)
+        cursor = start
+        for t, delta in self.boundaries(start, end):
+            if t == start:
+                continue   # ya incluida en level_at(start)
+            if t > cursor:
+                yield (cursor, t, level)
+                cursor = t
+            level += delta
+        if cursor < end:
+            yield (cursor, end, level)
@@ -0,0 +1,206 @@
+"""
+Espejo columnar de la agenda para analítica y validación masiva.
+
+Los eventos concretos (Scheduler.events_sorted) se copian a arrays de NumPy:
+  - start / end: int64 con segundos desde EPOCH (Event.start_ts / end_ts);
+  - name_ids: id entero de cada nombre de evento (names[i] es el texto);
+  - recursos en formato CSR: los recursos del evento i son res_ids[res_ptr[i]:res_ptr[i+1]]
+    con cantidades res_qty en las mismas posiciones (resources[id] es el nombre).
+Las consultas sobre todo el conjunto (solapes, uso por recurso, picos y conflictos de
+capacidad) se resuelven con operaciones vectorizadas en lugar de bucles por evento.
+Las repeticiones de eventos recurrentes no se incluyen: sólo los eventos guardados
+(occupancy acepta intervalos extra para que el Scheduler las añada).
+"""
+import numpy as np
+
+from hotel_planner.models.event import as_epoch
+
+
+class ColumnarEvents:
+    """Instantánea columnar (inmutable) de una lista de eventos ordenada por inicio."""
+
+    def __init__(self, events):
+        self.events = list(events)
+        n = len(self.events)
+        self.start = np.fromiter((ev.start_ts for ev in self.events), dtype=np.int64, count=n)
+        self.end = np.fromiter((ev.end_ts for ev in self.events), dtype=np.int64, count=n)
+
+        self.names = []
+        name_ids = {}
+        self.resources = []
+        self.resource_ids = {}
+        counts = np.zeros(n, dtype=np.int64)
+        ids, qtys = [], []
+        event_name_ids = []
+        for i, ev in enumerate(self.events):
+            nid = name_ids.get(ev.name)
+            if nid is None:
+                nid = name_ids[ev.name] = len(self.names)
+                self.names.append(ev.name)
+            event_name_ids.append(nid)
+            counts[i] = len(ev.quantities)
+            for rname, qty in ev.quantities.items():
+                rid = self.resource_ids.get(rname)
+                if rid is None:
+                    rid = self.resource_ids[rname] = len(self.resources)
+                    self.resources.append(rname)
+                ids.append(rid)
+                qtys.append(qty)
+        self.name_ids = np.asarray(event_name_ids, dtype=np.int64)
+        self.res_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.res_ptr[1:])
+        self.res_ids = np.asarray(ids, dtype=np.int64)
+        self.res_qty = np.asarray(qtys, dtype=np.int64)
+        # evento al que pertenece cada entrada del CSR
+        self.res_event = np.repeat(np.arange(n, dtype=np.int64), counts)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __repr__(self):
+        return f"<ColumnarEvents: {len(self)} eventos, {len(self.resources)} recursos>"
+
+    # ----------------------------
+    # Solapes
+    # ----------------------------
+    def overlapping_mask(self, start, end) -> np.ndarray:
+        """Máscara booleana de los eventos que solapan [start, end) (datetime o segundos)."""
+        start, end = as_epoch(start), as_epoch(end)
+        return (self.start < end) & (self.end > start)
+
+    def overlapping(self, start, end) -> list:
+        """Eventos que solapan [start, end), en orden de inicio."""
+        return [self.events[i] for i in np.flatnonzero(self.overlapping_mask(start, end))]
+
+    def overlap_counts(self) -> np.ndarray:
+        """
+        Para cada evento, cuántos otros eventos lo solapan (sin mirar recursos):
+        inicios < fin_i menos finales <= inicio_i, con dos búsquedas binarias vectorizadas.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        starts = np.sort(self.start)
+        ends = np.sort(self.end)
+        began = np.searchsorted(starts, self.end, side="left")
+        finished = np.searchsorted(ends, self.start, side="right")
+        return began - finished - 1
+
+    # ----------------------------
+    # Uso por recurso
+    # ----------------------------
+    def resource_usage(self, resource_name: str, start, end) -> int:
+        """Suma de cantidades de los eventos que usan el recurso y solapan [start, end)."""
+        rid = self.resource_ids.get(resource_name.lower().strip())
+        if rid is None:
+            return 0
+        start, end = as_epoch(start), as_epoch(end)
+        sel = self.res_ids == rid
+        ev_idx = self.res_event[sel]
+        hit = (self.start[ev_idx] < end) & (self.end[ev_idx] > start)
+        return int(self.res_qty[sel][hit].sum())
+
+    def _boundaries(self):
+        """Fronteras (recurso, instante, delta) ordenadas por recurso, instante y cierres primero."""
+        res = np.concatenate([self.res_ids, self.res_ids])
+        times = np.concatenate([self.start[self.res_event], self.end[self.res_event]])
+        deltas = np.concatenate([self.res_qty, -self.res_qty])
+        order = np.lexsort((deltas, times, res))
+        return res[order], times[order], deltas[order]
+
+    def peak_usage(self) -> dict:
+        """Máximo uso simultáneo de cada recurso en todo el conjunto: {recurso: pico}."""
+        if not len(self.res_ids):
+            return {}
+        res, _, deltas = self._boundaries()
+        level = np.cumsum(deltas)
+        # reiniciar la suma acumulada al empezar cada recurso
+        group_start = np.flatnonzero(np.r_[True, res[1:] != res[:-1]])
+        offsets = np.r_[0, level[group_start[1:] - 1]]
+        level -= np.repeat(offsets, np.diff(np.r_[group_start, len(res)]))
+        peaks = np.maximum.reduceat(level, group_start)
+        return {self.resources[r]: int(p) for r, p in zip(res[group_start], peaks)}
+
+    def conflicts(self, capacities: dict) -> list:
+        """
+        Recursos cuyo pico supera su capacidad: [(recurso, pico, capacidad), ...].
+        capacities: {recurso_normalizado: cantidad total}; los recursos sin capacidad conocida se ignoran.
+        """
+        out = []
+        for name, peak in self.peak_usage().items():
+            total = capacities.get(name)
+            if total is not None and peak > total:
+                out.append((name, peak, int(total)))
+        return sorted(out)
+
+    # ----------------------------
+    # Matriz recurso x franja
+    # ----------------------------
+    def occupancy(self, rows, start, end, bucket: int, extra=None) -> np.ndarray:
+        """
+        Matriz (len(rows) x franjas) con el pico de uso simultáneo de cada recurso en cada franja
+        [start + b*bucket, start + (b+1)*bucket) (como _peak_reserved por franja: dos reservas
+        seguidas de una habitación cuentan 1, no 2).
+        rows: nombres de recurso normalizados (uno por fila). bucket: segundos por franja.
+        extra: arrays (fila, inicio, fin, cantidad) de intervalos adicionales (p. ej. repeticiones).
+        Se hace un barrido de fronteras por fila como en peak_usage (cierres antes que aperturas) y
+        se toma, en cada franja, el máximo entre el nivel con el que entra y los niveles que alcanza
+        dentro: O(entradas log entradas + filas x franjas) sin bucles de Python.
+        """
+        start, end = as_epoch(start), as_epoch(end)
+        n_buckets = max(0, -((start - end) // bucket))
+        if not n_buckets:
+            return np.zeros((len(rows), 0), dtype=np.int64)
+        row_of = np.full(len(self.resources), -1, dtype=np.int64)
+        for row, name in enumerate(rows):
+            rid = self.resource_ids.get(name)
+            if rid is not None:
+                row_of[rid] = row
+
+        entry_rows = row_of[self.res_ids] if len(self.res_ids) else np.zeros(0, dtype=np.int64)
+        entry_start = self.start[self.res_event]
+        entry_end = self.end[self.res_event]
+        entry_qty = self.res_qty
+        if extra is not None:
+            x_rows, x_start, x_end, x_qty = (np.asarray(a, dtype=np.int64) for a in extra)
+            entry_rows = np.concatenate([entry_rows, x_rows])
+            entry_start = np.concatenate([entry_start, x_start])
+            entry_end = np.concatenate([entry_end, x_end])
+            entry_qty = np.concatenate([entry_qty, x_qty])
+
+        keep = (entry_rows >= 0) & (entry_start < end) & (entry_end > start)
+        rows_k, qty = entry_rows[keep], entry_qty[keep]
+        closes = entry_end[keep] < end   # los cierres en o tras end no afectan a ninguna franja
+        res = np.concatenate([rows_k, rows_k[closes]])
+        times = np.concatenate([np.maximum(entry_start[keep], start), entry_end[keep][closes]])
+        deltas = np.concatenate([qty, -qty[closes]])
+        order = np.lexsort((deltas, times, res))
+        res, times, deltas = res[order], times[order], deltas[order]
+
+        matrix = np.zeros((len(rows), n_buckets), dtype=np.int64)
+        if not len(res):
+            return matrix
+        level = np.cumsum(deltas)
+        group_start = np.flatnonzero(np.r_[True, res[1:] != res[:-1]])
+        offsets = np.r_[0, level[group_start[1:] - 1]]
+        level -= np.repeat(offsets, np.diff(np.r_[group_start, len(res)]))
+        # sólo cuenta el nivel tras la última frontera de cada instante (los parciales no existen)
+        final = np.r_[(res[1:] != res[:-1]) | (times[1:] != times[:-1]), True]
+        res, times, level = res[final], times[final], level[final]
+        cols = (times - start) // bucket
+        # niveles alcanzados dentro de cada franja
+        np.maximum.at(matrix, (res, cols), level)
+        # nivel con el que entra cada franja: el último de la franja anterior con fronteras,
+        # salvo que haya una frontera justo al inicio (entonces ya cuenta el nivel que deja ésta)
+        last = np.flatnonzero(np.r_[(res[1:] != res[:-1]) | (cols[1:] != cols[:-1]), True])
+        closing = np.zeros((len(rows), n_buckets), dtype=np.int64)
+        seen = np.full((len(rows), n_buckets), -1, dtype=np.int64)
+        closing[res[last], cols[last]] = level[last]
+        seen[res[last], cols[last]] = cols[last]
+        seen = np.maximum.accumulate(seen, axis=1)[:, :-1]
+        carried = np.where(seen >= 0, np.take_along_axis(closing, np.maximum(seen, 0), axis=1), 0)
+        on_edge = np.zeros((len(rows), n_buckets), dtype=bool)
+        edge = times == start + cols * bucket
+        on_edge[res[edge], cols[edge]] = True
+        carried[on_edge[:, 1:]] = 0
+        matrix[:, 1:] = np.maximum(matrix[:, 1:], carried)
+        return matrix
@@ -0,0 +1,138 @@
+"""
+Índice de intervalos por recurso.
+
+Treap ordenado por (start, end, id) y aumentado con el máximo 'end' de cada
+subárbol, de modo que "eventos que solapan [start, end)" se responde en
+O(log n + k) en lugar de recorrer todos los eventos del recurso.
+Los instantes son enteros (Event.start_ts / end_ts): las consultas reciben
+segundos desde EPOCH, no datetime.
+"""
+from hotel_planner.core import treap
+
+
+class _IntervalNode(treap.TreapNode):
+    __slots__ = ("event", "start", "end", "max_end")
+
+    def __init__(self, event, start, end):
+        super().__init__((start, end, id(event)))
+        self.event = event
+        self.start = start
+        self.end = end
+        self.max_end = end
+
+    def pull(self):
+        m = self.end
+        if self.left is not None and self.left.max_end > m:
+            m = self.left.max_end
+        if self.right is not None and self.right.max_end > m:
+            m = self.right.max_end
+        self.max_end = m
+
+
+class IntervalTree:
+    """
+    Conjunto de eventos indexado por su intervalo [start, end).
+    Se itera en orden de inicio; add/remove son O(log n) esperado.
+    """
+
+    def __init__(self, events=None):
+        self._root = None
+        self._keys = {}   # id(event) -> clave en el árbol
+        if events:
+            self.extend(events)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __bool__(self):
+        return bool(self._keys)
+
+    def __contains__(self, event):
+        return id(event) in self._keys
+
+    def __iter__(self):
+        for node in treap.iter_nodes(self._root):
+            yield node.event
+
+    def __repr__(self):
+        return f"<IntervalTree: {len(self)} eventos>"
+
+    def add(self, event):
+        """Añade un evento (ignora duplicados del mismo objeto)."""
+        if id(event) in self._keys:
+            return
+        node = _IntervalNode(event, event.start_ts, event.end_ts)
+        self._keys[id(event)] = node.key
+        self._root = treap.insert(self._root, node)
+
+    def extend(self, events):
+        """
+        Añade varios eventos. Si el árbol está vacío se construye equilibrado
+        de una vez (ordenar + enlazar) en lugar de insertar uno a uno.
+        """
+        if self._root is not None:
+            for ev in events:
+                self.add(ev)
+            return
+        nodes = []
+        for ev in events:
+            if id(ev) in self._keys:
+                continue
+            node = _IntervalNode(ev, ev.start_ts, ev.end_ts)
+            self._keys[id(ev)] = node.key
+            nodes.append(node)
+        nodes.sort(key=lambda n: n.key)
+        self._root = treap.build(nodes)
+
+    def remove(self, event):
+        """Elimina un evento; lanza ValueError si no estaba (como list.remove)."""
+        key = self._keys.pop(id(event), None)
+        if key is None:
+            raise ValueError("El evento no está en el índice")
+        self._root, _ = treap.erase(self._root, key)
+
+    def discard(self, event) -> bool:
+        try:
+            self.remove(event)
+            return True
+        except ValueError:
+            return False
+
+    def overlapping(self, start, end) -> list:
+        """Eventos cuyo intervalo solapa [start, end), ordenados por inicio."""
+        out = []
+        stack = []
+        node = self._root
+        # recorrido en orden con poda por max_end (izquierda) y por start (derecha)
+        while stack or node is not None:
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start >= end:
+                break
+            if node.end > start:
+                out.append(node.event)
+            node = node.right
+        return out
+
+    def containing(self, t) -> list:
+        """Eventos en curso en el instante t (start <= t < end), ordenados por inicio."""
+        out = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None and node.max_end > t:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start > t:
+                break
+            if node.end > t:
+                out.append(node.event)
+            node = node.right
+        return out
@@ -0,0 +1,212 @@
+"""
+Recurrencias de eventos.
+
+Un evento con recurrence "daily"/"diario" o "weekly"/"semanal" se repite cada
+periodo fijo a partir de su propia fecha, sin fecha de fin. Las repeticiones no
+se materializan: cada serie ocupa O(1) (evento base + periodo) y sus ocurrencias
+se generan bajo demanda sólo dentro de la ventana consultada, calculando
+directamente el primer y último índice que caen en ella.
+
+El evento base sigue en los índices normales del Scheduler (es la ocurrencia 0);
+aquí sólo se guardan las repeticiones (k >= 1), agrupadas por recurso.
+Otros valores ("monthly", "seasonal", "custom", "none") no tienen periodo fijo
+y se tratan como eventos sin repetición.
+
+Dos series chocan si alguna diferencia entre sus inicios cae dentro de la
+ventana de solape; como esas diferencias recorren exactamente los múltiplos del
+mcd de los periodos desplazados por la diferencia de fases, la existencia y la
+primera colisión se resuelven con aritmética modular, sin expandir nada.
+
+Todo se calcula en enteros (segundos desde EPOCH, como Event.start_ts).
+"""
+import math
+from datetime import timedelta
+
+PERIODS = {
+    "daily": timedelta(days=1),
+    "diario": timedelta(days=1),
+    "diaria": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "semanal": timedelta(weeks=1),
+}
+
+
+def recurrence_period(recurrence):
+    """Periodo fijo de una recurrencia (timedelta) o None si no se repite."""
+    if not recurrence or not isinstance(recurrence, str):
+        return None
+    return PERIODS.get(recurrence.lower().strip())
+
+
+class Series:
+    """Serie periódica de un evento: ocurrencia k = [start + k*period, end + k*period) en segundos."""
+    __slots__ = ("event", "start", "end", "period")
+
+    def __init__(self, event, period: timedelta):
+        self.event = event
+        self.start = event.start_ts
+        self.end = event.end_ts
+        self.period = int(period.total_seconds())
+
+    @classmethod
+    def from_event(cls, event):
+        period = recurrence_period(getattr(event, "recurrence", None))
+        return cls(event, period) if period is not None else None
+
+    def __repr__(self):
+        return f"<Series {self.event.name} cada {self.period}s>"
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    def occurrence(self, k: int):
+        shift = self.period * k
+        return (self.start + shift, self.end + shift)
+
+    def index_range(self, start: int, end: int, first: int = 1):
+        """Índices k >= first cuyas ocurrencias solapan [start, end) (range vacío si ninguna)."""
+        if start >= end:
+            return range(0)
+        lo = max(first, (start - self.end) // self.period + 1)
+        hi = -((self.start - end) // self.period) - 1
+        return range(lo, hi + 1)
+
+    def occurrences(self, start, end, first: int = 1):
+        """Genera (inicio, fin) de las ocurrencias k >= first que solapan [start, end)."""
+        for k in self.index_range(start, end, first):
+            yield self.occurrence(k)
+
+    def covered_seconds(self, start: int, end: int, first: int = 1) -> int:
+        """
+        Segundos de [start, end) cubiertos por las ocurrencias k >= first, en O(1): las intermedias
+        cuentan la duración entera y sólo la primera y la última pueden quedar recortadas.
+        """
+        ks = self.index_range(start, end, first)
+        if not ks:
+            return 0
+        total = 0
+        for k in {ks[0], ks[-1]}:
+            occ_start, occ_end = self.occurrence(k)
+            total += min(occ_end, end) - max(occ_start, start)
+        return total + max(0, len(ks) - 2) * self.duration
+
+    def first_collision(self, other: 'Series', first: int = 0, other_first: int = 0):
+        """
+        Primera pareja (i, j), con i >= first y j >= other_first, tal que la ocurrencia i de esta
+        serie solapa la ocurrencia j de other; None si nunca llegan a solaparse. O(1) en la práctica:
+        sólo se prueban los desfases compatibles, (duración_a + duración_b) / mcd(periodos) como mucho.
+
+        Con a_i = a + i*Pa y b_j = b + j*Pb solapan si -db < b_j - a_i < da. Esa diferencia vale
+        (b - a) + m*g con g = mcd(Pa, Pb) y m = j*(Pb/g) - i*(Pa/g); para cada m válido se despeja
+        (i, j) con el inverso modular y se toma la solución más temprana con índices admisibles.
+        """
+        pa, pb = self.period, other.period
+        da, db = self.duration, other.duration
+        offset = other.start - self.start
+        g = math.gcd(pa, pb)
+        qa, qb = pa // g, pb // g
+        inverse = pow(qb, -1, qa) if qa > 1 else 0
+        m_lo = (-db - offset) // g + 1
+        m_hi = -((offset - da) // g) - 1
+        best = None
+        for m in range(m_lo, m_hi + 1):
+            # j*qb - i*qa = m  ->  j ≡ m * qb^-1 (mod qa)
+            j0 = (m * inverse) % qa if qa > 1 else 0
+            i0 = (j0 * qb - m) // qa
+            t = max(-((i0 - first) // qb), -((j0 - other_first) // qa))
+            i, j = i0 + t * qb, j0 + t * qa
+            when = max(i * pa, offset + j * pb)
+            if best is None or when < best[0]:
+                best = (when, i, j)
+        return None if best is None else (best[1], best[2])
+
+    def collides_with(self, other: 'Series') -> bool:
+        """True si alguna ocurrencia de ambas series llega a solaparse."""
+        return self.first_collision(other) is not None
+
+
+class RecurrenceIndex:
+    """Series activas agrupadas por recurso normalizado, con la cantidad que usa cada una."""
+
+    def __init__(self):
+        self._by_resource = {}   # recurso -> {id(evento): (Series, cantidad)}
+        self._series = {}        # id(evento) -> (Series, [recursos])
+
+    def __len__(self):
+        return len(self._series)
+
+    def __bool__(self):
+        return bool(self._series)
+
+    def __contains__(self, event):
+        return id(event) in self._series
+
+    def add(self, series: Series, entries):
+        """Registra una serie; entries: [(recurso_normalizado, cantidad), ...]."""
+        key = id(series.event)
+        if key in self._series:
+            return
+        names = []
+        for rname, qty in entries:
+            self._by_resource.setdefault(rname, {})[key] = (series, int(qty))
+            names.append(rname)
+        self._series[key] = (series, names)
+
+    def discard(self, event) -> bool:
+        entry = self._series.pop(id(event), None)
+        if entry is None:
+            return False
+        for rname in entry[1]:
+            bucket = self._by_resource.get(rname)
+            if bucket is None:
+                continue
+            bucket.pop(id(event), None)
+            if not bucket:
+                del self._by_resource[rname]
+        return True
+
+    def has_resource(self, name) -> bool:
+        return name in self._by_resource
+
+    def series_for(self, name):
+        """Lista de (Series, cantidad) que usan el recurso."""
+        return list(self._by_resource.get(name, {}).values())
+
+    def occurrences(self, name, start, end):
+        """Genera (inicio, fin, cantidad, evento) de las repeticiones del recurso que solapan [start, end)."""
+        for series, qty in self._by_resource.get(name, {}).values():
+            for occ_start, occ_end in series.occurrences(start, end):
+                yield (occ_start, occ_end, qty, series.event)
+
+
+def overlay_segments(segments, occurrences, start, end):
+    """
+    Suma a una función escalonada (tramos contiguos (inicio, fin, nivel) que cubren
+    [start, end)) las ocurrencias (inicio, fin, cantidad, ...) recortadas a la ventana.
+    Devuelve los tramos resultantes, también contiguos.
+    """
+    deltas = {}
+    for occ in occurrences:
+        occ_start, occ_end, qty = occ[0], occ[1], occ[2]
+        occ_start = max(occ_start, start)
+        deltas[occ_start] = deltas.get(occ_start, 0) + qty
+        if occ_end < end:
+            deltas[occ_end] = deltas.get(occ_end, 0) - qty
+    if not deltas:
+        yield from segments
+        return
+    points = sorted(deltas.items())
+    i, extra = 0, 0
+    for seg_start, seg_end, level in segments:
+        cursor = seg_start
+        while i < len(points) and points[i][0] <= cursor:
+            extra += points[i][1]
+            i += 1
+        while i < len(points) and points[i][0] < seg_end:
+            t, delta = points[i]
+            yield (cursor, t, level + extra)
+            cursor = t
+            extra += delta
+            i += 1
+        yield (cursor, seg_end, level + extra)
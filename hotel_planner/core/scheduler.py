@@ -1,51 +1,202 @@
 import json
 import os
+import heapq
+import math
 from pathlib import Path
 from collections import defaultdict
-from bisect import bisect_left
-from datetime import timedelta
+from datetime import datetime, timedelta
+from itertools import islice
 
-from hotel_planner.models.resource import Resource, Room, Employee, Item, validate_resource_constraints
-from hotel_planner.models.event import Event
+from hotel_planner.models.event import Event, as_epoch, from_epoch, to_epoch, to_epoch_ceil
 from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.interval_tree import IntervalTree
+from hotel_planner.core.capacity_timeline import CapacityTimeline
+from hotel_planner.core.slot_search import SlotSearch
+from hotel_planner.core.sorted_events import SortedEventList
+from hotel_planner.core.recurrence import Series, RecurrenceIndex, overlay_segments
+from hotel_planner.core.usage_index import UsageIntegral
+
+_MAX_TS = to_epoch(datetime.max)
+
+
+def _seconds(delta: timedelta) -> int:
+    """Duración en segundos enteros, redondeando hacia arriba (un hueco nunca es más corto de lo pedido)."""
+    return -(-delta // timedelta(seconds=1))
+
+
+def _search_start(start_from) -> int:
+    """Inicio de búsqueda en segundos, redondeado hacia arriba: ningún hueco empieza antes de start_from."""
+    return start_from if isinstance(start_from, int) else to_epoch_ceil(start_from)
+
 
 class Scheduler:
     """Planificador de eventos.
     
     Mantiene índices en memoria (events_sorted, name_to_event, resource_index).
+    resource_index guarda por recurso un IntervalTree para consultar solapes en O(log n + k)
+    (time_index hace lo mismo con todos los eventos, para events_between / events_at)
+    y capacity_index una CapacityTimeline para conocer el pico de uso simultáneo en O(log n).
+    Los eventos recurrentes (diario / semanal) se indexan como su primera ocurrencia y además
+    como serie en recurrence_index: las repeticiones se generan sólo dentro de cada ventana consultada.
     Valida y programa eventos (sin mutar el inventario) y busca huecos disponibles.
-    Supone nombres normalizados; Event.resources → lista de dicts {'name','quantity'}.
+    Supone nombres normalizados; Event.quantities → dict {nombre: cantidad} (Event.resources, como lista de dicts).
+    Internamente todos los índices trabajan con instantes enteros (Event.start_ts / end_ts, segundos
+    desde EPOCH); los métodos públicos aceptan y devuelven datetime.
     """
+    # ventana por defecto para listar usos de un recurso con series sin fin
+    recurrence_horizon = timedelta(days=30)
+
     def __init__(self, inventory: Inventory = None):
         self.inventory = inventory or Inventory()
-        self.events_sorted = []           # lista ordenada por start
+        self.revision = 0                 # sube con cada alta / baja / recarga de eventos
+        self._columnar = None             # (revision, ColumnarEvents) construido bajo demanda
+        self._reset_indexes()
+
+    def _reset_indexes(self):
+        self.events_sorted = SortedEventList()  # ordenados por (start, name)
+        self.time_index = IntervalTree()        # todos los eventos por intervalo
         self.name_to_event = {}           # name_normalized -> Event
-        self.resource_index = defaultdict(list)  # resource_name -> [Event, ...]
+        self.resource_index = defaultdict(IntervalTree)  # resource_name -> IntervalTree de Event
+        self.capacity_index = defaultdict(CapacityTimeline)  # resource_name -> ocupación en el tiempo
+        self.recurrence_index = RecurrenceIndex()  # repeticiones de eventos recurrentes por recurso
+        self.usage_integrals = {}         # resource_name -> UsageIntegral (bajo demanda, se descarta al cambiar)
+        self.resource_revisions = defaultdict(int)  # resource_name -> contador de cambios de ese recurso
+        self._usage_cache = {}            # resource_name -> (revisión, {clave: segmentos / textos})
+
+    # Helper: registrar / retirar un evento de los índices por nombre y por recurso
+    def _index_event(self, event: Event):
+        self.revision += 1
+        event._scheduled = True
+        self.name_to_event[self._normalize(event.name)] = event
+        self.time_index.add(event)
+        for rname, qty in event.quantities.items():
+            self.resource_index[rname].add(event)
+            self.capacity_index[rname].add(event.start_ts, event.end_ts, qty)
+            self.usage_integrals.pop(rname, None)
+            self.resource_revisions[rname] += 1
+        self._index_series(event)
+
+    def _index_series(self, event: Event):
+        series = Series.from_event(event)
+        if series is not None:
+            self.recurrence_index.add(series, event.quantities.items())
+
+    def _unindex_event(self, event: Event):
+        self.revision += 1
+        event._scheduled = False
+        self.time_index.discard(event)
+        self.recurrence_index.discard(event)
+        for rname, qty in event.quantities.items():
+            self.usage_integrals.pop(rname, None)
+            self.resource_revisions[rname] += 1
+            tree = self.resource_index.get(rname)
+            if tree is None or not tree.discard(event):
+                continue
+            if not tree:
+                self.resource_index.pop(rname, None)
+                self.capacity_index.pop(rname, None)
+            else:
+                self.capacity_index[rname].remove(event.start_ts, event.end_ts, qty)
 
     # Helper: normalizar nombres
     def _normalize(self, name: str) -> str:
         return name.lower().strip()
 
-    # Helper: contar reservas para un recurso en un intervalo
-    def _count_reserved(self, resource_name: str, start, end) -> int:
-        normalized_name = self._normalize(resource_name)
-        total = 0
-        for event in self.resource_index.get(normalized_name, []):
-            latest_start = max(event.start, start)
-            earliest_end = min(event.end, end)
-            if (earliest_end - latest_start).total_seconds() > 0:
-                # sumar la cantidad que ese evento solicita de este recurso
-                total += event.get_resource_quantity(normalized_name)
+    # Helper: tramos contiguos (inicio, fin, nivel) de ocupación en [start, end), con repeticiones (enteros)
+    def _usage_segments(self, name: str, start: int, end: int):
+        timeline = self.capacity_index.get(name)
+        segments = timeline.segments(start, end) if timeline else [(start, end, 0)]
+        if not self.recurrence_index.has_resource(name):
+            return segments
+        return overlay_segments(segments, self.recurrence_index.occurrences(name, start, end), start, end)
+
+    # Helper: máximo reservado a la vez para un recurso dentro de [start, end) (datetime o segundos)
+    def _peak_reserved(self, resource_name: str, start, end) -> int:
+        name = self._normalize(resource_name)
+        start, end = as_epoch(start), as_epoch(end)
+        if self.recurrence_index.has_resource(name):
+            if start >= end:
+                return 0
+            return max(level for _, _, level in self._usage_segments(name, start, end))
+        timeline = self.capacity_index.get(name)
+        if not timeline:
+            return 0
+        return timeline.max_over(start, end)
+
+    def usage_integral(self, resource_name: str, start, end) -> int:
+        """
+        Uso acumulado del recurso en [start, end) en unidades x segundos (incluye repeticiones).
+        Con el índice de sumas prefijas del recurso (construido una vez y descartado cuando
+        add_event / remove_event lo tocan) cada consulta son dos búsquedas binarias, más O(1)
+        por serie recurrente.
+        """
+        name = self._normalize(resource_name)
+        start, end = as_epoch(start), as_epoch(end)
+        if start >= end:
+            return 0
+        index = self.usage_integrals.get(name)
+        if index is None:
+            timeline = self.capacity_index.get(name)
+            index = UsageIntegral(timeline.boundaries() if timeline else ())
+            self.usage_integrals[name] = index
+        total = index.integral(start, end)
+        for series, qty in self.recurrence_index.series_for(name):
+            total += qty * series.covered_seconds(start, end)
         return total
 
-    def resource_usage_intervals(self, resource_name: str):
+    def usage_hours(self, resource_name: str, start, end) -> float:
+        """Horas de uso (unidades x horas) del recurso en [start, end), p. ej. horas-sala de un mes."""
+        return self.usage_integral(resource_name, start, end) / 3600
+
+    # Caché por recurso: válida mientras no cambie resource_revisions[recurso]
+    _USAGE_CACHE_MAX = 32   # claves (ventana / formato) guardadas por recurso
+
+    def _cached_usage(self, name: str, key, compute):
+        revision = self.resource_revisions.get(name, 0)
+        entry = self._usage_cache.get(name)
+        if entry is None or entry[0] != revision:
+            entry = (revision, {})
+            self._usage_cache[name] = entry
+        cache = entry[1]
+        value = cache.get(key)
+        if value is None:
+            if len(cache) >= self._USAGE_CACHE_MAX:
+                cache.clear()
+            value = cache[key] = compute()
+        return value
+
+    def resource_usage_intervals(self, resource_name: str, start=None, end=None):
         """
         Devuelve una lista de segmentos donde el recurso está siendo usado.
         Cada segmento es un dict: {"start": datetime, "end": datetime, "quantity": int}
-        Nota: no gestiona recurrencias; sólo eventos concretos presentes en resource_index.
+        Con start/end sólo se devuelve lo que cae en esa ventana (recortado). Las repeticiones de
+        eventos recurrentes se incluyen; como no tienen fin, sin ventana se listan hasta
+        recurrence_horizon después del último evento conocido.
+        El resultado se cachea por recurso y ventana hasta que un alta / baja toque ese recurso.
         """
         norm = self._normalize(resource_name)
-        events = list(self.resource_index.get(norm, []))
+        start = as_epoch(start) if start is not None else None
+        end = as_epoch(end) if end is not None else None
+        segments = self._cached_usage(norm, ("segments", start, end),
+                                      lambda: self._compute_usage_intervals(norm, start, end))
+        return [dict(seg) for seg in segments]
+
+    def _compute_usage_intervals(self, norm: str, start, end):
+        tree = self.resource_index.get(norm)
+        series = self.recurrence_index.series_for(norm)
+        if series and (start is None or end is None):
+            firsts = [s.start for s, _ in series]
+            if tree:
+                firsts.append(next(iter(tree)).start_ts)
+            if start is None:
+                start = min(firsts)
+            if end is None:
+                horizon = int(self.recurrence_horizon.total_seconds())
+                end = max(firsts + [ev.end_ts for ev in (tree or [])]) + horizon
+        if start is not None and end is not None:
+            events = tree.overlapping(start, end) if tree else []
+        else:
+            events = list(tree or [])
         points = []
         for ev in events:
             try:
@@ -54,8 +205,14 @@ class Scheduler:
                 qty = 0
             if qty <= 0:
                 continue
-            points.append((ev.start, qty))   # inicio: +qty
-            points.append((ev.end, -qty))    # fin: -qty
+            points.append((ev.start_ts, qty))   # inicio: +qty
+            points.append((ev.end_ts, -qty))    # fin: -qty
+        if series:
+            for occ_start, occ_end, qty, _ in self.recurrence_index.occurrences(norm, start, end):
+                points.append((occ_start, qty))
+                points.append((occ_end, -qty))
+        if start is not None and end is not None:
+            points = [(min(max(t, start), end), delta) for t, delta in points]
 
         if not points:
             return []
@@ -68,18 +225,28 @@ class Scheduler:
         last_time = None
         for t, delta in points:
             if last_time is not None and t > last_time and curr > 0:
-                segments.append({"start": last_time, "end": t, "quantity": curr})
+                segments.append({"start": from_epoch(last_time), "end": from_epoch(t), "quantity": curr})
             curr += delta
             last_time = t
 
         return segments
 
-    def format_usage_intervals(self, resource_name: str, fmt="%d/%m/%y %H:%M"):
+    def format_usage_intervals(self, resource_name: str, fmt="%d/%m/%y %H:%M", start=None, end=None):
         """
         Devuelve una lista de strings legibles con la información de uso.
         Ej: '3 en uso (06/02/26 10:00 - 06/02/26 14:00)'
+        Se cachea igual que resource_usage_intervals (por recurso, ventana y formato).
         """
-        segs = self.resource_usage_intervals(resource_name)
+        norm = self._normalize(resource_name)
+        start = as_epoch(start) if start is not None else None
+        end = as_epoch(end) if end is not None else None
+        lines = self._cached_usage(norm, ("text", fmt, start, end),
+                                   lambda: self._format_usage(norm, fmt, start, end))
+        return list(lines)
+
+    def _format_usage(self, norm: str, fmt, start, end):
+        segs = self._cached_usage(norm, ("segments", start, end),
+                                  lambda: self._compute_usage_intervals(norm, start, end))
         out = []
         for s in segs:
             try:
@@ -89,29 +256,23 @@ class Scheduler:
             except Exception:
                 # en caso de objetos no-datetime, repr
                 out.append(f"{s['quantity']} en uso ({s['start']} - {s['end']})")
-        # TODO: añadir soporte para recurrencias (detectar eventos recurrentes y expandir/compactar)
         return out
 
-    # Comprueba si se puede programar; devuelve (True, None) o (False, motivo)
-    def _can_schedule(self, event: Event):
-        # Validaciones básicas
-        if event.start >= event.end:
-            return (False, "El evento debe tener duración positiva")
-        normalized_name = self._normalize(event.name)
-        if normalized_name in self.name_to_event:
-            return (False, "Ya existe un evento con ese nombre")
-
+    # Valida la selección de recursos sin mirar el horario (restricciones y existencia).
+    # Devuelve (True, [(nombre, cantidad, total_inventario), ...]) o (False, motivo)
+    def _check_resources(self, resources):
         # --- Validación de restricciones entre recursos (co-requisitos / exclusiones) ---
         try:
             requested = []
-            for entry in getattr(event, "resources", []) or []:
+            for entry in resources or []:
                 if isinstance(entry, dict):
                     nm = entry.get("name")
                 else:
                     nm = getattr(entry, "name", None) or str(entry)
                 if nm:
                     requested.append(self._normalize(nm))
-            ok_constraints, constraint_errs = validate_resource_constraints(requested, list(self.inventory.resources))
+            # grafo compilado del inventario (equivalente a validate_resource_constraints)
+            ok_constraints, constraint_errs = self.inventory.constraint_graph().validate(requested)
             if not ok_constraints:
                 # devolver estructura con detalles para que la UI la muestre
                 return (False, {"constraint_error": constraint_errs})
@@ -119,31 +280,107 @@ class Scheduler:
             # si el validador falla inesperadamente, seguimos con las validaciones normales
             pass
 
-        # Comprobar recursos y cantidades pedidas
-        for entry in event.resources:
+        # Comprobar que los recursos existen (agrupando repetidos como hace Event)
+        quantities = {}
+        for entry in resources or []:
             # entry es dict {'name', 'quantity'}
             name = self._normalize(entry.get("name"))
-            qty_needed = int(entry.get("quantity", 1))
+            quantities[name] = quantities.get(name, 0) + int(entry.get("quantity", 1))
 
+        checked = []
+        for name, qty_needed in quantities.items():
             resource_obj = self.inventory.find_by_name(name)
             if resource_obj is None:
                 return (False, f"El recurso '{name}' no existe en el inventario")
+            checked.append((name, qty_needed, int(resource_obj.quantity)))
+        return (True, checked)
 
-            reserved = self._count_reserved(name, event.start, event.end)
-            available_total = int(resource_obj.quantity)
+    # Comprueba si se puede programar; devuelve (True, None) o (False, motivo)
+    def _can_schedule(self, event: Event):
+        # Validaciones básicas
+        if event.start_ts >= event.end_ts:
+            return (False, "El evento debe tener duración positiva")
+        normalized_name = self._normalize(event.name)
+        if normalized_name in self.name_to_event:
+            return (False, "Ya existe un evento con ese nombre")
+
+        ok, checked = self._check_resources(event.resources)
+        if not ok:
+            return (False, checked)
 
+        # Comprobar cantidades pedidas contra el pico de uso en el intervalo
+        for name, qty_needed, available_total in checked:
+            reserved = self._peak_reserved(name, event.start_ts, event.end_ts)
             if reserved + qty_needed > available_total:
                 available = max(0, available_total - reserved)
                 return (False, f"El recurso '{name}' no tiene suficiente disponibilidad (libres: {available})")
 
+        # Evento recurrente: comprobar también sus repeticiones
+        series = Series.from_event(event)
+        if series is not None:
+            if series.duration > series.period:
+                return (False, "La duración de un evento recurrente no puede superar su periodo")
+            for name, qty_needed, available_total in checked:
+                ok, reason = self._check_series(series, name, qty_needed, available_total)
+                if not ok:
+                    return (False, reason)
+
         # TODO: validaciones adicionales (co-requisitos, exclusiones)
         return (True, None)
 
-    # Inserta evento en events_sorted manteniendo orden por start
+    def _check_series(self, series: Series, name: str, qty_needed: int, available_total: int):
+        """
+        Comprueba las repeticiones (k >= 1) de una serie nueva en el recurso name.
+        Frente a cada serie existente se decide en O(1) si llegan a coincidir (Series.first_collision):
+        las que nunca coinciden se ignoran y, si una sola ya desborda la capacidad, se rechaza en su
+        primera colisión. Sólo si varias series compatibles pudieran sumarse se recurre a revisar las
+        repeticiones de un hiperperiodo.
+        """
+        colliding = []
+        for other, other_qty in self.recurrence_index.series_for(name):
+            hit = series.first_collision(other, first=1)
+            if hit is None:
+                continue
+            if qty_needed + other_qty > available_total:
+                when = max(series.occurrence(hit[0])[0], other.occurrence(hit[1])[0])
+                return (False, f"El recurso '{name}' no tiene suficiente disponibilidad: la serie coincide con "
+                               f"'{other.event.name}' a partir del {from_epoch(when):%d/%m/%y %H:%M}")
+            colliding.append((other, other_qty))
+        if qty_needed + sum(q for _, q in colliding) <= available_total:
+            colliding = []   # ni todas juntas llegan a desbordar: sólo importan los eventos concretos
+
+        for k in self._series_indices_to_check(series, name, colliding):
+            occ_start, occ_end = series.occurrence(k)
+            reserved = self._peak_reserved(name, occ_start, occ_end)
+            if reserved + qty_needed > available_total:
+                available = max(0, available_total - reserved)
+                return (False, f"El recurso '{name}' no tiene suficiente disponibilidad el "
+                               f"{from_epoch(occ_start):%d/%m/%y %H:%M} (repetición; libres: {available})")
+        return (True, None)
+
+    def _series_indices_to_check(self, series: Series, name: str, others):
+        """
+        Índices k >= 1 de las repeticiones de series que pueden chocar en el recurso name:
+        - las que solapan algún evento concreto posterior al evento base;
+        - frente a las series others, basta un hiperperiodo (mcm de los periodos) a partir del
+          momento en que todas han empezado: desde ahí el patrón combinado se repite igual.
+        """
+        indices = set()
+        first_start, _ = series.occurrence(1)
+        tree = self.resource_index.get(name)
+        if tree:
+            for ev in tree.overlapping(first_start, _MAX_TS):
+                indices.update(series.index_range(ev.start_ts, ev.end_ts))
+        if others:
+            hyper = math.lcm(series.period, *(s.period for s, _ in others))
+            longest = max([series.duration] + [s.duration for s, _ in others])
+            settled = max([first_start] + [s.start for s, _ in others])
+            indices.update(series.index_range(first_start, settled + hyper + longest))
+        return sorted(indices)
+
+    # Inserta evento en events_sorted manteniendo orden por (start, name): O(log n)
     def _insert_event_sorted(self, event: Event):
-        starts = [e.start for e in self.events_sorted]
-        idx = bisect_left(starts, event.start)
-        self.events_sorted.insert(idx, event)
+        self.events_sorted.add(event)
 
     # API pública
     def add_event(self, event: Event):
@@ -155,12 +392,7 @@ class Scheduler:
         self._insert_event_sorted(event)
 
         # Actualizar índices
-        normalized_name = self._normalize(event.name)
-        self.name_to_event[normalized_name] = event
-
-        for entry in event.resources:
-            rname = self._normalize(entry.get("name"))
-            self.resource_index[rname].append(event)
+        self._index_event(event)
 
         return (True, None)
 
@@ -171,52 +403,178 @@ class Scheduler:
             return False
 
         # Eliminar de events_sorted
-        try:
-            self.events_sorted.remove(event)
-        except ValueError:
-            pass
+        self.events_sorted.discard(event)
 
-        # Eliminar de resource_index
-        for entry in event.resources:
-            rname = self._normalize(entry.get("name"))
-            lst = self.resource_index.get(rname, [])
-            try:
-                lst.remove(event)
-            except ValueError:
-                pass
-            if not lst:
-                self.resource_index.pop(rname, None)
+        # Eliminar de resource_index / capacity_index
+        self._unindex_event(event)
 
         return True
 
     def list_events(self):
         return list(self.events_sorted)
 
-    def find_next_available(self, duration: timedelta, resource_names: list, start_from, window_end, step_minutes: int = 30):
-        # Normalizar / preparar recursos (acepta strings o dicts)
-        resources_template = []
-        for r in resource_names:
-            if isinstance(r, dict):
-                name = self._normalize(r.get("name"))
-                qty = int(r.get("quantity", 1))
-            else:
-                name = self._normalize(r)
-                qty = 1
-            resources_template.append({"name": name, "quantity": qty})
+    def _matches_filter(self, event: Event, resource=None, category=None) -> bool:
+        if resource is not None and event.get_resource_quantity(resource) <= 0:
+            return False
+        if category is not None:
+            category = self._normalize(category)
+            for rname in event.quantities:
+                res = self.inventory.find_by_name(rname)
+                if res is not None and self._normalize(res.category or "") == category:
+                    return True
+            return False
+        return True
 
-        step = timedelta(minutes=step_minutes)
-        candidate_start = start_from
+    def events_between(self, start, end, resource: str = None, category: str = None):
+        """
+        Eventos que solapan [start, end), ordenados por inicio: O(log n + k) sobre time_index
+        (o sobre el índice del recurso si se filtra por resource).
+        category filtra por eventos que usan algún recurso de esa categoría ('room', 'employee', 'item').
+        """
+        start, end = as_epoch(start), as_epoch(end)
+        if start >= end:
+            return []
+        if resource is not None:
+            tree = self.resource_index.get(self._normalize(resource))
+            found = tree.overlapping(start, end) if tree else []
+        else:
+            found = self.time_index.overlapping(start, end)
+        if category is None:
+            return found
+        return [ev for ev in found if self._matches_filter(ev, category=category)]
+
+    def events_at(self, t, resource: str = None, category: str = None):
+        """Eventos en curso en el instante t (start <= t < end), con los mismos filtros que events_between."""
+        t = as_epoch(t)
+        if resource is not None:
+            tree = self.resource_index.get(self._normalize(resource))
+            found = tree.containing(t) if tree else []
+        else:
+            found = self.time_index.containing(t)
+        if category is None:
+            return found
+        return [ev for ev in found if self._matches_filter(ev, category=category)]
 
-        while candidate_start + duration <= window_end:
-            candidate_end = candidate_start + duration
-            # crear evento provisional
-            temp_event = Event("__tmp__", candidate_start, candidate_end, resources=resources_template)
-            ok, _ = self._can_schedule(temp_event)
-            if ok:
-                return (candidate_start, candidate_end)
-            candidate_start = candidate_start + step
+    def find_next_available(self, duration: timedelta, resource_names: list, start_from, window_end, step_minutes: int = 30):
+        """
+        Devuelve el primer (inicio, fin) en [start_from, window_end] donde caben todos los recursos,
+        o None. Salta directamente entre fronteras reales de los eventos (ver SlotSearch), así que el
+        inicio es exacto; step_minutes se mantiene por compatibilidad pero ya no se usa.
+        El resultado va en la zona horaria de start_from (naive si start_from es naive).
+        """
+        search = SlotSearch(self)
+        ok, requirements = search.prepare(resource_names)
+        if not ok:
+            return None
+        slot = search.first_fit(_seconds(duration), requirements, _search_start(start_from), as_epoch(window_end))
+        if slot is None:
+            return None
+        return (from_epoch(slot[0], start_from), from_epoch(slot[1], start_from))
 
-        return None
+    def iter_free_intervals(self, duration: timedelta, resource_names: list, start_from, window_end):
+        """
+        Generador de intervalos libres fusionados (inicio, fin) dentro de [start_from, window_end]
+        donde cabe duration con todos los recursos pedidos. Cada intervalo representa todos los
+        inicios posibles entre inicio y fin - duration. Se puede cortar en cualquier momento.
+        """
+        search = SlotSearch(self)
+        ok, requirements = search.prepare(resource_names)
+        seconds = _seconds(duration)
+        if not ok or seconds <= 0:
+            return
+        for free_start, free_end in search.free_intervals(requirements, _search_start(start_from), as_epoch(window_end)):
+            if free_end - free_start >= seconds:
+                yield (from_epoch(free_start, start_from), from_epoch(free_end, start_from))
+
+    def top_k_slots(self, duration: timedelta, resource_names: list, start_from, window_end, k: int = 5,
+                    key=None, step_minutes: int = None):
+        """
+        Devuelve hasta k huecos (inicio, fin) con fin = inicio + duration. Dentro de cada intervalo
+        libre se proponen inicios cada step_minutes (por defecto cada duration, huecos seguidos)
+        mientras quepa duration, así que una ventana larga libre da k resultados.
+        key(inicio, fin) puntúa cada hueco candidato (menor es mejor) y se eligen los k mejores con
+        heapq.nsmallest sobre el generador; sin key, los más tempranos, y el recorrido se detiene en
+        cuanto hay k resultados.
+        """
+        if k <= 0:
+            return []
+        step = timedelta(minutes=step_minutes) if step_minutes else duration
+        if step <= timedelta(0):
+            return []
+        candidates = self._iter_slots(duration, step, resource_names, start_from, window_end)
+        if key is None:
+            return list(islice(candidates, k))
+        return heapq.nsmallest(k, candidates, key=lambda slot: key(slot[0], slot[1]))
+
+    def _iter_slots(self, duration: timedelta, step: timedelta, resource_names: list, start_from, window_end):
+        """Generador de huecos candidatos (inicio, fin): inicios cada step dentro de cada intervalo libre."""
+        for free_start, free_end in self.iter_free_intervals(duration, resource_names, start_from, window_end):
+            slot_start = free_start
+            while slot_start + duration <= free_end:
+                yield (slot_start, slot_start + duration)
+                slot_start += step
+
+    def find_slots_batch(self, requests: list, commit: bool = False):
+        """
+        Resuelve muchas peticiones de hueco en una sola pasada.
+        requests: lista de dicts {'duration': timedelta, 'resources': [...], 'start_from', 'window_end',
+                  'name' (opcional; obligatorio si commit=True), 'recurrence' (opcional)}.
+        Todas comparten la misma búsqueda: la validación de cada selección de recursos y los tramos
+        de ocupación de cada recurso se calculan una vez para el rango común del lote.
+        Si commit=True cada hueco encontrado se reserva (add_event) en orden, de modo que las
+        peticiones siguientes ya ven las anteriores.
+        Devuelve una lista (mismo orden) de dicts {'name', 'slot': (inicio, fin) | None, 'error': None | motivo};
+        nunca hay slot y error a la vez (con commit=True, slot es el hueco ya reservado).
+        """
+        valid = [r for r in requests if r.get("start_from") is not None and r.get("window_end") is not None]
+        span = None
+        if valid:
+            span = (min(_search_start(r["start_from"]) for r in valid), max(as_epoch(r["window_end"]) for r in valid))
+        search = SlotSearch(self, span=span)
+
+        results = []
+        for req in requests:
+            name = req.get("name")
+            out = {"name": name, "slot": None, "error": None}
+            results.append(out)
+            start_from, window_end = req.get("start_from"), req.get("window_end")
+            if start_from is None or window_end is None or start_from >= window_end:
+                out["error"] = "Ventana de búsqueda inválida"
+                continue
+            duration = req.get("duration")
+            if not isinstance(duration, timedelta) or duration <= timedelta(0):
+                out["error"] = "Duración inválida"
+                continue
+            ok, requirements = search.prepare(req.get("resources") or [])
+            if not ok:
+                out["error"] = requirements
+                continue
+            slot = search.first_fit(_seconds(duration), requirements,
+                                    _search_start(start_from), as_epoch(window_end))
+            if slot is None:
+                out["error"] = "No hay hueco disponible en la ventana"
+                continue
+            slot = (from_epoch(slot[0], start_from), from_epoch(slot[1], start_from))
+            if not commit:
+                out["slot"] = slot
+                continue
+            # con commit, 'slot' sólo se informa si la reserva se hizo
+            if not name:
+                out["error"] = "Se necesita un nombre para reservar el hueco"
+                continue
+            try:
+                ev = Event(name, slot[0], slot[1], resources=req.get("resources") or [],
+                           recurrence=req.get("recurrence"))
+            except Exception as exc:
+                out["error"] = f"Invalid event data: {exc}"
+                continue
+            ok, reason = self.add_event(ev)
+            if not ok:
+                out["error"] = reason
+                continue
+            out["slot"] = slot
+            search.invalidate(rname for rname, _, _ in requirements)
+        return results
 
     # ----------------------------
     # Persistencia de eventos
@@ -247,7 +605,7 @@ class Scheduler:
     def load_events(self, path, validate: bool = True):
         """
         Carga eventos desde JSON.
-        - Si validate=True: intenta añadir cada evento vía add_event (aplica validaciones).
+        - Si validate=True: aplica las mismas validaciones que add_event (vía ingest_events).
           Devuelve (True, None) si todo cargó; si hay errores devuelve (False, errores_dict).
         - Si validate=False: reconstruye índices directamente (se asume que los datos son confiables).
         path: str o Path
@@ -263,82 +621,229 @@ class Scheduler:
         except Exception as exc:
             return (False, f"Error reading JSON: {exc}")
 
-        if validate:
-            # limpiar estado actual antes de cargar validado
-            self.events_sorted = []
-            self.name_to_event = {}
-            self.resource_index = defaultdict(list)
-
-            errors = {}
-            for ed in events_data:
-                try:
-                    ev = Event.from_dict(ed)
-                except Exception as exc:
-                    errors[ed.get("name", "<unknown>")] = f"Invalid event data: {exc}"
-                    continue
-                ok, reason = self.add_event(ev)
-                if not ok:
-                    errors[ev.name] = reason
-            if errors:
-                return (False, errors)
-            return (True, None)
-        else:
-            # reconstruir índices sin pasar por add_event
-            self.events_sorted = []
-            self.name_to_event = {}
-            self.resource_index = defaultdict(list)
-
-            for ed in events_data:
-                ev = Event.from_dict(ed)
-                # insertar ordenado
-                starts = [e.start for e in self.events_sorted]
-                idx = bisect_left(starts, ev.start)
-                self.events_sorted.insert(idx, ev)
-                self.name_to_event[self._normalize(ev.name)] = ev
-                for entry in ev.resources:
-                    rname = self._normalize(entry.get("name"))
-                    self.resource_index[rname].append(ev)
-            return (True, None)
+        return self.ingest_events(events_data, validate=validate)
 
     # Conveniencia: aceptar una lista de dicts (por ejemplo el payload cargado desde JSON)
     def load_events_from_list(self, events_data: list, validate: bool = True):
         """
         Carga eventos a partir de una lista de dicts (cada dict en el mismo formato que Event.to_dict()).
-        Si validate=True usa add_event para aplicar todas las validaciones; si False reconstruye índices.
+        Si validate=True aplica todas las validaciones; si False reconstruye índices.
         Devuelve (True, None) o (False, errores)
         """
-        if validate:
-            # limpiar estado actual
-            self.events_sorted = []
-            self.name_to_event = {}
-            self.resource_index = defaultdict(list)
-            errors = {}
-            for ed in events_data:
-                try:
-                    ev = Event.from_dict(ed)
-                except Exception as exc:
-                    errors[ed.get("name", "<unknown>")] = f"Invalid event data: {exc}"
-                    continue
-                ok, reason = self.add_event(ev)
-                if not ok:
-                    errors[ev.name] = reason
-            if errors:
-                return (False, errors)
-            return (True, None)
+        return self.ingest_events(events_data, validate=validate)
+
+    @staticmethod
+    def parse_events(events_data):
+        """
+        Primera fase de ingest_events, sin tocar el Scheduler: ([Event], {nombre: error}) a partir de
+        un iterable de dicts o Event. Se puede llamar fuera de cualquier lock (p. ej. mientras se lee
+        el fichero en streaming) y pasar después la lista a ingest_events con parse_errors.
+        """
+        errors = {}
+        parsed = []
+        for ed in events_data:
+            if isinstance(ed, Event):
+                parsed.append(ed)
+                continue
+            try:
+                parsed.append(Event.from_dict(ed))
+            except Exception as exc:
+                errors[ed.get("name", "<unknown>")] = f"Invalid event data: {exc}"
+        return parsed, errors
+
+    def ingest_events(self, events_data, validate: bool = True, replace: bool = True, parse_errors: dict = None):
+        """
+        Carga masiva en O(n log n): parsea todo, ordena una vez y construye events_sorted,
+        name_to_event, resource_index y capacity_index en una sola pasada.
+
+        events_data: iterable de dicts (formato Event.to_dict()) o de Event.
+        parse_errors: errores de un parse_events previo, para que aparezcan en el resultado.
+        replace=True descarta los eventos actuales; replace=False añade sobre ellos.
+        Con validate=True el resultado es el mismo que llamar a add_event uno a uno en orden:
+          - las validaciones que no dependen del horario (nombre, restricciones, inventario) se hacen
+            por evento, memorizando cada selección de recursos distinta;
+          - la capacidad se comprueba con un barrido por recurso; sólo los eventos que tocan un
+            recurso desbordado (o con nombre repetido en el lote) pasan por add_event en orden.
+        Devuelve (True, None) o (False, errores_dict).
+        """
+        parsed, errors = self.parse_events(events_data)
+        if parse_errors:
+            errors = {**parse_errors, **errors}
+
+        base = [] if replace else list(self.events_sorted)
+        if not validate:
+            self._rebuild_indexes(base + parsed)
+            return (False, errors) if errors else (True, None)
+
+        # 1) validaciones independientes del horario
+        taken = {self._normalize(e.name) for e in base}
+        name_counts = defaultdict(int)
+        checked_by_selection = {}
+        candidates = []
+        for ev in parsed:
+            if ev.start_ts >= ev.end_ts:
+                errors[ev.name] = "El evento debe tener duración positiva"
+                continue
+            key = self._normalize(ev.name)
+            if key in taken:
+                errors[ev.name] = "Ya existe un evento con ese nombre"
+                continue
+            selection = tuple(sorted(ev.quantities.items()))
+            result = checked_by_selection.get(selection)
+            if result is None:
+                result = self._check_resources(ev.resources)
+                checked_by_selection[selection] = result
+            ok, checked = result
+            if not ok:
+                errors[ev.name] = checked
+                continue
+            name_counts[key] += 1
+            candidates.append((ev, checked))
+
+        # 2) barrido por recurso: ¿se supera la capacidad en algún instante?
+        capacity = {}
+        for _, checked in candidates:
+            for rname, _, total in checked:
+                capacity[rname] = total
+        points = defaultdict(list)
+        for ev in base + [ev for ev, _ in candidates]:
+            for rname, qty in ev.quantities.items():
+                if rname in capacity:
+                    points[rname].append((ev.start_ts, qty))
+                    points[rname].append((ev.end_ts, -qty))
+        overloaded = set()
+        # los recursos con series se comprueban en orden (las repeticiones no entran en el barrido)
+        for ev in base + [ev for ev, _ in candidates]:
+            if Series.from_event(ev) is not None:
+                overloaded.update(ev.quantities)
+        for rname, pts in points.items():
+            # a igual instante, los cierres (-q) van antes que las aperturas: intervalos [start, end)
+            pts.sort()
+            level = 0
+            limit = capacity[rname]
+            for _, delta in pts:
+                level += delta
+                if level > limit:
+                    overloaded.add(rname)
+                    break
+
+        # 3) índices en bloque para lo que seguro entra; el resto, en orden vía add_event
+        bulk, pending = [], []
+        for ev, checked in candidates:
+            if name_counts[self._normalize(ev.name)] > 1 or any(rname in overloaded for rname, _, _ in checked):
+                pending.append(ev)
+            else:
+                bulk.append(ev)
+        self._rebuild_indexes(base + bulk)
+        for ev in pending:
+            ok, reason = self.add_event(ev)
+            if not ok:
+                errors[ev.name] = reason
+
+        if errors:
+            return (False, errors)
+        return (True, None)
+
+    def _rebuild_indexes(self, events: list):
+        """Reconstruye todos los índices a partir de una lista de eventos (ordena una sola vez)."""
+        self.revision += 1
+        for ev in self.events_sorted:
+            ev._scheduled = False
+        self._reset_indexes()
+        self.events_sorted = SortedEventList(events)
+        self.time_index.extend(events)
+        per_resource = defaultdict(list)
+        boundaries = defaultdict(list)
+        for ev in events:
+            self.name_to_event[self._normalize(ev.name)] = ev
+            ev._scheduled = True
+        for ev in self.events_sorted:
+            for rname, qty in ev.quantities.items():
+                per_resource[rname].append(ev)
+                boundaries[rname].append((ev.start_ts, qty))
+                boundaries[rname].append((ev.end_ts, -qty))
+        for rname, evs in per_resource.items():
+            self.resource_index[rname].extend(evs)
+            self.capacity_index[rname].extend(boundaries[rname])
+        for ev in events:
+            self._index_series(ev)
+
+    # ----------------------------
+    # Analítica columnar (NumPy)
+    # ----------------------------
+    def columnar(self):
+        """
+        Espejo columnar (ColumnarEvents) de events_sorted para consultas vectorizadas.
+        Se reconstruye sólo cuando cambia revision; entre cambios se reutiliza.
+        """
+        if self._columnar is None or self._columnar[0] != self.revision:
+            from hotel_planner.core.columnar import ColumnarEvents
+            self._columnar = (self.revision, ColumnarEvents(self.events_sorted))
+        return self._columnar[1]
+
+    def capacity_conflicts(self):
+        """Recursos cuyo pico de uso (eventos guardados) supera la cantidad del inventario: [(recurso, pico, total)]."""
+        col = self.columnar()
+        capacities = {}
+        for rname in col.resources:
+            res = self.inventory.find_by_name(rname)
+            if res is not None:
+                capacities[rname] = int(res.quantity)
+        return col.conflicts(capacities)
+
+    BUCKETS = {"15min": timedelta(minutes=15), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+    def occupancy_matrix(self, start, end, bucket="hour", resources: list = None):
+        """
+        Ocupación de varios recursos por franjas de tiempo, calculada de una vez (NumPy).
+        bucket: "15min", "hour", "day" o un timedelta; las franjas empiezan en start.
+        ValueError si la franja no es válida o start no es anterior a end.
+        resources: nombres a incluir (por defecto todo el inventario, en su orden).
+        Devuelve dict:
+          'resources': nombres normalizados (filas), 'buckets': inicio de cada franja (columnas),
+          'occupancy': matriz int64 con el pico de uso simultáneo en la franja, como
+                       _peak_reserved (incluye repeticiones de eventos recurrentes),
+          'capacity': cantidad de cada recurso en el inventario,
+          'utilization': occupancy / capacity (0 si la capacidad es 0).
+        """
+        import numpy as np
+
+        step = self.BUCKETS.get(bucket, bucket)
+        if not isinstance(step, timedelta) or step <= timedelta(0):
+            raise ValueError(f"Franja no válida: {bucket!r}")
+        bucket_s = _seconds(step)
+        start_ts, end_ts = as_epoch(start), as_epoch(end)
+        if start_ts >= end_ts:
+            raise ValueError("Ventana no válida: start debe ser anterior a end")
+        if resources is None:
+            rows = [self._normalize(r.name) for r in self.inventory.resources]
         else:
-            # reconstruir índices sin pasar por add_event
-            self.events_sorted = []
-            self.name_to_event = {}
-            self.resource_index = defaultdict(list)
-            for ed in events_data:
-                ev = Event.from_dict(ed)
-                idx = bisect_left([e.start for e in self.events_sorted], ev.start)
-                self.events_sorted.insert(idx, ev)
-                self.name_to_event[self._normalize(ev.name)] = ev
-                for entry in ev.resources:
-                    rname = self._normalize(entry.get("name"))
-                    self.resource_index[rname].append(ev)
-            return (True, None)
+            rows = [self._normalize(getattr(r, "name", r)) for r in resources]
+        rows = list(dict.fromkeys(rows))
+
+        # repeticiones dentro de la ventana (pocas series; se añaden como intervalos extra)
+        extra = ([], [], [], [])
+        for row, name in enumerate(rows):
+            for occ_start, occ_end, qty, _ in self.recurrence_index.occurrences(name, start_ts, end_ts):
+                for column, value in zip(extra, (row, occ_start, occ_end, qty)):
+                    column.append(value)
+
+        occupancy = self.columnar().occupancy(rows, start_ts, end_ts, bucket_s, extra=extra)
+        capacity = np.zeros(len(rows), dtype=np.int64)
+        for row, name in enumerate(rows):
+            res = self.inventory.find_by_name(name)
+            if res is not None:
+                capacity[row] = int(res.quantity)
+        utilization = np.divide(occupancy, capacity[:, None], out=np.zeros(occupancy.shape),
+                                where=capacity[:, None] > 0)
+        n_buckets = occupancy.shape[1]
+        return {
+            "resources": rows,
+            "buckets": [from_epoch(start_ts + b * bucket_s) for b in range(n_buckets)],
+            "occupancy": occupancy,
+            "capacity": capacity,
+            "utilization": utilization,
+        }
 
     def list_events_as_dicts(self):
         """Devuelve la lista de eventos en formato dict (útil para la UI)."""
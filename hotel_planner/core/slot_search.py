@@ -0,0 +1,125 @@
+"""
+Motor de búsqueda de huecos.
+
+En lugar de probar inicios cada step_minutes, recorre las líneas temporales de
+capacidad de los recursos pedidos: cada recurso aporta los tramos en los que no
+quedan unidades suficientes ("bloqueados"), se unen y el complemento dentro de
+la ventana son los intervalos libres. El primer hueco empieza siempre en el
+inicio de la ventana o justo en una frontera real (fin de un evento), así que
+el resultado es exacto y no depende de ninguna rejilla.
+Las repeticiones de eventos recurrentes se suman a la línea temporal sólo dentro
+de la ventana buscada (Scheduler._usage_segments).
+
+Las restricciones (co-requisitos, exclusiones, existencia en inventario) no
+dependen del horario: se validan una sola vez por petición.
+
+Para lotes de peticiones se puede fijar un span (inicio, fin) común: los tramos
+de cada recurso se calculan una sola vez para todo el span y se reutilizan
+entre peticiones (invalidate() descarta los recursos que cambien).
+
+Trabaja sólo con enteros (segundos desde EPOCH, duraciones en segundos); la
+conversión desde / hacia datetime la hace el Scheduler.
+"""
+import heapq
+from bisect import bisect_right
+
+
+class SlotSearch:
+    """Búsqueda de huecos sobre los índices de un Scheduler."""
+
+    def __init__(self, scheduler, span=None):
+        self.scheduler = scheduler
+        self.span = span          # (inicio, fin) compartido por un lote, o None
+        self._segments = {}       # recurso -> (inicios, tramos) dentro de span
+        self._prepared = {}       # selección normalizada -> resultado de prepare
+
+    def invalidate(self, names):
+        """Descarta los tramos cacheados de los recursos indicados."""
+        for name in names:
+            self._segments.pop(name, None)
+
+    def prepare(self, resources):
+        """
+        Normaliza y valida la petición una sola vez.
+        resources: lista de nombres o dicts {'name', 'quantity'}.
+        Devuelve (True, [(nombre, cantidad, total), ...]) o (False, motivo).
+        """
+        template = []
+        for r in resources or []:
+            if isinstance(r, dict):
+                template.append({"name": r.get("name"), "quantity": int(r.get("quantity", 1))})
+            else:
+                template.append({"name": r, "quantity": 1})
+        signature = tuple(sorted((str(t["name"]).lower().strip(), t["quantity"]) for t in template))
+        cached = self._prepared.get(signature)
+        if cached is None:
+            cached = self.scheduler._check_resources(template)
+            self._prepared[signature] = cached
+        return cached
+
+    def _segments_in(self, name, start, end):
+        """Tramos (inicio, fin, nivel) de ocupación en [start, end) (con repeticiones), usando la caché del span."""
+        span = self.span
+        if span is None or start < span[0] or end > span[1]:
+            yield from self.scheduler._usage_segments(name, start, end)
+            return
+        cached = self._segments.get(name)
+        if cached is None:
+            segs = list(self.scheduler._usage_segments(name, span[0], span[1]))
+            cached = ([seg[0] for seg in segs], segs)
+            self._segments[name] = cached
+        starts, segs = cached
+        for i in range(max(0, bisect_right(starts, start) - 1), len(segs)):
+            seg_start, seg_end, level = segs[i]
+            if seg_start >= end:
+                break
+            yield (max(seg_start, start), min(seg_end, end), level)
+
+    def _blocked(self, name, qty, total, start, end):
+        """Tramos de [start, end) donde el recurso no tiene qty unidades libres (fusionados)."""
+        if qty > total:
+            yield (start, end)
+            return
+        if not self.scheduler.capacity_index.get(name):
+            return
+        limit = total - qty
+        cur_start = cur_end = None
+        for seg_start, seg_end, level in self._segments_in(name, start, end):
+            if level <= limit:
+                continue
+            if cur_end is not None and seg_start <= cur_end:
+                cur_end = seg_end
+                continue
+            if cur_start is not None:
+                yield (cur_start, cur_end)
+            cur_start, cur_end = seg_start, seg_end
+        if cur_start is not None:
+            yield (cur_start, cur_end)
+
+    def free_intervals(self, requirements, start, end):
+        """
+        Genera los intervalos libres fusionados (inicio, fin) dentro de [start, end)
+        para una petición ya preparada. Es perezoso: se puede cortar en cualquier momento.
+        """
+        if start >= end:
+            return
+        streams = [self._blocked(name, qty, total, start, end) for name, qty, total in requirements]
+        cursor = start
+        for b_start, b_end in heapq.merge(*streams):
+            if b_start > cursor:
+                yield (cursor, b_start)
+            if b_end > cursor:
+                cursor = b_end
+            if cursor >= end:
+                return
+        if cursor < end:
+            yield (cursor, end)
+
+    def first_fit(self, duration: int, requirements, start, end):
+        """Primer (inicio, fin) exacto donde cabe duration (segundos), o None."""
+        if duration <= 0:
+            return None
+        for free_start, free_end in self.free_intervals(requirements, start, end):
+            if free_end - free_start >= duration:
+                return (free_start, free_start + duration)
+        return None
@@ -0,0 +1,166 @@
+"""
+Contenedor ordenado de eventos para Scheduler.events_sorted.
+
+Treap con clave (start_ts, name, id) aumentado con el tamaño de cada subárbol:
+insertar y borrar son O(log n), se itera en orden, se accede por posición en
+O(log n) y se puede cortar por rango de tiempo sin copiar la lista entera.
+Se comporta como una lista de sólo lectura (len, iteración, índices, slices)
+para no romper a quien ya usaba events_sorted como list.
+"""
+from hotel_planner.core import treap
+
+
+def _event_key(event):
+    return (event.start_ts, event.name, id(event))
+
+
+class _EventNode(treap.TreapNode):
+    __slots__ = ("event", "size")
+
+    def __init__(self, event):
+        super().__init__(_event_key(event))
+        self.event = event
+        self.size = 1
+
+    def pull(self):
+        size = 1
+        if self.left is not None:
+            size += self.left.size
+        if self.right is not None:
+            size += self.right.size
+        self.size = size
+
+
+class SortedEventList:
+    """Eventos ordenados por (start, name) con inserción y borrado logarítmicos."""
+
+    def __init__(self, events=None):
+        self._root = None
+        self._keys = {}   # id(event) -> clave en el árbol
+        if events:
+            nodes = []
+            for ev in events:
+                if id(ev) in self._keys:
+                    continue
+                node = _EventNode(ev)
+                self._keys[id(ev)] = node.key
+                nodes.append(node)
+            nodes.sort(key=lambda n: n.key)
+            self._root = treap.build(nodes)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __bool__(self):
+        return bool(self._keys)
+
+    def __contains__(self, event):
+        return id(event) in self._keys
+
+    def __iter__(self):
+        for node in treap.iter_nodes(self._root):
+            yield node.event
+
+    def __repr__(self):
+        return f"<SortedEventList: {len(self)} eventos>"
+
+    def __eq__(self, other):
+        if isinstance(other, (SortedEventList, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self._slice(start, stop)
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("SortedEventList index out of range")
+        node = self._root
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.event
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def _slice(self, start, stop):
+        out = []
+        if start >= stop:
+            return out
+        # bajar hasta la posición start y seguir en orden con una pila
+        stack = []
+        node = self._root
+        skip = start
+        while node is not None:
+            left_size = node.left.size if node.left is not None else 0
+            if skip < left_size:
+                stack.append(node)
+                node = node.left
+            elif skip == left_size:
+                stack.append(node)
+                break
+            else:
+                skip -= left_size + 1
+                node = node.right
+        count = stop - start
+        while stack and len(out) < count:
+            node = stack.pop()
+            out.append(node.event)
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+        return out
+
+    def add(self, event):
+        """Inserta un evento en su posición (ignora el mismo objeto repetido)."""
+        if id(event) in self._keys:
+            return
+        node = _EventNode(event)
+        self._keys[id(event)] = node.key
+        self._root = treap.insert(self._root, node)
+
+    def remove(self, event):
+        """Elimina un evento; lanza ValueError si no estaba (como list.remove)."""
+        key = self._keys.pop(id(event), None)
+        if key is None:
+            raise ValueError("El evento no está en la lista")
+        self._root, _ = treap.erase(self._root, key)
+
+    def discard(self, event) -> bool:
+        try:
+            self.remove(event)
+            return True
+        except ValueError:
+            return False
+
+    def irange(self, start=None, end=None):
+        """Itera en orden los eventos cuyo inicio está en [start, end) (segundos desde EPOCH)."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                if start is not None and node.event.start_ts < start:
+                    node = node.right
+                    continue
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if end is not None and node.event.start_ts >= end:
+                break
+            yield node.event
+            node = node.right
+
+    def starting_between(self, start, end) -> list:
+        """Lista de eventos con inicio en [start, end)."""
+        return list(self.irange(start, end))
@@ -0,0 +1,141 @@
+"""
+Treap (árbol binario de búsqueda con prioridades aleatorias) mínimo.
+
+Sirve de base a los índices del planificador: cada estructura define su propio
+nodo heredando de TreapNode y sobrescribe pull() para recalcular los agregados
+del subárbol (máximo fin, sumas, tamaños...). Todas las operaciones son
+O(log n) esperado.
+"""
+import random
+
+
+class TreapNode:
+    __slots__ = ("key", "prio", "left", "right")
+
+    def __init__(self, key):
+        self.key = key
+        self.prio = random.random()
+        self.left = None
+        self.right = None
+
+    def pull(self):
+        """Recalcula los agregados del nodo a partir de sus hijos (no-op por defecto)."""
+        pass
+
+
+def split(node, key):
+    """Divide el árbol en (claves < key, claves >= key)."""
+    if node is None:
+        return (None, None)
+    if node.key < key:
+        left, right = split(node.right, key)
+        node.right = left
+        node.pull()
+        return (node, right)
+    left, right = split(node.left, key)
+    node.left = right
+    node.pull()
+    return (left, node)
+
+
+def merge(a, b):
+    """Une dos árboles donde todas las claves de a son menores que las de b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = merge(a.right, b)
+        a.pull()
+        return a
+    b.left = merge(a, b.left)
+    b.pull()
+    return b
+
+
+def insert(node, new):
+    """Inserta el nodo new y devuelve la nueva raíz."""
+    if node is None:
+        return new
+    if new.prio > node.prio:
+        new.left, new.right = split(node, new.key)
+        new.pull()
+        return new
+    if new.key < node.key:
+        node.left = insert(node.left, new)
+    else:
+        node.right = insert(node.right, new)
+    node.pull()
+    return node
+
+
+def erase(node, key):
+    """Elimina el nodo con clave key. Devuelve (nueva_raíz, nodo_eliminado | None)."""
+    if node is None:
+        return (None, None)
+    if key == node.key:
+        return (merge(node.left, node.right), node)
+    if key < node.key:
+        node.left, found = erase(node.left, key)
+    else:
+        node.right, found = erase(node.right, key)
+    if found is not None:
+        node.pull()
+    return (node, found)
+
+
+def find(node, key):
+    """Devuelve el nodo con clave key o None."""
+    while node is not None:
+        if key == node.key:
+            return node
+        node = node.left if key < node.key else node.right
+    return None
+
+
+def build(nodes):
+    """
+    Construye un treap equilibrado a partir de nodos ya ordenados por clave.
+    Las prioridades se reparten por niveles (mayores arriba) para respetar
+    la propiedad de heap sin rotaciones: O(n log n) por el sort de prioridades.
+    """
+    n = len(nodes)
+    if n == 0:
+        return None
+    prios = sorted((random.random() for _ in range(n)), reverse=True)
+    # recorrido BFS del árbol equilibrado implícito: asignar prioridades en ese orden
+    queue = [(0, n - 1)]
+    pos = 0
+    while pos < len(queue):
+        lo, hi = queue[pos]
+        mid = (lo + hi) // 2
+        nodes[mid].prio = prios[pos]
+        pos += 1
+        if lo <= mid - 1:
+            queue.append((lo, mid - 1))
+        if mid + 1 <= hi:
+            queue.append((mid + 1, hi))
+
+    def _link(lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = _link(lo, mid - 1)
+        node.right = _link(mid + 1, hi)
+        node.pull()
+        return node
+
+    return _link(0, n - 1)
+
+
+def iter_nodes(node):
+    """Recorrido en orden (iterativo) de los nodos del árbol."""
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
@@ -0,0 +1,45 @@
+"""
+Índice de uso acumulado de un recurso (sumas prefijas).
+
+La ocupación de un recurso es una función escalonada; guardando en cada frontera
+el instante, el nivel a partir de ella y el área acumulada hasta ella, la
+integral del uso en cualquier rango [a, b) (unidades x segundos, p. ej.
+"horas-sala de marzo") sale de dos búsquedas binarias: F(b) - F(a).
+Se construye en O(n) a partir de las fronteras ya ordenadas de CapacityTimeline.
+"""
+from bisect import bisect_right
+
+
+class UsageIntegral:
+    """F(t) = integral del nivel de uso desde la primera frontera hasta t."""
+    __slots__ = ("times", "levels", "areas")
+
+    def __init__(self, boundaries):
+        self.times = []
+        self.levels = []   # nivel vigente desde times[i] hasta times[i+1]
+        self.areas = []    # área acumulada hasta times[i]
+        level = area = 0
+        prev = None
+        for t, delta in boundaries:
+            if prev is not None:
+                area += level * (t - prev)
+            level += delta
+            self.times.append(t)
+            self.levels.append(level)
+            self.areas.append(area)
+            prev = t
+
+    def __len__(self):
+        return len(self.times)
+
+    def cumulative(self, t: int) -> int:
+        i = bisect_right(self.times, t) - 1
+        if i < 0:
+            return 0
+        return self.areas[i] + self.levels[i] * (t - self.times[i])
+
+    def integral(self, start: int, end: int) -> int:
+        """Unidades x segundos usadas en [start, end)."""
+        if start >= end:
+            return 0
+        return self.cumulative(end) - self.cumulative(start)
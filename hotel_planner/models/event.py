@@ -1,19 +1,88 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dateutil.parser import parse
 
+# Representación entera de los instantes: segundos desde 1970-01-01 (UTC si el datetime
+# lleva zona horaria; si es naive se toma tal cual, como hora local de pared).
+EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def to_epoch(dt: datetime) -> int:
+    """datetime -> segundos enteros desde EPOCH (trunca los microsegundos)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - EPOCH) // _SECOND
+
+
+def to_epoch_ceil(dt: datetime) -> int:
+    """Como to_epoch pero redondeando hacia arriba: 10:00:00.5 -> 10:00:01 (para inicios de búsqueda)."""
+    ts = to_epoch(dt)
+    return ts + 1 if dt.microsecond else ts
+
+
+def from_epoch(ts: int, like=None) -> datetime:
+    """
+    Segundos desde EPOCH -> datetime naive. Si like es un datetime con zona horaria, el
+    resultado se devuelve en esa misma zona (los segundos de un datetime aware son UTC).
+    """
+    dt = EPOCH + timedelta(seconds=ts)
+    tz = getattr(like, "tzinfo", None)
+    if tz is not None:
+        dt = dt.replace(tzinfo=timezone.utc).astimezone(tz)
+    return dt
+
+
+def as_epoch(value) -> int:
+    """Acepta datetime o entero (ya en segundos) y devuelve el entero."""
+    return value if isinstance(value, int) else to_epoch(value)
+
+
+# Memo de textos ya parseados: al cargar data.json se repiten mucho los mismos instantes
+# (horas en punto, eventos encadenados). Los datetime son inmutables, se pueden compartir.
+_PARSE_MEMO = {}
+_PARSE_MEMO_MAX = 8192
+
+
+def parse_datetime(text: str) -> datetime:
+    """
+    Convierte un texto en datetime. Camino rápido con datetime.fromisoformat (lo que escribe
+    to_dict) más un memo de textos repetidos; sólo si no es ISO se recurre a dateutil.
+    """
+    dt = _PARSE_MEMO.get(text)
+    if dt is not None:
+        return dt
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        dt = parse(text)
+    if len(_PARSE_MEMO) >= _PARSE_MEMO_MAX:
+        _PARSE_MEMO.clear()
+    _PARSE_MEMO[text] = dt
+    return dt
+
+
 class Event:
     """
     Representa un evento que ocurre en el hotel.
     Incluye nombre, intervalo de tiempo, recursos asignados y recurrencia opcional.
+    start / end son datetime; start_ts / end_ts guardan los mismos instantes como enteros
+    (segundos desde EPOCH) y se mantienen sincronizados: son los que usan los índices del Scheduler.
+    Los recursos se guardan en quantities (nombre normalizado -> cantidad, en orden de alta);
+    resources sigue devolviendo la lista de dicts {name, quantity} de siempre.
     """
+    __slots__ = ("name", "_start", "_end", "start_ts", "end_ts", "recurrence", "quantities", "_scheduled")
 
     def __init__(self, name: str, start, end, resources: list = None, recurrence: str = None):
         if not name or not isinstance(name, str):
             raise ValueError("El nombre del evento debe ser una cadena no vacía.")
         
+        self._scheduled = False   # True mientras está en los índices de un Scheduler
+
         # Convertir start y end a datetime si vienen como string
-        self.start = parse(start) if isinstance(start, str) else start
-        self.end = parse(end) if isinstance(end, str) else end
+        self._start = parse_datetime(start) if isinstance(start, str) else start
+        self._end = parse_datetime(end) if isinstance(end, str) else end
+        self.start_ts = to_epoch(self._start)
+        self.end_ts = to_epoch(self._end)
 
         if self.end <= self.start:
             raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio.")
@@ -21,8 +90,8 @@ class Event:
         self.name = name
         self.recurrence = recurrence  # Por ejemplo: "daily", "weekly", etc.
 
-        # Normalizar y almacenar recursos como lista de dicts {name, quantity}
-        self.resources = []
+        # Normalizar y almacenar recursos como nombre -> cantidad
+        self.quantities = {}
         if resources:
             for r in resources:
                 # r puede ser: objeto Resource (tiene .name), string, o dict {'name', 'quantity'}
@@ -38,9 +107,48 @@ class Event:
                 self.add_resource(rname, qty)
 
     def __repr__(self):
-        res_summary = ", ".join(f"{r['name']}({r['quantity']})" for r in self.resources)
+        res_summary = ", ".join(f"{name}({qty})" for name, qty in self.quantities.items())
         return f"<Event {self.name} ({self.start} - {self.end}) resources: [{res_summary}] recurrence: {self.recurrence}>"
 
+    @property
+    def resources(self) -> list:
+        """Recursos como lista de dicts {'name', 'quantity'} (copia; para modificar usar add/remove_resource)."""
+        return [{"name": name, "quantity": qty} for name, qty in self.quantities.items()]
+
+    @resources.setter
+    def resources(self, value):
+        self._check_mutable()
+        self.quantities = {}
+        for r in value or []:
+            self.add_resource(r)
+
+    @property
+    def start(self) -> datetime:
+        return self._start
+
+    @start.setter
+    def start(self, value: datetime):
+        self._check_mutable()
+        self._start = value
+        self.start_ts = to_epoch(value)
+
+    @property
+    def end(self) -> datetime:
+        return self._end
+
+    @end.setter
+    def end(self, value: datetime):
+        self._check_mutable()
+        self._end = value
+        self.end_ts = to_epoch(value)
+
+    def _check_mutable(self):
+        # Los índices del Scheduler (árboles de intervalos, ocupación) guardan start_ts / end_ts y
+        # cantidades: cambiarlos en sitio los dejaría desincronizados y sin validar la capacidad.
+        if self._scheduled:
+            raise ValueError("El evento está planificado: quítalo del Scheduler (remove_event), "
+                             "modifícalo y vuelve a añadirlo (add_event).")
+
     # ----------------------------
     # Métodos útiles
     # ----------------------------
@@ -53,10 +161,7 @@ class Event:
         Verifica si hay solapamiento de horarios con otro evento.
         Devuelve True si hay conflicto, False si no.
         """
-        latest_start = max(self.start, other_event.start)
-        earliest_end = min(self.end, other_event.end)
-        overlap = (earliest_end - latest_start).total_seconds()
-        return overlap > 0
+        return self.start_ts < other_event.end_ts and other_event.start_ts < self.end_ts
 
     # ----------------------------
     # Gestión de recursos con cantidad
@@ -76,15 +181,12 @@ class Event:
             quantity = int(resource.get("quantity", quantity))
         else:
             name = resource
+        self._check_mutable()
         name = self._normalize_name(name)
         if quantity < 1:
             raise ValueError("quantity debe ser >= 1")
 
-        for entry in self.resources:
-            if entry["name"] == name:
-                entry["quantity"] += int(quantity)
-                return
-        self.resources.append({"name": name, "quantity": int(quantity)})
+        self.quantities[name] = self.quantities.get(name, 0) + int(quantity)
 
     def remove_resource(self, name, quantity: int = None):
         """
@@ -92,22 +194,23 @@ class Event:
         Si quantity es None elimina la entrada por completo.
         Si quantity especificado, resta y elimina si llega a 0.
         """
+        self._check_mutable()
         name = self._normalize_name(name)
-        for entry in list(self.resources):
-            if entry["name"] == name:
-                if quantity is None or quantity >= entry["quantity"]:
-                    self.resources.remove(entry)
-                else:
-                    entry["quantity"] -= int(quantity)
-                return
+        current = self.quantities.get(name)
+        if current is None:
+            return
+        if quantity is None or quantity >= current:
+            del self.quantities[name]
+        else:
+            self.quantities[name] = current - int(quantity)
 
     def get_resource_quantity(self, name) -> int:
-        """Devuelve la cantidad solicitada de un recurso en este evento (0 si no existe)."""
-        name = self._normalize_name(name)
-        for entry in self.resources:
-            if entry["name"] == name:
-                return int(entry["quantity"])
-        return 0
+        """Devuelve la cantidad solicitada de un recurso en este evento (0 si no existe). O(1)."""
+        qty = self.quantities.get(name)
+        if qty is None:
+            # el Scheduler ya pasa nombres normalizados; sólo normalizar si no coincide tal cual
+            qty = self.quantities.get(self._normalize_name(name), 0)
+        return qty
 
     def to_dict(self):
         """Convierte el evento a diccionario serializable (JSON)."""
@@ -115,7 +218,7 @@ class Event:
             "name": self.name,
             "start": self.start.isoformat(),
             "end": self.end.isoformat(),
-            "resources": [{"name": r["name"], "quantity": r["quantity"]} for r in self.resources],
+            "resources": [{"name": name, "quantity": qty} for name, qty in self.quantities.items()],
             "recurrence": self.recurrence
         }
 
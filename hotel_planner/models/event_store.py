@@ -2,6 +2,7 @@ import json
 import shutil
 from pathlib import Path
 from typing import List, Dict, Any
+from .json_stream import iter_events
 
 def write_default_if_missing(default_path: Path, content: Dict[str, Any]):
     default_path.parent.mkdir(parents=True, exist_ok=True)
@@ -29,9 +30,8 @@ def ensure_working_copy(default_path: Path, working_path: Path) -> Path:
     return working_path
 
 def load_events_from_json(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        payload = json.load(f)
-    return payload.get("events", [])
+    # lectura incremental del array "events" (ver json_stream.iter_events para consumirlo sin lista)
+    return list(iter_events(path))
 
 def save_events_to_json(events: List[Dict[str, Any]], path: Path):
     payload = {"version": 1, "events": events}
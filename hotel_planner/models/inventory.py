@@ -1,5 +1,6 @@
 import json
-from hotel_planner.models.resource import Resource, Room, Employee, Item
+from collections import defaultdict
+from hotel_planner.models.resource import Resource, Room, Employee, Item, ConstraintGraph
 
 class Inventory:
     """
@@ -15,12 +16,64 @@ class Inventory:
 
     def __init__(self):
         self.resources = []  # lista de objetos Resource o derivados
+        self.version = 0     # se incrementa con cada cambio (altas, bajas, cantidades, touch)
+        self._graph = None
+        self._graph_version = -1
+        self._reindex()
+
+    # ----------------------------
+    # Índices hash (nombre normalizado / categoría)
+    # ----------------------------
+    @staticmethod
+    def _key(name) -> str:
+        return str(name).lower().strip()
+
+    def _reindex(self):
+        """Reconstruye los índices desde self.resources (p.ej. si alguien modificó la lista a mano)."""
+        self._by_name = {}                    # nombre normalizado -> primer recurso con ese nombre
+        self._by_category = defaultdict(list)  # categoría -> [recursos] en orden de alta
+        for r in self.resources:
+            self._by_name.setdefault(self._key(r.name), r)
+            self._by_category[r.category].append(r)
+        self._indexed = len(self.resources)
+        self.version = getattr(self, "version", 0) + 1
+        self._indexed_version = self.version
+
+    def _check_index(self):
+        """
+        Reconstruye los índices si están desfasados: la versión cambió sin que los mutadores los
+        pusieran al día (touch() tras renombrar o cambiar de categoría un recurso) o la lista se
+        tocó a mano (su longitud ya no coincide).
+        """
+        if self._indexed_version != self.version or self._indexed != len(self.resources):
+            self._reindex()
+
+    def touch(self):
+        """Avisar de cambios hechos a mano en recursos (nombre/requires/excludes/categoría...)."""
+        self.version += 1
+
+    def _bump(self):
+        """Cambio hecho por un mutador que ya dejó los índices al día."""
+        self.version += 1
+        self._indexed_version = self.version
+
+    def constraint_graph(self) -> ConstraintGraph:
+        """Grafo de restricciones compilado; sólo se reconstruye si cambió la versión."""
+        self._check_index()
+        if self._graph is None or self._graph_version != self.version:
+            self._graph = ConstraintGraph(self.resources)
+            self._graph_version = self.version
+        return self._graph
+
+    def required_closure(self, names):
+        """Recursos que faltan (transitivamente) para cubrir los co-requisitos de names."""
+        return self.constraint_graph().required_closure(names)
 
     # ----------------------------
     # Agregar y buscar recursos
     # ----------------------------
     def add_resource(self, resource):
-        """Agrega un nuevo recurso al inventario."""
+        """Agrega un nuevo recurso al inventario y lo devuelve."""
         existing = self.find_by_name(resource.name)
         if existing:
             # sumar cantidades si el atributo existe
@@ -36,25 +89,51 @@ class Inventory:
                     except Exception:
                         pass
         self.resources.append(resource)
+        self._by_name.setdefault(self._key(resource.name), resource)
+        self._by_category[resource.category].append(resource)
+        self._indexed += 1
+        self._bump()
+        return resource
+
+    def remove_resource(self, name) -> bool:
+        """Elimina del inventario todos los recursos con ese nombre (case-insensitive)."""
+        self._check_index()
+        key = self._key(name)
+        if key not in self._by_name:
+            return False
+        removed = [r for r in self.resources if self._key(r.name) == key]
+        self.resources = [r for r in self.resources if self._key(r.name) != key]
+        del self._by_name[key]
+        for r in removed:
+            bucket = self._by_category.get(r.category)
+            if bucket is not None:
+                bucket[:] = [x for x in bucket if x is not r]
+                if not bucket:
+                    del self._by_category[r.category]
+        self._indexed = len(self.resources)
+        self._bump()
+        return True
 
     def find_by_name(self, name):
-        """Busca un recurso por su nombre (case-insensitive)."""
-        for r in self.resources:
-            if r.name.lower() == name.lower():
-                return r
-        return None
+        """Busca un recurso por su nombre (case-insensitive) en O(1)."""
+        self._check_index()
+        return self._by_name.get(self._key(name))
 
     def get_resources_by_category(self, category):
         """Devuelve todos los recursos de una categoría (e.g., 'room', 'employee', 'item')."""
-        return [r for r in self.resources if r.category == category]
+        self._check_index()
+        return list(self._by_category.get(category, ()))
 
     def get_available_resources_by_category(self, category):
         """Devuelve recursos de la categoría que estén disponibles."""
-        return [r for r in self.resources if r.category == category and r.is_available]
+        self._check_index()
+        return [r for r in self._by_category.get(category, ()) if r.is_available]
 
     # ----------------------------
     # Modificar disponibilidad
     # ----------------------------
+    # (sólo cambian cantidades: nombre y categoría siguen igual, así que los índices siguen
+    #  valiendo; la versión sube igualmente para quien cachee según ella)
     def mark_unavailable(self, name, amount=1):
         """
         Marca una o varias unidades de un recurso como no disponibles.
@@ -63,6 +142,7 @@ class Inventory:
         r = self.find_by_name(name)
         if r and r.quantity >= amount:
             r.quantity = r.quantity - amount
+            self._bump()
             return True
         return False
 
@@ -71,6 +151,7 @@ class Inventory:
         r = self.find_by_name(name)
         if r:
             r.quantity = r.quantity + amount
+            self._bump()
             return True
         return False
 
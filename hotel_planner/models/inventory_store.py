@@ -17,35 +17,45 @@ def ensure_working_copy(default_path: Path, working_path: Path) -> Path:
     return working_path
 
 def load_inventory_from_json(path: Path) -> Inventory:
-    inv = Inventory()
     with path.open("r", encoding="utf-8") as f:
         payload = json.load(f)
-    for rd in payload.get("resources", []):
-        rtype = rd.get("type", "").lower()
-        name = rd.get("name")
-        qty = int(rd.get("quantity", 1))
-        requires = rd.get("requires", []) or []
-        excludes = rd.get("excludes", []) or []
-        excat = rd.get("excludes_categories", []) or []
-        try:
-            if rtype == "room" or rd.get("category","").lower()=="room":
-                r = Room(name, int(rd.get("capacity",1)), room_type=rd.get("room_type","estándar"), interior=bool(rd.get("interior",True)))
-                r.quantity = qty
-            elif rtype == "employee" or rd.get("category","").lower()=="employee":
-                r = Employee(name, rd.get("role",""), shift=rd.get("shift","diurno"))
-                r.quantity = qty
-            else:
-                r = Item(name, description=rd.get("description"), quantity=qty)
-        except Exception:
-            r = Resource(name=name, category=rd.get("category","item"), quantity=qty)
-        # aplicar metadatos (normalización en Resource)
-        try:
-            r.requires.update(n.strip().lower() for n in requires if n)
-            r.excludes.update(n.strip().lower() for n in excludes if n)
-            r.excludes_categories.update(n.strip().lower() for n in excat if n)
-        except Exception:
-            pass
-        inv.add_resource(r)
+    return inventory_from_dict(payload)
+
+def resource_from_dict(rd: Dict[str, Any]) -> Resource:
+    """Construye el Resource (Room / Employee / Item) de un dict serializado (Resource.to_dict)."""
+    rtype = rd.get("type", "").lower()
+    name = rd.get("name")
+    qty = int(rd.get("quantity", 1))
+    requires = rd.get("requires", []) or []
+    excludes = rd.get("excludes", []) or []
+    excat = rd.get("excludes_categories", []) or []
+    try:
+        if rtype == "room" or rd.get("category","").lower()=="room":
+            r = Room(name, int(rd.get("capacity",1)), room_type=rd.get("room_type","estándar"), interior=bool(rd.get("interior",True)))
+            r.quantity = qty
+        elif rtype == "employee" or rd.get("category","").lower()=="employee":
+            r = Employee(name, rd.get("role",""), shift=rd.get("shift","diurno"))
+            r.quantity = qty
+        else:
+            r = Item(name, description=rd.get("description"), quantity=qty)
+    except Exception:
+        r = Resource(name=name, category=rd.get("category","item"), quantity=qty)
+    # aplicar metadatos (normalización en Resource)
+    try:
+        r.requires.update(n.strip().lower() for n in requires if n)
+        r.excludes.update(n.strip().lower() for n in excludes if n)
+        r.excludes_categories.update(n.strip().lower() for n in excat if n)
+    except Exception:
+        pass
+    return r
+
+def inventory_from_dict(payload: Dict[str, Any]) -> Inventory:
+    """Construye el Inventory desde un payload ya leído: {"resources": [...]} o el combinado {"inventory": {...}}."""
+    if "resources" not in payload and isinstance(payload.get("inventory"), dict):
+        payload = payload["inventory"]
+    inv = Inventory()
+    for rd in payload.get("resources", []) or []:
+        inv.add_resource(resource_from_dict(rd))
     return inv
 
 def save_inventory_to_json(inv: Inventory, path: Path):
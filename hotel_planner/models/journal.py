@@ -0,0 +1,319 @@
+"""
+Diario de cambios (write-ahead log) junto a data.json.
+
+Cada alta / baja / modificación se añade como una línea JSON al diario
+(data.journal.jsonl, junto al snapshot) en lugar de reescribir todo data.json con
+indent=2. Para leer el estado se carga el snapshot y se reaplican en orden las
+operaciones del diario (Journal.load), o bien se leen los eventos del snapshot en
+streaming aplicándoles el diario según pasan (Journal.stream). Cuando el diario
+supera compact_threshold bytes se vuelca a un snapshot nuevo en un hilo de fondo y
+se vacía.
+
+Compactación: el diario se renombra a data.journal.jsonl.pending (las altas nuevas
+van ya a un diario vacío), se escribe snapshot + pendientes en un fichero temporal
+y se sustituye el snapshot con os.replace antes de borrar el pendiente. Si el
+proceso muere a medias, load() reaplica el pendiente que haya quedado.
+
+Las operaciones son idempotentes (las altas sustituyen por clave y las bajas
+ignoran lo que ya no está), así que reaplicar un diario que el snapshot ya
+incluye no duplica nada. Operaciones admitidas:
+  {"op": "add_event", "event": {...}}                      alta / sustitución (clave: nombre normalizado)
+  {"op": "remove_event", "name": str}                      baja
+  {"op": "set_events", "events": [...]}                    sustituye la lista completa
+  {"op": "put_resource", "resource": {...}}                alta / sustitución por nombre
+  {"op": "remove_resource", "name": str, "cascade": bool}  baja (cascade: y los eventos que lo usan)
+  {"op": "set_inventory", "resources": [...]}              sustituye el inventario completo
+"""
+import json
+import os
+import threading
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from .json_stream import iter_events
+from .store import load_data, save_data
+
+COMPACT_THRESHOLD = 1 << 20   # bytes de diario antes de compactar (1 MiB)
+
+
+def empty_payload() -> Dict[str, Any]:
+    return {"version": 1, "inventory": {"resources": []}, "events": []}
+
+
+def _norm(name) -> str:
+    return str(name or "").strip().lower()
+
+
+def event_key(data: Dict[str, Any]) -> str:
+    """Clave de un evento serializado: su nombre normalizado (único en el Scheduler, como name_to_event)."""
+    return _norm(data.get("name"))
+
+
+def _uses_resource(data: Dict[str, Any], name: str) -> bool:
+    for r in data.get("resources") or []:
+        rname = r.get("name") if isinstance(r, dict) else r
+        if _norm(rname) == name:
+            return True
+    return False
+
+
+def replay(payload: Dict[str, Any], ops: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aplica las operaciones sobre payload ({"inventory": {"resources"}, "events"}) y lo devuelve.
+    Eventos y recursos se indexan por clave una sola vez, de modo que cada operación es O(1)
+    (salvo set_* y las bajas en cascada, que recorren los eventos).
+    """
+    events = {event_key(ev): ev for ev in payload.get("events") or [] if isinstance(ev, dict)}
+    inventory = payload.get("inventory") or {}
+    resources = {_norm(rd.get("name")): rd for rd in inventory.get("resources") or [] if isinstance(rd, dict)}
+    for op in ops:
+        kind = op.get("op")
+        if kind == "add_event":
+            ev = op.get("event") or {}
+            events[event_key(ev)] = ev
+        elif kind == "remove_event":
+            events.pop(event_key(op), None)
+        elif kind == "set_events":
+            events = {event_key(ev): ev for ev in op.get("events") or []}
+        elif kind == "put_resource":
+            rd = op.get("resource") or {}
+            resources[_norm(rd.get("name"))] = rd
+        elif kind == "remove_resource":
+            name = _norm(op.get("name"))
+            resources.pop(name, None)
+            if op.get("cascade"):
+                events = {k: ev for k, ev in events.items() if not _uses_resource(ev, name)}
+        elif kind == "set_inventory":
+            resources = {_norm(rd.get("name")): rd for rd in op.get("resources") or []}
+        # operaciones desconocidas (de versiones futuras) se ignoran
+    payload["inventory"] = {"resources": list(resources.values())}
+    payload["events"] = list(events.values())
+    return payload
+
+
+def replay_events(events: Iterable[Dict[str, Any]], ops: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Versión en streaming de replay(...)["events"]: las operaciones (pocas) se resumen antes en
+    altas / bajas por clave y recursos borrados en cascada, y los eventos del snapshot se filtran
+    según se leen; después van las altas del diario. Mismo conjunto que replay, en otro orden.
+    """
+    keep_snapshot = True
+    changed = {}        # clave -> evento (alta / sustitución) o None (baja)
+    cascaded = set()    # recursos borrados en cascada: sus eventos del snapshot no pasan
+    for op in ops:
+        kind = op.get("op")
+        if kind == "add_event":
+            ev = op.get("event") or {}
+            changed[event_key(ev)] = ev
+        elif kind == "remove_event":
+            changed[event_key(op)] = None
+        elif kind == "set_events":
+            keep_snapshot = False
+            changed = {event_key(ev): ev for ev in op.get("events") or []}
+        elif kind == "remove_resource" and op.get("cascade"):
+            name = _norm(op.get("name"))
+            cascaded.add(name)
+            changed = {k: (None if ev is not None and _uses_resource(ev, name) else ev) for k, ev in changed.items()}
+    if keep_snapshot:
+        for ev in events:
+            if not isinstance(ev, dict) or event_key(ev) in changed:
+                continue
+            if cascaded and any(_uses_resource(ev, name) for name in cascaded):
+                continue
+            yield ev
+    for ev in changed.values():
+        if ev is not None:
+            yield ev
+
+
+def read_ops(path: Path):
+    """Genera las operaciones de un diario; las líneas rotas (escritura cortada por un cierre) se saltan."""
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(op, dict):
+                yield op
+
+
+class Journal:
+    """Diario de operaciones asociado a un snapshot JSON (data.json)."""
+
+    def __init__(self, snapshot_path: Union[str, Path], compact_threshold: int = COMPACT_THRESHOLD, fsync: bool = True):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.stem + ".journal.jsonl")
+        self.pending_path = self.journal_path.with_name(self.journal_path.name + ".pending")
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._compacting = None   # hilo de compactación en curso
+        self._compact_error = None   # excepción de la última compactación en segundo plano
+
+    def __repr__(self):
+        return f"<Journal {self.journal_path}>"
+
+    # ----------------------------
+    # Escritura
+    # ----------------------------
+    def append(self, op: Dict[str, Any]) -> int:
+        """Añade una operación al diario (una línea, sin indentar). Devuelve el tamaño del diario."""
+        return self.extend([op])
+
+    def extend(self, ops: Iterable[Dict[str, Any]]) -> int:
+        text = "".join(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n" for op in ops)
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open("a", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                size = f.tell()
+        if size >= self.compact_threshold:
+            self.compact_async()
+        return size
+
+    def reset(self, payload: Dict[str, Any]):
+        """Sustituye el estado completo (p. ej. al importar): escribe el snapshot y descarta el diario."""
+        self.wait(raise_errors=False)   # el snapshot se sustituye entero: un fallo previo da igual
+        with self._lock:
+            save_data(payload, self.snapshot_path)
+            for p in (self.pending_path, self.journal_path):
+                if p.exists():
+                    p.unlink()
+
+    # ----------------------------
+    # Lectura
+    # ----------------------------
+    def load(self) -> Dict[str, Any]:
+        """
+        Estado actual: snapshot (formato de store.load_data) + diario pendiente + diario.
+        Si el snapshot no se puede leer o decodificar se propaga el error (nunca se sustituye por
+        un estado vacío: quien lo guardara después perdería inventario y eventos).
+        """
+        with self._lock:
+            payload = self._read_snapshot()
+            ops = list(read_ops(self.pending_path))
+            ops.extend(read_ops(self.journal_path))
+        return replay(payload, ops)
+
+    def stream(self) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Estado actual en una sola lectura del snapshot: (cabecera, eventos).
+        La cabecera ("version" e "inventory", con el diario ya aplicado) se decodifica antes del
+        primer evento; los eventos se generan uno a uno (json_stream + replay_events) según se
+        consume el iterador, sin tener la lista entera en memoria.
+        Un snapshot mal formado lanza json.JSONDecodeError (aquí o al consumir los eventos).
+        """
+        with self._lock:
+            ops = list(read_ops(self.pending_path))
+            ops.extend(read_ops(self.journal_path))
+        rest = {}
+        items = iter_events(self.snapshot_path, rest=rest) if self.snapshot_path.exists() else iter(())
+        first = next(items, None)
+        if first is not None:
+            items = chain([first], items)
+            if "inventory" not in rest and "resources" not in rest:
+                items = iter(list(items))   # inventario detrás de los eventos: hay que leerlo todo
+        if rest.get("inventory") is None:
+            rest["inventory"] = {"resources": rest.pop("resources", None) or []}
+        header = replay({"version": rest.get("version", 1), "inventory": rest["inventory"]}, ops)
+        del header["events"]
+        return header, replay_events(items, ops)
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Eventos del estado actual uno a uno (ver stream)."""
+        return self.stream()[1]
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Snapshot en formato de store.load_data; vacío sólo si no existe (los errores de lectura se propagan)."""
+        if not self.snapshot_path.exists():
+            return empty_payload()
+        data = load_data(self.snapshot_path)
+        if data.get("inventory") is None:
+            data["inventory"] = {"resources": []}
+        return data
+
+    # ----------------------------
+    # Compactación
+    # ----------------------------
+    def compact(self) -> bool:
+        """
+        Vuelca el diario en un snapshot nuevo (bloqueante). False si no había nada que compactar.
+        El snapshot se lee antes de apartar el diario: si no se puede leer, el error se propaga y
+        ni el snapshot ni el diario se tocan. Si falla la escritura, el pendiente se conserva y
+        load() lo sigue reaplicando.
+        """
+        with self._lock:
+            if not self.pending_path.exists():
+                if not self.journal_path.exists() or self.journal_path.stat().st_size == 0:
+                    return False
+                payload = self._read_snapshot()
+                os.replace(str(self.journal_path), str(self.pending_path))
+            else:
+                payload = self._read_snapshot()
+            # a partir de aquí nadie más toca snapshot ni pendiente: se escribe fuera del lock
+        payload = replay(payload, read_ops(self.pending_path))
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".compact.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+        except Exception:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+        with self._lock:
+            os.replace(str(tmp), str(self.snapshot_path))
+            self.pending_path.unlink()
+        return True
+
+    def compact_async(self) -> Optional[threading.Thread]:
+        """Lanza compact() en un hilo de fondo (si no hay ya una compactación en curso)."""
+        with self._lock:
+            if self._compacting is not None and self._compacting.is_alive():
+                return None
+            worker = threading.Thread(target=self._compact_quietly, daemon=True)
+            self._compacting = worker
+        worker.start()
+        return worker
+
+    def _compact_quietly(self):
+        try:
+            self.compact()
+        except Exception as exc:
+            # snapshot y diario siguen intactos; el error se entrega en wait()
+            self._compact_error = exc
+
+    def wait(self, raise_errors: bool = True):
+        """
+        Espera a que termine la compactación en curso (si la hay). Si una compactación en segundo
+        plano falló, relanza su excepción (una vez) salvo con raise_errors=False.
+        """
+        worker = self._compacting
+        if worker is not None:
+            worker.join()
+        error, self._compact_error = self._compact_error, None
+        if error is not None and raise_errors:
+            raise error
+
+
+_JOURNALS: Dict[Path, Journal] = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def journal_for(snapshot_path: Union[str, Path]) -> Journal:
+    """Journal compartido para un snapshot (una instancia por ruta, para serializar escrituras)."""
+    key = Path(snapshot_path).expanduser().resolve()
+    with _JOURNALS_LOCK:
+        journal = _JOURNALS.get(key)
+        if journal is None:
+            journal = _JOURNALS[key] = Journal(key)
+        return journal
@@ -0,0 +1,157 @@
+"""
+Lectura incremental de ficheros JSON grandes (data.json con decenas de miles de eventos).
+
+En lugar de json.load (texto completo + todos los dicts en memoria a la vez) se lee el
+fichero por bloques y se decodifica cada elemento del array "events" con
+JSONDecoder.raw_decode en cuanto está completo; los elementos se entregan uno a uno,
+de modo que la memoria pico es un bloque de texto más el elemento en curso y quien
+consume (p. ej. Scheduler.ingest_events) puede ir construyendo los Event sobre la marcha.
+
+Sólo se recorre el objeto de nivel superior: las demás claves ("version", "inventory")
+se decodifican y se descartan, o se guardan en el dict `rest` si se pasa uno (así la
+misma pasada sirve para leer el inventario que va delante de los eventos).
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Union
+
+CHUNK_SIZE = 1 << 16   # caracteres leídos por bloque
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,]}:")
+
+
+class _Reader:
+    """Buffer sobre un fichero de texto que decodifica valores JSON completos con raw_decode."""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, want: int) -> bool:
+        """Lee al menos want caracteres más (descartando lo ya consumido). False si no quedaba nada."""
+        if self.eof:
+            return False
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        got = False
+        while want > 0:
+            chunk = self.fp.read(max(want, self.chunk_size))
+            if not chunk:
+                self.eof = True
+                break
+            self.buf += chunk
+            want -= len(chunk)
+            got = True
+        return got
+
+    def peek(self) -> str:
+        """Siguiente carácter que no sea espacio ('' al final del fichero)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"JSON inesperado: se esperaba {char!r} y hay {found!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decodifica el siguiente valor completo. El resultado de raw_decode sólo se acepta si lo que
+        sigue es un separador (espacio o ,]}:) o el final del fichero: un número cortado en el
+        borde del bloque ("12" de "12.5") se decodifica sin error pero no ha terminado. Si no, o si
+        raw_decode falla, se leen más datos y se reintenta, doblando lo que se pide para que un
+        valor muy largo no cueste O(n^2).
+        """
+        self.peek()
+        want = self.chunk_size
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                if (end < len(self.buf) and self.buf[end] in _DELIMITERS) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill(want):
+                continue   # eof: el siguiente intento decide
+            want *= 2
+
+
+def iter_array(fp: TextIO, key: str = "events", chunk_size: int = CHUNK_SIZE,
+               rest: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Genera los elementos del array payload[key] de un objeto JSON, sin cargarlo entero.
+    Si el documento es directamente un array se generan sus elementos; si falta la clave, nada.
+    rest: si se pasa, recibe las demás claves del objeto según se van leyendo.
+    Un documento mal formado lanza json.JSONDecodeError.
+    """
+    reader = _Reader(fp, chunk_size)
+    first = reader.peek()
+    if first == "[":
+        yield from _iter_items(reader)
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            yield from _iter_items(reader)
+        elif rest is not None:
+            rest[name] = reader.value()
+        else:
+            reader.value()
+        sep = reader.peek()
+        if sep == "}":
+            return
+        reader.expect(",")
+
+
+def _iter_items(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+def iter_events(path: Union[str, Path], chunk_size: int = CHUNK_SIZE,
+                rest: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Eventos (dicts) del fichero uno a uno; el fichero se cierra al agotar (o descartar) el generador.
+    rest: ver iter_array (recibe "version", "inventory", ...).
+    """
+    with Path(path).open("r", encoding="utf-8") as fp:
+        for item in iter_array(fp, "events", chunk_size, rest):
+            if isinstance(item, dict):
+                yield item
+
+
+def counting(items, every: int = 5000, progress: Optional[Callable[[int], None]] = None):
+    """Pasa los elementos tal cual llamando a progress(n) cada `every` (para mostrar avance al cargar)."""
+    n = 0
+    for item in items:
+        yield item
+        n += 1
+        if progress is not None and n % every == 0:
+            progress(n)
+    if progress is not None and n % every:
+        progress(n)
@@ -4,7 +4,10 @@ class Resource:
     """
     Clase base para todos los recursos del hotel.
     Representa cualquier activo limitado que puede ser asignado a un evento.
+    Usa __slots__ (igual que sus subclases) para ocupar poco con inventarios grandes.
     """
+    __slots__ = ("name", "category", "_quantity", "available", "requires", "excludes", "excludes_categories")
+
     def __init__(
         self,
         name: str,
@@ -81,6 +84,8 @@ class Room(Resource):
     """
     Representa un espacio físico dentro del hotel (interior o exterior).
     """
+    __slots__ = ("capacity", "room_type", "interior")
+
     def __init__(self, name, capacity, room_type="estándar", interior=True):
         super().__init__(name, category="room", quantity=1)
         if not isinstance(capacity, int) or capacity < 1:
@@ -105,6 +110,8 @@ class Employee(Resource):
     """
     Representa a un miembro del personal del hotel.
     """
+    __slots__ = ("role", "shift")
+
     def __init__(self, name, role, shift="diurno"):
         super().__init__(name, category="employee", quantity=1)
         if not role or not isinstance(role, str):
@@ -127,6 +134,8 @@ class Item(Resource):
     """
     Representa un equipo o material del inventario.
     """
+    __slots__ = ("description",)
+
     def __init__(self, name, description=None, quantity=1, **kwargs):
         super().__init__(name, category="item", quantity=quantity, **kwargs)
         self.description = description
@@ -202,3 +211,257 @@ def validate_resource_constraints(
     if errors:
         return (False, errors)
     return (True, {})
+
+
+
+class ConstraintGraph:
+    """
+    Restricciones del inventario compiladas para validar selecciones rápidamente.
+
+    Cada nombre relevante (recursos y nombres citados en 'requires') recibe un id entero;
+    'requires'/'excludes' se guardan como listas de adyacencia de ids y las exclusiones por
+    categoría como máscaras de bits sobre ids de categoría. Se construye una vez por versión
+    del inventario (ver Inventory.constraint_graph) y validar una selección es O(seleccionados).
+    Produce exactamente los mismos resultados que validate_resource_constraints.
+
+    Además cada recurso tiene máscaras de bits (int de Python) con sus co-requisitos y con todo
+    lo que excluye (por nombre y por categoría). Una selección se codifica como máscara y la
+    comprobación es un par de operaciones de bits (mask_ok); los detalles del error sólo se
+    reconstruyen cuando la comprobación falla.
+    """
+
+    def __init__(self, all_resources: Iterable['Resource']):
+        # como en validate_resource_constraints, si hay nombres repetidos gana el último
+        name_map: Dict[str, Resource] = {res.name.strip().lower(): res for res in all_resources}
+
+        self.ids: Dict[str, int] = {}
+        self.keys: List[str] = []                        # id -> nombre normalizado
+        self.resource_at: List[Union['Resource', None]] = []  # id -> recurso (None si sólo se cita)
+        category_ids: Dict[str, int] = {}
+
+        def intern(key: str) -> int:
+            idx = self.ids.get(key)
+            if idx is None:
+                idx = len(self.keys)
+                self.ids[key] = idx
+                self.keys.append(key)
+                self.resource_at.append(name_map.get(key))
+            return idx
+
+        for key in name_map:
+            intern(key)
+        for res in name_map.values():
+            for req in res.requires:
+                intern(req)
+
+        n = len(self.keys)
+        self.requires: List[Tuple[int, ...]] = [()] * n
+        self.excludes: List[Tuple[int, ...]] = [()] * n
+        self.category_bit: List[int] = [0] * n
+        self.excluded_categories: List[int] = [0] * n
+        for key, res in name_map.items():
+            idx = self.ids[key]
+            self.requires[idx] = tuple(self.ids[req] for req in res.requires)
+            self.excludes[idx] = tuple(self.ids[ex] for ex in res.excludes if ex in name_map)
+            if res.category:
+                cat = res.category.strip().lower()
+                self.category_bit[idx] = 1 << category_ids.setdefault(cat, len(category_ids))
+        for key, res in name_map.items():
+            mask = 0
+            for cat in res.excludes_categories:
+                if cat in category_ids:
+                    mask |= 1 << category_ids[cat]
+            self.excluded_categories[self.ids[key]] = mask
+
+        # máscaras por id: co-requisitos y todo lo que excluye (nombres + miembros de categorías)
+        category_members: Dict[int, int] = {}
+        for idx, bit in enumerate(self.category_bit):
+            if bit:
+                category_members[bit] = category_members.get(bit, 0) | (1 << idx)
+        self.requires_mask: List[int] = [0] * n
+        self.conflict_mask: List[int] = [0] * n
+        for idx in range(n):
+            req_mask = 0
+            for req in self.requires[idx]:
+                req_mask |= 1 << req
+            self.requires_mask[idx] = req_mask
+            excl_mask = 0
+            for ex in self.excludes[idx]:
+                excl_mask |= 1 << ex
+            if self.excluded_categories[idx]:
+                for bit, members in category_members.items():
+                    if bit & self.excluded_categories[idx]:
+                        excl_mask |= members
+            self.conflict_mask[idx] = excl_mask
+
+        self._closure = None   # cierre transitivo de requires, bajo demanda
+
+    def _compute_closures(self):
+        """
+        Cierre transitivo de 'requires' para todos los ids (Tarjan iterativo sobre componentes
+        fuertemente conexas: los ciclos se detectan y cada componente comparte su cierre).
+        Se calcula una sola vez por grafo, la primera vez que se pide.
+        """
+        n = len(self.keys)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []   # en orden topológico inverso (sucesores primero)
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                succ = self.requires[v]
+                if i < len(succ):
+                    work.append((v, i + 1))
+                    w = succ[i]
+                    if index[w] == -1:
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+                if low[v] == index[v]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp.append(w)
+                        if w == v:
+                            break
+                    components.append(comp)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+
+        closure = [0] * n
+        cycles = []
+        for comp in components:
+            members = 0
+            for v in comp:
+                members |= 1 << v
+            reach = 0
+            for v in comp:
+                for w in self.requires[v]:
+                    reach |= (1 << w) | closure[w]
+            if len(comp) > 1 or reach & members:
+                reach |= members
+                cycles.append(sorted(self.keys[v] for v in comp))
+            for v in comp:
+                closure[v] = reach
+        self._closure = closure
+        self.requirement_cycles: List[List[str]] = cycles
+
+    def closure_mask(self, mask: int) -> int:
+        """Máscara con todo lo que la selección necesita, directa o indirectamente."""
+        if self._closure is None:
+            self._compute_closures()
+        required = 0
+        remaining = mask
+        while remaining:
+            bit = remaining & -remaining
+            required |= self._closure[bit.bit_length() - 1]
+            remaining ^= bit
+        return required
+
+    def required_closure(self, selected: Iterable[Union['Resource', str]]) -> List[str]:
+        """
+        Nombres que faltan para que la selección cumpla todos sus co-requisitos (transitivos),
+        con el nombre del inventario si existe o el nombre normalizado si sólo se cita.
+        """
+        mask = self.selection_mask(selected)
+        missing = self.closure_mask(mask) & ~mask
+        out = []
+        while missing:
+            bit = missing & -missing
+            idx = bit.bit_length() - 1
+            res = self.resource_at[idx]
+            out.append(res.name if res is not None else self.keys[idx])
+            missing ^= bit
+        return sorted(out)
+
+    def cycles(self) -> List[List[str]]:
+        """Ciclos de co-requisitos detectados (listas de nombres normalizados)."""
+        if self._closure is None:
+            self._compute_closures()
+        return self.requirement_cycles
+
+    def selection_mask(self, selected: Iterable[Union['Resource', str]]) -> int:
+        """Codifica una selección de recursos como máscara de bits (ignora nombres desconocidos)."""
+        ids = self.ids
+        mask = 0
+        for s in selected:
+            idx = ids.get(_norm_name(s))
+            if idx is not None:
+                mask |= 1 << idx
+        return mask
+
+    def mask_ok(self, mask: int) -> bool:
+        """True si la selección codificada cumple co-requisitos y exclusiones."""
+        required = 0
+        excluded = 0
+        remaining = mask
+        requires_mask, conflict_mask = self.requires_mask, self.conflict_mask
+        while remaining:
+            low = remaining & -remaining
+            idx = low.bit_length() - 1
+            required |= requires_mask[idx]
+            excluded |= conflict_mask[idx]
+            remaining ^= low
+        return not (required & ~mask) and not (excluded & mask)
+
+    def validate(self, selected: Iterable[Union['Resource', str]]) -> Tuple[bool, Dict[str, List[str]]]:
+        """Igual que validate_resource_constraints(selected, recursos_del_inventario)."""
+        selected = list(selected)
+        if self.mask_ok(self.selection_mask(selected)):
+            return (True, {})
+
+        # camino de error: reconstruir el detalle como el validador original
+        ids = self.ids
+        sel: Set[int] = set()
+        for s in selected:
+            idx = ids.get(_norm_name(s))
+            if idx is not None:
+                sel.add(idx)
+
+        resource_at = self.resource_at
+        errors: Dict[str, List] = {}
+        missing = {}
+        for idx in sel:
+            res = resource_at[idx]
+            if res is None:
+                continue
+            for req in self.requires[idx]:
+                if req not in sel:
+                    missing.setdefault(res.name, []).append(self.keys[req])
+        if missing:
+            errors["missing_requires"] = missing
+
+        sel_categories = 0
+        for idx in sel:
+            sel_categories |= self.category_bit[idx]
+        conflicts = []
+        for idx in sel:
+            res = resource_at[idx]
+            if res is None:
+                continue
+            violated = [resource_at[ex].name for ex in self.excludes[idx] if ex in sel]
+            if self.excluded_categories[idx] & sel_categories:
+                mask = self.excluded_categories[idx]
+                violated.extend(resource_at[o].name for o in sel if self.category_bit[o] & mask)
+            if violated:
+                conflicts.append({"resource": res.name, "conflicts_with": sorted(set(violated))})
+        if conflicts:
+            errors["mutual_exclusion"] = conflicts
+
+        if errors:
+            return (False, errors)
+        return (True, {})
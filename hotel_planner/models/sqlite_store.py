@@ -0,0 +1,251 @@
+"""
+Almacenamiento en SQLite (sqlite3 de la biblioteca estándar) como alternativa a data.json.
+
+Misma superficie que models/store.py: load_data(path) devuelve el payload de siempre
+({"version", "inventory": {"resources"}, "events"}) y save_data(payload, path) lo guarda;
+además SqliteStore permite altas / bajas sueltas (una fila, sin reescribir nada más;
+apply_changes aplica varias en una transacción) y
+consultas por rango resueltas en la base de datos sin cargar todos los eventos.
+
+Tablas:
+  resources(key, name, type, quantity, data)            key = nombre normalizado
+  events(id, key, name, start_ts, end_ts, period, data)  un evento por nombre normalizado (como el Scheduler)
+  event_resources(event_id, resource, quantity, start_ts, end_ts)
+Los instantes son enteros (segundos desde EPOCH, como Event.start_ts) y event_resources
+repite start_ts / end_ts para que el índice (resource, start_ts, end_ts) resuelva solo
+"eventos del recurso X que solapan [a, b)". data guarda el dict original (to_dict) en JSON.
+
+La base se abre en modo WAL (lecturas concurrentes con una escritura) y todas las
+sentencias son textos constantes con parámetros: sqlite3 las compila una vez y las
+reutiliza desde su caché de sentencias preparadas.
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+from .event import parse_datetime, to_epoch, as_epoch
+from hotel_planner.core.recurrence import recurrence_period
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS resources (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    period INTEGER,
+    data TEXT NOT NULL,
+    UNIQUE (key)
+);
+CREATE TABLE IF NOT EXISTS event_resources (
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    resource TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_range ON events (start_ts, end_ts);
+CREATE INDEX IF NOT EXISTS idx_events_recurring ON events (period, start_ts) WHERE period IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_event_resources_range ON event_resources (resource, start_ts, end_ts);
+CREATE INDEX IF NOT EXISTS idx_event_resources_event ON event_resources (event_id);
+"""
+
+_INSERT_RESOURCE = "INSERT OR REPLACE INTO resources (key, name, type, quantity, data) VALUES (?, ?, ?, ?, ?)"
+_DELETE_RESOURCE = "DELETE FROM resources WHERE key = ?"
+_INSERT_EVENT = "INSERT OR REPLACE INTO events (key, name, start_ts, end_ts, period, data) VALUES (?, ?, ?, ?, ?, ?)"
+_INSERT_EVENT_RESOURCE = "INSERT INTO event_resources (event_id, resource, quantity, start_ts, end_ts) VALUES (?, ?, ?, ?, ?)"
+_DELETE_EVENT = "DELETE FROM events WHERE key = ?"
+_DELETE_EVENTS_USING = "DELETE FROM events WHERE id IN (SELECT event_id FROM event_resources WHERE resource = ?)"
+_SELECT_RANGE = ("SELECT data FROM events WHERE start_ts < ? AND end_ts > ? "
+                 "UNION ALL SELECT data FROM events WHERE period IS NOT NULL AND end_ts <= ? AND start_ts < ? "
+                 "AND start_ts + ((? - end_ts) / period + 1) * period < ?")
+_SELECT_RANGE_RESOURCE = ("SELECT e.data FROM event_resources r JOIN events e ON e.id = r.event_id "
+                          "WHERE r.resource = ? AND r.start_ts < ? AND r.end_ts > ? "
+                          "UNION ALL SELECT e.data FROM event_resources r JOIN events e ON e.id = r.event_id "
+                          "WHERE r.resource = ? AND e.period IS NOT NULL AND r.end_ts <= ? AND r.start_ts < ? "
+                          "AND e.start_ts + ((? - e.end_ts) / e.period + 1) * e.period < ?")
+
+
+def is_sqlite_path(path: Union[str, Path]) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def _norm(name) -> str:
+    return str(name or "").strip().lower()
+
+
+def _ts(value) -> int:
+    return to_epoch(parse_datetime(value)) if isinstance(value, str) else as_epoch(value)
+
+
+class SqliteStore:
+    """Conexión a una base de datos de la planificación (se crea el esquema si no existe)."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<SqliteStore {self.path}>"
+
+    def close(self):
+        self.conn.close()
+
+    # ----------------------------
+    # Payload completo (superficie de store.py)
+    # ----------------------------
+    def load(self) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return {
+            "version": int(row[0]) if row else 1,
+            "inventory": {"resources": self.list_resources()},
+            "events": self.list_events(),
+        }
+
+    def save(self, payload: Dict[str, Any]):
+        """Sustituye todo el contenido por el payload (una transacción)."""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                              (str(payload.get("version", 1)),))
+            self._set_inventory((payload.get("inventory") or {}).get("resources") or [])
+            self._replace_events(payload.get("events") or [])
+
+    # ----------------------------
+    # Recursos
+    # ----------------------------
+    def list_resources(self) -> List[dict]:
+        return [json.loads(d) for (d,) in self.conn.execute("SELECT data FROM resources ORDER BY rowid")]
+
+    def put_resource(self, resource: Dict[str, Any]):
+        with self.conn:
+            self._put_resources([resource])
+
+    def set_inventory(self, resources: Iterable[Dict[str, Any]]):
+        with self.conn:
+            self._set_inventory(resources)
+
+    def remove_resource(self, name: str, cascade: bool = False) -> bool:
+        """Elimina un recurso; con cascade también los eventos que lo usan."""
+        key = _norm(name)
+        with self.conn:
+            if cascade:
+                self.conn.execute(_DELETE_EVENTS_USING, (key,))
+            return self.conn.execute(_DELETE_RESOURCE, (key,)).rowcount > 0
+
+    def _put_resources(self, resources):
+        self.conn.executemany(_INSERT_RESOURCE, (
+            (_norm(rd.get("name")), rd.get("name"), rd.get("type") or rd.get("category"),
+             int(rd.get("quantity", 1)), json.dumps(rd, ensure_ascii=False))
+            for rd in resources))
+
+    def _set_inventory(self, resources):
+        self.conn.execute("DELETE FROM resources")
+        self._put_resources(resources)
+
+    # ----------------------------
+    # Eventos
+    # ----------------------------
+    def list_events(self) -> List[dict]:
+        return [json.loads(d) for (d,) in self.conn.execute("SELECT data FROM events ORDER BY start_ts, id")]
+
+    def count_events(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def add_event(self, event: Dict[str, Any]):
+        """Alta (o sustitución: mismo nombre normalizado, aunque cambie el inicio) de un evento serializado."""
+        with self.conn:
+            self._insert_events([event])
+
+    def add_events(self, events: Iterable[Dict[str, Any]]):
+        with self.conn:
+            self._insert_events(events)
+
+    def replace_events(self, events: Iterable[Dict[str, Any]]):
+        """Sustituye todos los eventos (el inventario no se toca)."""
+        with self.conn:
+            self._replace_events(events)
+
+    def remove_event(self, name: str) -> bool:
+        with self.conn:
+            return self.conn.execute(_DELETE_EVENT, (_norm(name),)).rowcount > 0
+
+    def apply_changes(self, removed: Iterable[str], events: Iterable[Dict[str, Any]]):
+        """Bajas (por nombre) y altas / sustituciones sueltas en una sola transacción."""
+        with self.conn:
+            self.conn.executemany(_DELETE_EVENT, ((_norm(name),) for name in removed))
+            self._insert_events(events)
+
+    def events_between(self, start, end, resource: Optional[str] = None) -> List[dict]:
+        """
+        Eventos (dicts serializados) con alguna ocurrencia que solapa [start, end), ordenados por inicio.
+        Se resuelve en SQLite con los índices de rango; los recurrentes entran si alguna repetición
+        cae en la ventana (la primera con fin > start empieza antes de end).
+        """
+        s, e = as_epoch(start), as_epoch(end)
+        if resource is None:
+            rows = self.conn.execute(_SELECT_RANGE, (e, s, s, e, s, e))
+        else:
+            rows = self.conn.execute(_SELECT_RANGE_RESOURCE, (_norm(resource), e, s, _norm(resource), s, e, s, e))
+        events = [json.loads(d) for (d,) in rows]
+        events.sort(key=lambda ev: _ts(ev.get("start")))
+        return events
+
+    def _insert_events(self, events):
+        cur = self.conn.cursor()
+        links = []
+        for ev in events:
+            start_ts, end_ts = _ts(ev.get("start")), _ts(ev.get("end"))
+            period = recurrence_period(ev.get("recurrence"))
+            period = int(period.total_seconds()) if period is not None else None
+            cur.execute(_DELETE_EVENT, (_norm(ev.get("name")),))
+            cur.execute(_INSERT_EVENT, (_norm(ev.get("name")), ev.get("name"), start_ts, end_ts, period,
+                                        json.dumps(ev, ensure_ascii=False)))
+            event_id = cur.lastrowid
+            for r in ev.get("resources") or []:
+                if isinstance(r, dict):
+                    rname, qty = r.get("name"), int(r.get("quantity", 1))
+                else:
+                    rname, qty = r, 1
+                links.append((event_id, _norm(rname), qty, start_ts, end_ts))
+        cur.executemany(_INSERT_EVENT_RESOURCE, links)
+
+    def _replace_events(self, events):
+        self.conn.execute("DELETE FROM event_resources")
+        self.conn.execute("DELETE FROM events")
+        self._insert_events(events)
+
+
+def load_data(path: Union[str, Path]) -> Dict[str, Any]:
+    with SqliteStore(path) as db:
+        return db.load()
+
+
+def save_data(payload: Dict[str, Any], path: Union[str, Path]):
+    with SqliteStore(path) as db:
+        db.save(payload)
@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timedelta
+
+from hotel_planner.models.journal import journal_for
+from hotel_planner.ui.bootstrap import bootstrap, DATA_DEFAULT
+
+
+BASE = datetime(2026, 8, 3, 9, 0)
+
+
+def _event(name, hours=0, qty=1):
+    start = BASE + timedelta(hours=hours)
+    return {"name": name, "start": start.isoformat(), "end": (start + timedelta(hours=2)).isoformat(),
+            "resources": [{"name": "Proyector", "quantity": qty}]}
+
+
+def test_bootstrap_builds_controller_in_one_pass(tmp_path):
+    default = tmp_path / "default_data.json"
+    data = tmp_path / "work" / "data.json"
+    default.write_text(json.dumps({
+        "version": 1,
+        "inventory": {"resources": [{"type": "Item", "name": "Proyector", "quantity": 2, "excludes": ["Atril"]},
+                                    {"type": "Item", "name": "Pantalla", "quantity": 5}]},
+        "events": [_event("Charla"), _event("Taller", 1), _event("Demasiado", 1, qty=2)],
+    }), encoding="utf-8")
+
+    boot = bootstrap(data_path=data, default_path=default)
+    assert data.exists()
+    assert set(boot.timings) == {"files", "read", "inventory", "events", "total"}
+    controller = boot.controller
+    assert [r["name"] if isinstance(r, dict) else r.name for r in controller.list_resources()] == ["Proyector", "Pantalla"]
+    assert controller.scheduler.inventory.find_by_name("proyector").excludes == {"atril"}
+    # una sola ingesta validada: el tercer evento supera la capacidad y se rechaza
+    assert [e["name"] for e in controller.list_events()] == ["Charla", "Taller"]
+    assert set(boot.errors) == {"Demasiado"}
+    assert controller.events_path == data and controller.journal is journal_for(data)
+
+    # el siguiente arranque ve las operaciones del diario sin compactar
+    controller.journal.append({"op": "remove_event", "name": "Charla"})
+    again = bootstrap(data_path=data, default_path=default)
+    assert [e["name"] for e in again.controller.list_events()] == ["Taller"]
+    assert set(again.errors) == {"Demasiado"}
+
+
+def test_default_data_bootstraps_cleanly(tmp_path):
+    boot = bootstrap(data_path=tmp_path / "data.json", default_path=DATA_DEFAULT)
+    assert len(boot.controller.scheduler.inventory.resources) > 0
+
+
+def test_corrupt_working_copy_is_set_aside_and_restored(tmp_path):
+    default = tmp_path / "default_data.json"
+    data = tmp_path / "data.json"
+    default.write_text(json.dumps({
+        "version": 1,
+        "inventory": {"resources": [{"type": "Item", "name": "Proyector", "quantity": 2}]},
+        "events": [_event("Charla")],
+    }), encoding="utf-8")
+    broken = '{"version": 1, "inventory": {"resources": []}, "events": [{"name": "Roto", "start": '
+    data.write_text(broken, encoding="utf-8")
+
+    boot = bootstrap(data_path=data, default_path=default)
+    assert [e["name"] for e in boot.controller.list_events()] == ["Charla"]
+    assert boot.errors is None
+    assert data.with_name("data.json.corrupt").read_text(encoding="utf-8") == broken
+    assert json.loads(data.read_text(encoding="utf-8")) == json.loads(default.read_text(encoding="utf-8"))
+
@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item, Employee
+from hotel_planner.models.event import Event
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+
+
+BASE = datetime(2026, 6, 1, 8, 0)
+
+
+def _inventory():
+    inv = Inventory()
+    inv.add_resource(Item("Mesa", quantity=3))
+    inv.add_resource(Item("Micrófono", quantity=2, requires=["Técnico"]))
+    inv.add_resource(Employee("Técnico", role="sonido"))
+    inv.add_resource(Item("Carpa", quantity=1))
+    return inv
+
+
+def _random_payload(n, seed):
+    rnd = random.Random(seed)
+    payload = []
+    for i in range(n):
+        start = BASE + timedelta(minutes=30 * rnd.randint(0, 200))
+        end = start + timedelta(minutes=30 * rnd.randint(1, 8))
+        resources = [{"name": "Mesa", "quantity": rnd.randint(1, 2)}]
+        if rnd.random() < 0.3:
+            resources.append({"name": "Micrófono", "quantity": 1})
+            if rnd.random() < 0.8:
+                resources.append({"name": "Técnico", "quantity": 1})
+        if rnd.random() < 0.05:
+            resources.append({"name": "Inexistente", "quantity": 1})
+        name = f"ev{rnd.randint(0, n)}" if rnd.random() < 0.1 else f"ev{i}"
+        payload.append(Event(name, start, end, resources=resources).to_dict())
+    payload.append({"name": "roto", "start": "no-es-fecha", "end": "2026-01-01T00:00:00"})
+    return payload
+
+
+def _state(sched):
+    return sorted((e.name, e.start, e.end) for e in sched.list_events())
+
+
+def test_bulk_ingest_matches_sequential_add_event():
+    for seed in range(5):
+        payload = _random_payload(150, seed)
+
+        sequential = Scheduler(_inventory())
+        seq_errors = {}
+        for ed in payload:
+            try:
+                ev = Event.from_dict(ed)
+            except Exception:
+                seq_errors[ed["name"]] = "invalid"
+                continue
+            ok, reason = sequential.add_event(ev)
+            if not ok:
+                seq_errors[ev.name] = reason
+
+        bulk = Scheduler(_inventory())
+        ok, errors = bulk.load_events_from_list(payload)
+        assert not ok
+        assert set(errors) == set(seq_errors)
+        assert _state(bulk) == _state(sequential)
+
+        # los índices por recurso quedan coherentes con add/remove incrementales
+        for name in ("mesa", "micrófono", "técnico"):
+            t0 = BASE + timedelta(hours=10)
+            assert bulk._peak_reserved(name, t0, t0 + timedelta(hours=6)) == sequential._peak_reserved(name, t0, t0 + timedelta(hours=6))
+
+
+def test_unvalidated_load_and_append_mode():
+    payload = _random_payload(60, 42)[:-1]
+    sched = Scheduler(_inventory())
+    assert sched.load_events_from_list(payload, validate=False) == (True, None)
+    assert len(sched.list_events()) == len(payload)
+    starts = [e.start for e in sched.list_events()]
+    assert starts == sorted(starts)
+
+    sched = Scheduler(_inventory())
+    first = Event("Primero", BASE, BASE + timedelta(hours=1), resources=["Carpa"])
+    assert sched.add_event(first)[0]
+    clash = Event("Choque", BASE, BASE + timedelta(hours=2), resources=["Carpa"]).to_dict()
+    later = Event("Después", BASE + timedelta(hours=1), BASE + timedelta(hours=2), resources=["Carpa"]).to_dict()
+    ok, errors = sched.ingest_events([clash, later], replace=False)
+    assert not ok and set(errors) == {"Choque"}
+    assert [e.name for e in sched.list_events()] == ["Primero", "Después"]
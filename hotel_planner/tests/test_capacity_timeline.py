@@ -0,0 +1,59 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.event import Event
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.core.capacity_timeline import CapacityTimeline
+
+
+BASE = datetime(2026, 1, 1, 8, 0)
+
+
+def test_max_over_matches_brute_force():
+    rnd = random.Random(3)
+    timeline = CapacityTimeline()
+    booked = []
+    for _ in range(200):
+        s = rnd.randint(0, 300)
+        e = s + rnd.randint(1, 20)
+        q = rnd.randint(1, 3)
+        timeline.add(s, e, q)
+        booked.append((s, e, q))
+    for s, e, q in booked[::4]:
+        timeline.remove(s, e, q)
+    booked = [b for i, b in enumerate(booked) if i % 4 != 0]
+
+    def level(t):
+        return sum(q for s, e, q in booked if s <= t < e)
+
+    for _ in range(300):
+        qs = rnd.randint(-5, 320)
+        qe = qs + rnd.randint(1, 30)
+        assert timeline.max_over(qs, qe) == max(level(t) for t in range(qs, qe))
+        assert timeline.level_at(qs) == level(qs)
+        segs = list(timeline.segments(qs, qe))
+        assert segs[0][0] == qs and segs[-1][1] == qe
+        assert all(lvl == level(a) for a, b, lvl in segs)
+
+
+def test_back_to_back_bookings_do_not_double_count():
+    inv = Inventory()
+    inv.add_resource(Item("Extintor", quantity=1))
+    sched = Scheduler(inv)
+
+    morning = Event("Mañana", BASE, BASE + timedelta(hours=2), resources=["Extintor"])
+    afternoon = Event("Tarde", BASE + timedelta(hours=2), BASE + timedelta(hours=4), resources=["Extintor"])
+    assert sched.add_event(morning)[0]
+    assert sched.add_event(afternoon)[0]
+
+    inv.find_by_name("Extintor").quantity = 2
+    # una jornada completa solo necesita 1 unidad extra: el pico simultáneo es 1
+    full_day = Event("Jornada", BASE, BASE + timedelta(hours=4), resources=["Extintor"])
+    ok, reason = sched.add_event(full_day)
+    assert ok, reason
+
+    overlap = Event("Extra", BASE + timedelta(hours=1), BASE + timedelta(hours=3), resources=["Extintor"])
+    ok, reason = sched.add_event(overlap)
+    assert not ok and "libres: 0" in reason
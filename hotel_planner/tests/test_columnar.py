@@ -0,0 +1,114 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.event import Event
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+
+
+BASE = datetime(2026, 9, 1, 8, 0)
+
+
+def _loaded_scheduler(n=300, seed=5):
+    rnd = random.Random(seed)
+    inv = Inventory()
+    for name, qty in (("Mesa", 6), ("Atril", 1), ("Foco", 3)):
+        inv.add_resource(Item(name, quantity=qty))
+    payload = []
+    for i in range(n):
+        start = BASE + timedelta(minutes=30 * rnd.randint(0, 300))
+        end = start + timedelta(minutes=30 * rnd.randint(1, 8))
+        res = [{"name": rnd.choice(["Mesa", "Atril", "Foco"]), "quantity": rnd.randint(1, 2)} for _ in range(rnd.randint(0, 2))]
+        payload.append(Event(f"ev{i}", start, end, resources=res).to_dict())
+    sched = Scheduler(inv)
+    sched.load_events_from_list(payload, validate=False)   # admite sobre-reservas a propósito
+    return sched
+
+
+def test_columnar_queries_match_python_loops():
+    sched = _loaded_scheduler()
+    col = sched.columnar()
+    events = sched.list_events()
+    assert len(col) == len(events) and col.events == events
+    assert col.res_ptr[-1] == sum(len(ev.quantities) for ev in events)
+
+    counts = col.overlap_counts()
+    for ev in events[::17]:
+        idx = events.index(ev)
+        assert counts[idx] == sum(1 for other in events if other is not ev and ev.conflicts_with(other))
+
+    rnd = random.Random(1)
+    for _ in range(50):
+        qs = BASE + timedelta(minutes=15 * rnd.randint(0, 600))
+        qe = qs + timedelta(minutes=15 * rnd.randint(1, 20))
+        assert {ev.name for ev in col.overlapping(qs, qe)} == {ev.name for ev in sched.events_between(qs, qe)}
+        for name in ("mesa", "atril", "foco"):
+            assert col.resource_usage(name, qs, qe) == sum(ev.get_resource_quantity(name) for ev in sched.events_between(qs, qe))
+
+    whole = (BASE - timedelta(days=1), BASE + timedelta(days=30))
+    peaks = col.peak_usage()
+    for name in ("mesa", "atril", "foco"):
+        assert peaks[name] == sched._peak_reserved(name, *whole)
+    expected = sorted((n, peaks[n], q) for n, q in (("mesa", 6), ("atril", 1), ("foco", 3)) if peaks[n] > q)
+    assert sched.capacity_conflicts() == expected and expected
+
+
+def test_columnar_is_rebuilt_only_after_changes():
+    sched = _loaded_scheduler(20)
+    col = sched.columnar()
+    assert sched.columnar() is col
+    sched.remove_event(sched.list_events()[0].name)
+    assert sched.columnar() is not col and len(sched.columnar()) == 19
+
+
+def test_occupancy_matrix_matches_peak_reserved():
+    sched = _loaded_scheduler(120, seed=9)
+    sched.inventory.add_resource(Item("Sin uso", quantity=0))
+    yoga = Event("Yoga", BASE - timedelta(days=3), BASE - timedelta(days=3) + timedelta(hours=1),
+                 resources=[{"name": "Foco", "quantity": 1}], recurrence="daily")
+    sched.load_events_from_list([yoga.to_dict()] + sched.list_events_as_dicts(), validate=False)
+
+    start, end = BASE - timedelta(minutes=20), BASE + timedelta(days=3, minutes=7)
+    out = sched.occupancy_matrix(start, end, bucket="hour")
+    assert out["resources"] == ["mesa", "atril", "foco", "sin uso"]
+    assert out["occupancy"].shape == (4, len(out["buckets"])) == (4, 73)
+    # franjas desalineadas y alineadas con los inicios / finales de los eventos
+    for offset, bucket in ((timedelta(minutes=-20), "hour"), (timedelta(0), "15min")):
+        grid = sched.occupancy_matrix(BASE + offset, end, bucket=bucket)
+        for row, name in enumerate(grid["resources"]):
+            for col, b_start in enumerate(grid["buckets"]):
+                b_end = min(b_start + sched.BUCKETS[bucket], end)
+                assert grid["occupancy"][row, col] == sched._peak_reserved(name, b_start, b_end)
+    assert out["occupancy"][3].sum() == 0 and out["utilization"][3].sum() == 0
+    assert np.allclose(out["utilization"][0], out["occupancy"][0] / 6)
+
+    daily = sched.occupancy_matrix(start, end, bucket="day", resources=["Foco"])
+    assert daily["occupancy"].shape == (1, 4)
+
+
+def test_occupancy_matrix_does_not_add_back_to_back_bookings():
+    inv = Inventory()
+    inv.add_resource(Item("Suite", quantity=1))
+    sched = Scheduler(inv)
+    for i, (h0, h1) in enumerate([(9, 10), (10, 11), (11, 12)]):
+        assert sched.add_event(Event(f"r{i}", BASE.replace(hour=h0), BASE.replace(hour=h1),
+                                     resources=[{"name": "Suite", "quantity": 1}]))[0]
+    out = sched.occupancy_matrix(BASE.replace(hour=9), BASE.replace(hour=13), bucket=timedelta(hours=2))
+    assert out["occupancy"].tolist() == [[1, 1]]
+    assert out["utilization"].tolist() == [[1.0, 1.0]]
+    hourly = sched.occupancy_matrix(BASE.replace(hour=8), BASE.replace(hour=14), bucket="hour")
+    assert hourly["occupancy"].tolist() == [[0, 1, 1, 1, 0, 0]]
+
+
+def test_occupancy_matrix_rejects_empty_window():
+    sched = _loaded_scheduler(30)
+    for end in (BASE, BASE - timedelta(hours=1)):
+        with pytest.raises(ValueError):
+            sched.occupancy_matrix(BASE, end)
+    assert sched.columnar().occupancy(["mesa", "atril"], BASE, BASE, 3600).shape == (2, 0)
+
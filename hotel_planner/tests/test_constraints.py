@@ -125,4 +125,76 @@ def test_complex_requires_multiple_items_success():
         ],
     )
     ok, reason = sched.add_event(e)
-    assert ok, f"Debe permitir cirugía cuando se incluyen todos los co-requisitos: {reason}"
\ No newline at end of file
+    assert ok, f"Debe permitir cirugía cuando se incluyen todos los co-requisitos: {reason}"
+
+def _normalized_errors(result):
+    ok, errs = result
+    missing = {k: sorted(v) for k, v in errs.get("missing_requires", {}).items()}
+    conflicts = sorted((c["resource"], tuple(c["conflicts_with"])) for c in errs.get("mutual_exclusion", []))
+    return ok, missing, conflicts
+
+
+def test_compiled_graph_matches_reference_validator():
+    import random
+    from hotel_planner.models.resource import validate_resource_constraints
+
+    rnd = random.Random(4)
+    names = [f"Recurso {i}" for i in range(25)]
+    inv = Inventory()
+    for i, name in enumerate(names):
+        requires = rnd.sample(names + ["Fantasma"], rnd.randint(0, 2))
+        excludes = rnd.sample(names, rnd.randint(0, 2))
+        excats = ["room"] if rnd.random() < 0.1 else []
+        if i % 3 == 0:
+            inv.add_resource(Resource(name, category="room", requires=requires, excludes=excludes, excludes_categories=excats))
+        else:
+            inv.add_resource(Item(name, requires=requires, excludes=excludes, excludes_categories=excats))
+
+    graph = inv.constraint_graph()
+    assert inv.constraint_graph() is graph  # cacheado mientras no cambie el inventario
+    for _ in range(300):
+        selection = [n.upper() if rnd.random() < 0.2 else n for n in rnd.sample(names + ["Fantasma", "otro"], rnd.randint(1, 6))]
+        expected = validate_resource_constraints(selection, inv.resources)
+        assert _normalized_errors(graph.validate(selection)) == _normalized_errors(expected)
+
+    inv.add_resource(Item("Nuevo", requires=["Recurso 1"]))
+    assert inv.constraint_graph() is not graph
+    assert not inv.constraint_graph().validate(["nuevo"])[0]
+
+
+def test_selection_bitmask_checks():
+    inv = Inventory()
+    inv.add_resource(Item("Cámara RED", quantity=1, requires=["Técnico de Cámara Certificado"]))
+    inv.add_resource(Employee("Técnico de Cámara Certificado", role="cámara"))
+    inv.add_resource(Resource("Sala de Grabación A", category="room", excludes_categories=["item"]))
+    graph = inv.constraint_graph()
+
+    camera = graph.selection_mask(["cámara red"])
+    crew = graph.selection_mask(["Cámara RED", "Técnico de Cámara Certificado"])
+    assert not graph.mask_ok(camera)
+    assert graph.mask_ok(crew)
+    assert not graph.mask_ok(crew | graph.selection_mask(["Sala de Grabación A"]))
+    assert graph.mask_ok(graph.selection_mask(["Sala de Grabación A", "desconocido"]))
+
+
+def test_required_closure_is_transitive_and_cycle_safe():
+    inv = Inventory()
+    inv.add_resource(Resource("Quirófano Robótico", category="room", requires=["Consola Da Vinci"]))
+    inv.add_resource(Item("Consola Da Vinci", requires=["Técnico Robótica"]))
+    inv.add_resource(Resource("Técnico Robótica", category="employee", requires=["Kit Calibración"]))
+    inv.add_resource(Item("Kit Calibración"))
+    inv.add_resource(Item("A", requires=["B"]))
+    inv.add_resource(Item("B", requires=["C"]))
+    inv.add_resource(Item("C", requires=["A", "Fantasma"]))
+
+    assert inv.required_closure(["quirófano robótico"]) == ["Consola Da Vinci", "Kit Calibración", "Técnico Robótica"]
+    assert inv.required_closure(["Consola Da Vinci", "Kit Calibración"]) == ["Técnico Robótica"]
+    assert inv.required_closure(["A"]) == ["B", "C", "fantasma"]
+    assert inv.constraint_graph().cycles() == [["a", "b", "c"]]
+
+    full = ["Quirófano Robótico"] + inv.required_closure(["Quirófano Robótico"])
+    assert inv.constraint_graph().validate(full)[0]
+
+    inv.find_by_name("Kit Calibración").requires = {"a"}
+    inv.touch()
+    assert "fantasma" in inv.required_closure(["Técnico Robótica"])
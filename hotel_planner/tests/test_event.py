@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hotel_planner.models.event import Event, to_epoch, from_epoch
+
+
+def test_epoch_fields_follow_start_and_end():
+    ev = Event("Desayuno", "2026-05-04T08:00:00", "2026-05-04T10:30:00")
+    assert ev.start_ts == to_epoch(datetime(2026, 5, 4, 8)) and from_epoch(ev.end_ts) == ev.end
+    assert ev.end_ts - ev.start_ts == int(ev.duration().total_seconds())
+
+    ev.end = datetime(2026, 5, 4, 9)
+    assert from_epoch(ev.end_ts) == datetime(2026, 5, 4, 9)
+    aware = datetime(2026, 5, 4, 10, tzinfo=timezone(timedelta(hours=2)))
+    assert to_epoch(aware) == to_epoch(datetime(2026, 5, 4, 8))
+
+    touching = Event("Almuerzo", ev.end, ev.end + timedelta(hours=1))
+    assert not ev.conflicts_with(touching) and not touching.conflicts_with(ev)
+    assert ev.conflicts_with(Event("Café", "2026-05-04T08:59:00", "2026-05-04T09:10:00"))
+
+
+def test_parse_datetime_fast_path_and_fallback():
+    from hotel_planner.models.event import parse_datetime
+
+    iso = parse_datetime("2026-05-04T08:00:00")
+    assert iso == datetime(2026, 5, 4, 8) and parse_datetime("2026-05-04T08:00:00") is iso
+    assert parse_datetime("2026-05-04 08:00") == iso
+    assert parse_datetime("4 May 2026 8:00") == iso   # no ISO: dateutil
+    assert Event.from_dict({"name": "x", "start": "2026-05-04T08:00:00Z", "end": "2026-05-04T09:00:00Z"}).start.tzinfo
+
+
+def test_quantities_mapping_and_slots():
+    from hotel_planner.models.resource import Room, Employee, Item
+
+    ev = Event("Gala", "2026-05-04T20:00:00", "2026-05-04T23:00:00",
+               resources=[{"name": "Mesa ", "quantity": 4}, "Camarero", {"name": "mesa", "quantity": 2}],
+               recurrence="weekly")
+    assert ev.to_dict()["resources"] == [{"name": "mesa", "quantity": 6}, {"name": "camarero", "quantity": 1}]
+    assert ev.get_resource_quantity("mesa") == 6 and ev.get_resource_quantity(" MESA") == 6
+    ev.remove_resource("mesa", 5)
+    ev.add_resource("Proyector")
+    assert ev.resources == [{"name": "mesa", "quantity": 1}, {"name": "camarero", "quantity": 1},
+                            {"name": "proyector", "quantity": 1}]
+    assert Event.from_dict(ev.to_dict()).to_dict() == ev.to_dict()
+
+    for obj in (ev, Room("Salón", capacity=80), Employee("Ana", role="chef"), Item("Mesa", quantity=3)):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_scheduled_event_rejects_in_place_changes():
+    from hotel_planner.models.inventory import Inventory
+    from hotel_planner.models.resource import Item
+    from hotel_planner.core.scheduler import Scheduler
+
+    inv = Inventory()
+    inv.add_resource(Item("Salón", quantity=1))
+    sched = Scheduler(inv)
+    ev = Event("Boda", datetime(2026, 5, 4, 10), datetime(2026, 5, 4, 12), resources=["Salón"])
+    assert sched.add_event(ev)[0]
+    with pytest.raises(ValueError):
+        ev.start = datetime(2026, 5, 4, 9)
+    with pytest.raises(ValueError):
+        ev.end = datetime(2026, 5, 4, 20)
+    with pytest.raises(ValueError):
+        ev.add_resource("Salón")
+    assert ev.start_ts == to_epoch(datetime(2026, 5, 4, 10))
+
+    # fuera del Scheduler vuelve a ser modificable y se reindexa al añadirlo de nuevo
+    assert sched.remove_event("Boda")
+    ev.end = datetime(2026, 5, 4, 20)
+    assert sched.add_event(ev)[0]
+    assert sched._peak_reserved("salón", datetime(2026, 5, 4, 19), datetime(2026, 5, 4, 19, 30)) == 1
+    sched.load_events_from_list([])
+    ev.start = datetime(2026, 5, 4, 9)
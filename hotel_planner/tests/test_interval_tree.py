@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item, Employee
+from hotel_planner.models.event import Event, to_epoch
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.core.interval_tree import IntervalTree
+
+
+BASE = datetime(2026, 1, 1, 8, 0)
+
+
+def _random_events(n, seed=7):
+    rnd = random.Random(seed)
+    events = []
+    for i in range(n):
+        start = BASE + timedelta(minutes=30 * rnd.randint(0, 400))
+        end = start + timedelta(minutes=30 * rnd.randint(1, 12))
+        events.append(Event(f"ev{i}", start, end))
+    return events
+
+
+def test_overlapping_matches_brute_force():
+    events = _random_events(300)
+    tree = IntervalTree()
+    for ev in events[:150]:
+        tree.add(ev)
+    tree.extend(events[150:])
+    for ev in events[::3]:
+        tree.remove(ev)
+    alive = [ev for i, ev in enumerate(events) if i % 3 != 0]
+    assert len(tree) == len(alive)
+
+    rnd = random.Random(1)
+    for _ in range(200):
+        qs = BASE + timedelta(minutes=15 * rnd.randint(0, 850))
+        qe = qs + timedelta(minutes=15 * rnd.randint(1, 40))
+        expected = {ev.name for ev in alive if ev.start < qe and ev.end > qs}
+        got = tree.overlapping(to_epoch(qs), to_epoch(qe))
+        assert {ev.name for ev in got} == expected
+        assert [ev.start for ev in got] == sorted(ev.start for ev in got)
+
+
+def test_scheduler_index_follows_add_and_remove():
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=2))
+    sched = Scheduler(inv)
+
+    a = Event("A", BASE, BASE + timedelta(hours=2), resources=[{"name": "Proyector", "quantity": 1}])
+    b = Event("B", BASE + timedelta(hours=1), BASE + timedelta(hours=3), resources=[{"name": "Proyector", "quantity": 1}])
+    assert sched.add_event(a)[0]
+    assert sched.add_event(b)[0]
+    assert sched._peak_reserved("proyector", BASE + timedelta(minutes=90), BASE + timedelta(minutes=100)) == 2
+
+    assert sched.remove_event("A")
+    assert list(sched.resource_index["proyector"]) == [b]
+    assert sched._peak_reserved("proyector", BASE, BASE + timedelta(minutes=30)) == 0
+
+    assert sched.remove_event("B")
+    assert "proyector" not in sched.resource_index
+
+
+def test_events_between_and_at_with_filters():
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=5))
+    inv.add_resource(Employee("Camarero", role="sala"))
+    sched = Scheduler(inv)
+    sched.add_event(Event("Charla", BASE, BASE + timedelta(hours=2), resources=["Proyector"]))
+    sched.add_event(Event("Cena", BASE + timedelta(hours=7), BASE + timedelta(hours=9), resources=["Camarero"]))
+    sched.add_event(Event("Taller", BASE + timedelta(hours=1), BASE + timedelta(hours=7), resources=["Proyector", "Camarero"]))
+
+    afternoon = (BASE + timedelta(hours=2), BASE + timedelta(hours=6))
+    assert [e.name for e in sched.events_between(*afternoon)] == ["Taller"]
+    assert [e.name for e in sched.events_between(BASE, BASE + timedelta(hours=10))] == ["Charla", "Taller", "Cena"]
+    assert [e.name for e in sched.events_between(BASE, BASE + timedelta(hours=10), resource="camarero")] == ["Taller", "Cena"]
+    assert [e.name for e in sched.events_between(BASE, BASE + timedelta(hours=3), category="employee")] == ["Taller"]
+
+    assert [e.name for e in sched.events_at(BASE + timedelta(hours=1))] == ["Charla", "Taller"]
+    assert [e.name for e in sched.events_at(BASE + timedelta(hours=2))] == ["Taller"]
+    assert sched.events_at(BASE + timedelta(hours=9)) == []
+
+    sched.remove_event("Taller")
+    assert sched.events_between(*afternoon) == []
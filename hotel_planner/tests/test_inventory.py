@@ -0,0 +1,46 @@
+from hotel_planner.models.resource import Item, Employee, Room
+from hotel_planner.models.inventory import Inventory
+
+
+def test_name_and_category_indexes_follow_mutations():
+    inv = Inventory()
+    inv.add_resource(Room("Salón Principal", 200))
+    inv.add_resource(Employee("Camarero", role="sala"))
+    inv.add_resource(Item("Extintor", quantity=4))
+    inv.add_resource(Item("Mantel", quantity=10))
+
+    assert inv.find_by_name("  salón PRINCIPAL ").name == "Salón Principal"
+    assert inv.find_by_name("nada") is None
+    assert [r.name for r in inv.get_resources_by_category("item")] == ["Extintor", "Mantel"]
+
+    assert inv.mark_unavailable("extintor", 4)
+    assert [r.name for r in inv.get_available_resources_by_category("item")] == ["Mantel"]
+    assert inv.mark_available("Extintor", 1)
+    assert inv.find_by_name("extintor").quantity == 1
+
+    assert inv.remove_resource("MANTEL")
+    assert not inv.remove_resource("Mantel")
+    assert inv.find_by_name("mantel") is None
+    assert [r.name for r in inv.get_resources_by_category("item")] == ["Extintor"]
+
+    # si alguien toca la lista directamente, los índices se reconstruyen
+    inv.resources.append(Item("Atril"))
+    assert inv.find_by_name("atril") is not None
+
+
+def test_index_follows_version_counter():
+    inv = Inventory()
+    inv.add_resource(Item("Mantel", quantity=3))
+    inv.add_resource(Room("Salón", 40))
+    v = inv.version
+    assert inv.mark_unavailable("mantel") and inv.mark_available("mantel", 2)
+    assert inv.version == v + 2 and inv.find_by_name("mantel").quantity == 4
+
+    # mismo número de recursos: sólo touch() avisa de que el índice está desfasado
+    inv.find_by_name("mantel").name = "Servilleta"
+    inv.resources[1] = Room("Terraza", 60)
+    inv.touch()
+    assert inv.find_by_name("mantel") is None and inv.find_by_name("salón") is None
+    assert inv.find_by_name("servilleta").quantity == 4
+    assert [r.name for r in inv.get_resources_by_category("room")] == ["Terraza"]
+
@@ -0,0 +1,162 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.models.journal import Journal
+from hotel_planner.models.store import save_data, load_data
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.ui.controller import Controller
+
+
+BASE = datetime(2026, 5, 4, 10, 0)
+
+
+def _event(name, hours=0, resources=("Proyector",)):
+    start = BASE + timedelta(hours=hours)
+    return {"name": name, "start": start.isoformat(), "end": (start + timedelta(hours=1)).isoformat(),
+            "resources": [{"name": r, "quantity": 1} for r in resources]}
+
+
+def _snapshot(tmp_path):
+    path = tmp_path / "data.json"
+    save_data({"version": 1,
+               "inventory": {"resources": [{"name": "Proyector", "type": "Item", "quantity": 2},
+                                           {"name": "Micro", "type": "Item", "quantity": 1}]},
+               "events": [_event("Charla")]}, path)
+    return path
+
+
+def test_journal_replays_ops_over_snapshot(tmp_path):
+    path = _snapshot(tmp_path)
+    before = path.read_text(encoding="utf-8")
+    journal = Journal(path)
+    journal.append({"op": "add_event", "event": _event("Taller", 2, ("Micro",))})
+    journal.append({"op": "add_event", "event": _event("Cena", 4)})
+    # misma clave (el nombre normalizado, como en el Scheduler): sustituye en lugar de duplicar
+    journal.append({"op": "add_event", "event": dict(_event("cena", 5), notes="x")})
+    journal.append({"op": "remove_event", "name": "Charla"})
+    journal.append({"op": "put_resource", "resource": {"name": "Atril", "type": "Item", "quantity": 1}})
+    journal.append({"op": "remove_resource", "name": "micro", "cascade": True})
+    # una línea cortada al final (cierre a mitad de escritura) se ignora
+    with journal.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"op": "add_ev')
+
+    assert path.read_text(encoding="utf-8") == before
+    state = journal.load()
+    assert [ev["name"] for ev in state["events"]] == ["cena"]
+    assert state["events"][0]["notes"] == "x"
+    assert [r["name"] for r in state["inventory"]["resources"]] == ["Proyector", "Atril"]
+
+
+def test_stream_applies_journal_like_load(tmp_path):
+    path = _snapshot(tmp_path)
+    journal = Journal(path, fsync=False)
+    header, events = journal.stream()
+    assert header == {"version": 1, "inventory": load_data(path)["inventory"]}
+    assert [ev["name"] for ev in events] == ["Charla"]
+
+    journal.extend([
+        {"op": "add_event", "event": _event("Taller", 2, ("Micro",))},
+        {"op": "add_event", "event": _event("Cena", 4)},
+        {"op": "remove_resource", "name": "Micro", "cascade": True},
+        {"op": "add_event", "event": _event("Ensayo", 5, ("Micro",))},
+        {"op": "add_event", "event": dict(_event("Charla"), notes="nueva")},
+        {"op": "put_resource", "resource": {"name": "Atril", "type": "Item", "quantity": 1}},
+    ])
+    header, events = journal.stream()
+    state = journal.load()
+    assert header["inventory"] == state["inventory"]
+    assert sorted(map(json.dumps, events)) == sorted(map(json.dumps, state["events"]))
+    assert {ev["name"] for ev in state["events"]} == {"Charla", "Cena", "Ensayo"}
+
+    journal.append({"op": "set_events", "events": [_event("Solo", 1)]})
+    assert [ev["name"] for ev in journal.iter_events()] == ["Solo"]
+
+    path.write_text('{"version": 1, "events": [{"name": "roto"', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(journal.iter_events())
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = _snapshot(tmp_path)
+    journal = Journal(path, compact_threshold=600, fsync=False)
+    for i in range(10):
+        journal.append({"op": "add_event", "event": _event(f"ev{i}", i + 1)})
+    journal.wait()
+    expected = journal.load()
+    assert len(expected["events"]) == 11
+
+    journal.compact()
+    assert not journal.journal_path.exists() and not journal.pending_path.exists()
+    assert load_data(path)["events"] == expected["events"]
+
+    # compactación interrumpida tras escribir el snapshot: reaplicar el pendiente no duplica nada
+    journal.append({"op": "remove_event", "name": "ev0"})
+    journal.compact()
+    journal.pending_path.write_text(json.dumps({"op": "add_event", "event": _event("ev1", 2)}) + "\n", encoding="utf-8")
+    assert len(journal.load()["events"]) == 10
+
+
+def test_unreadable_snapshot_is_never_compacted_away(tmp_path):
+    path = _snapshot(tmp_path)
+    journal = Journal(path, compact_threshold=1, fsync=False)
+    text = path.read_text(encoding="utf-8")
+    path.write_bytes(text.encode("utf-8")[:-5] + b"\xff")
+    broken = path.read_bytes()
+
+    journal.append({"op": "add_event", "event": _event("Taller", 2)})
+    with pytest.raises(ValueError):
+        journal.wait()   # la compactación en segundo plano falló y se avisa
+    log = journal.journal_path.read_text(encoding="utf-8")
+    with pytest.raises(ValueError):
+        journal.compact()
+    with pytest.raises(ValueError):
+        journal.load()
+    assert path.read_bytes() == broken
+    assert journal.journal_path.read_text(encoding="utf-8") == log and not journal.pending_path.exists()
+
+    path.write_text(text, encoding="utf-8")
+    assert journal.compact()
+    assert [ev["name"] for ev in load_data(path)["events"]] == ["Charla", "Taller"]
+
+
+def test_controller_save_state_goes_through_journal(tmp_path):
+    path = _snapshot(tmp_path)
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=2))
+    controller = Controller(Scheduler(inv), events_path=path, journal=Journal(path, fsync=False))
+    assert controller.add_event(_event("Taller", 3))[0]
+    assert controller.save_state() == (True, None)
+
+    # el snapshot (con su inventario) no se reescribe; el diario lleva una línea por evento cambiado
+    assert [ev["name"] for ev in load_data(path)["events"]] == ["Charla"]
+    lines = lambda: [json.loads(line) for line in controller.journal.journal_path.read_text(encoding="utf-8").splitlines()]
+    assert [(op["op"], op.get("name") or op["event"]["name"]) for op in lines()] == [
+        ("remove_event", "Charla"), ("add_event", "Taller")]
+    assert controller.save_state() == (True, None) and len(lines()) == 2
+    assert controller.add_event(_event("Cena", 5))[0]
+    assert controller.save_state() == (True, None)
+    assert lines()[2:] == [{"op": "add_event", "event": controller.list_events()[1]}]
+
+    other = Controller(Scheduler(inv), events_path=path, journal=controller.journal)
+    ok, _ = other.load_state(validate=False)
+    assert ok
+    assert [e["name"] for e in other.list_events()] == ["Taller", "Cena"]
+    assert len(controller.journal.load()["inventory"]["resources"]) == 2
+
+
+def test_controller_resource_edits_stay_in_memory():
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=2))
+    controller = Controller(Scheduler(inv))
+    controller.put_resource(Item("Micro", quantity=1))
+    assert controller.add_event(_event("Charla"))[0]
+    assert controller.add_event(_event("Taller", 3, resources=("Micro",)))[0]
+
+    assert controller.remove_resource_cascade("proyector") == (True, 1)
+    assert [e["name"] for e in controller.list_events()] == ["Taller"]
+    assert [r.name for r in inv.resources] == ["Micro"]
+    assert controller.remove_resource_cascade("Proyector") == (False, 0)
@@ -0,0 +1,61 @@
+import io
+import json
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.models.json_stream import iter_array, iter_events
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.ui.controller import Controller
+
+
+BASE = datetime(2026, 7, 1, 9, 0)
+
+
+def _payload(n):
+    events = []
+    for i in range(n):
+        start = BASE + timedelta(hours=2 * i)
+        events.append({"name": f"ev{i} \"[{{,}}]\" ñ", "start": start.isoformat(),
+                       "end": (start + timedelta(hours=1)).isoformat(),
+                       "resources": [{"name": "Proyector", "quantity": 1}], "notes": "x" * (i % 50)})
+    return {"version": 12345, "inventory": {"resources": [{"name": "Proyector", "type": "Item", "quantity": 1}]},
+            "events": events, "tail": [1.5, None, True]}
+
+
+def test_iter_array_matches_json_load_across_chunk_boundaries():
+    payload = _payload(40)
+    for indent in (None, 2):
+        text = json.dumps(payload, ensure_ascii=False, indent=indent)
+        for chunk_size in (1, 7, 64, 1 << 16):
+            assert list(iter_array(io.StringIO(text), "events", chunk_size)) == payload["events"]
+            assert list(iter_array(io.StringIO(text), "tail", chunk_size)) == payload["tail"]
+
+    assert list(iter_array(io.StringIO('{"events": []}'), "events", 3)) == []
+    assert list(iter_array(io.StringIO('{"version": 1}'), "events", 3)) == []
+    assert list(iter_array(io.StringIO("[1, 22, 333]"), "events", 2)) == [1, 22, 333]
+
+
+def test_numbers_cut_at_chunk_edges_are_read_whole():
+    text = '{"version": 12.5, "ratio": -1.25e-3, "events": [{"n": 123456.75}, 7, 1e10, true], "tail": null}'
+    for chunk_size in range(1, 20):
+        rest = {}
+        assert list(iter_array(io.StringIO(text), "events", chunk_size, rest)) == [{"n": 123456.75}, 7, 1e10, True]
+        assert rest == {"version": 12.5, "ratio": -1.25e-3, "tail": None}
+
+
+def test_controller_load_state_streams_events(tmp_path):
+    path = tmp_path / "data.json"
+    payload = _payload(30)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    assert len(list(iter_events(path, chunk_size=5))) == 30
+
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=1))
+    controller = Controller(Scheduler(inv), events_path=path)
+    seen = []
+    # el lock del controller no se toma mientras se lee el fichero
+    ok, info = controller.load_state(validate=True, progress=lambda n: seen.append((n, controller._lock.locked())))
+    assert ok, info
+    assert seen == [(30, False)]
+    assert [e["name"] for e in controller.list_events()] == [ev["name"] for ev in payload["events"]]
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item, Room
+from hotel_planner.models.event import Event, to_epoch
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.core.recurrence import Series
+
+
+BASE = datetime(2026, 3, 2, 9, 0)   # lunes
+
+
+def _scheduler():
+    inv = Inventory()
+    inv.add_resource(Room("Sala Yoga", capacity=20))
+    inv.add_resource(Item("Esterilla", quantity=10))
+    return Scheduler(inv)
+
+
+def test_series_index_range_matches_expansion():
+    ev = Event("Yoga", BASE, BASE + timedelta(hours=1), recurrence="diario")
+    series = Series.from_event(ev)
+    start, end = BASE + timedelta(days=3, minutes=30), BASE + timedelta(days=6, hours=9, minutes=1)
+    expected = [k for k in range(1, 20)
+                if BASE + timedelta(days=k) < end and BASE + timedelta(days=k, hours=1) > start]
+    assert list(series.index_range(to_epoch(start), to_epoch(end))) == expected == [3, 4, 5, 6]
+    assert Series.from_event(Event("X", BASE, BASE + timedelta(hours=1), recurrence="monthly")) is None
+
+
+def test_occurrences_seen_by_scheduler_queries():
+    sched = _scheduler()
+    yoga = Event("Yoga", BASE, BASE + timedelta(hours=1), resources=["Sala Yoga", {"name": "Esterilla", "quantity": 6}],
+                 recurrence="daily")
+    assert sched.add_event(yoga)[0]
+    day10 = BASE + timedelta(days=10)
+    assert sched._peak_reserved("esterilla", day10, day10 + timedelta(minutes=30)) == 6
+    assert sched._peak_reserved("sala yoga", day10 - timedelta(hours=2), day10 + timedelta(hours=2)) == 1
+
+    # las repeticiones bloquean reservas futuras y la búsqueda de huecos las salta
+    clash = Event("Taller", day10 + timedelta(minutes=30), day10 + timedelta(hours=2), resources=["Sala Yoga"])
+    assert not sched.add_event(clash)[0]
+    slot = sched.find_next_available(timedelta(hours=1), ["Sala Yoga"], day10, day10 + timedelta(hours=5))
+    assert slot == (day10 + timedelta(hours=1), day10 + timedelta(hours=2))
+    assert sched.add_event(Event("Pilates", day10 + timedelta(hours=1), day10 + timedelta(hours=2),
+                                 resources=[{"name": "Esterilla", "quantity": 4}]))[0]
+
+    segs = sched.resource_usage_intervals("esterilla", day10 - timedelta(hours=1), day10 + timedelta(hours=3))
+    assert [(s["start"], s["end"], s["quantity"]) for s in segs] == [
+        (day10, day10 + timedelta(hours=1), 6),
+        (day10 + timedelta(hours=1), day10 + timedelta(hours=2), 4),
+    ]
+    assert len(sched.format_usage_intervals("sala yoga")) == 1 + 30
+
+    sched.remove_event("Yoga")
+    assert sched._peak_reserved("sala yoga", day10, day10 + timedelta(hours=1)) == 0
+
+
+def test_new_series_checked_against_events_and_other_series():
+    sched = _scheduler()
+    later = BASE + timedelta(days=40, hours=2)
+    assert sched.add_event(Event("Boda", later, later + timedelta(hours=3), resources=["Sala Yoga"]))[0]
+    ok, reason = sched.add_event(Event("Meditación", BASE + timedelta(hours=3), BASE + timedelta(hours=4),
+                                       resources=["Sala Yoga"], recurrence="daily"))
+    assert not ok and "repetición" in reason
+
+    assert sched.add_event(Event("Yoga", BASE, BASE + timedelta(hours=1), resources=["Sala Yoga"], recurrence="weekly"))[0]
+    # empieza un martes: choca con el yoga del lunes siguiente, nunca con el propio lunes inicial
+    tuesday = BASE + timedelta(days=1, minutes=30)
+    ok, _ = sched.add_event(Event("Estiramientos", tuesday, tuesday + timedelta(hours=1), resources=["Sala Yoga"],
+                                  recurrence="diario"))
+    assert not ok
+    ok, _ = sched.add_event(Event("Estiramientos", tuesday + timedelta(minutes=30), tuesday + timedelta(hours=1),
+                                  resources=["Sala Yoga"], recurrence="diario"))
+    assert ok
+
+
+def test_first_collision_matches_brute_force():
+    import random
+
+    rnd = random.Random(11)
+    for _ in range(300):
+        pa, pb = rnd.choice([60, 90, 180, 1440]), rnd.choice([45, 120, 1440, 10080])
+        a = BASE + timedelta(minutes=rnd.randint(0, 3000))
+        b = BASE + timedelta(minutes=rnd.randint(0, 3000))
+        sa = Series(Event("a", a, a + timedelta(minutes=rnd.randint(1, pa))), timedelta(minutes=pa))
+        sb = Series(Event("b", b, b + timedelta(minutes=rnd.randint(1, pb))), timedelta(minutes=pb))
+
+        best = None
+        for i in range(1, 800):
+            s1, e1 = sa.occurrence(i)
+            if best is not None and s1 > best:
+                break
+            for j in sb.index_range(s1, e1, first=0):
+                when = max(s1, sb.occurrence(j)[0])
+                best = when if best is None else min(best, when)
+
+        hit = sa.first_collision(sb, first=1)
+        if best is None:
+            assert hit is None
+        else:
+            assert hit is not None and hit[0] >= 1
+            assert max(sa.occurrence(hit[0])[0], sb.occurrence(hit[1])[0]) == best
+
+
+def test_series_admission_reports_first_collision():
+    sched = _scheduler()
+    assert sched.add_event(Event("Yoga", BASE, BASE + timedelta(hours=1), resources=["Sala Yoga"], recurrence="weekly"))[0]
+    # diario a las 9:30 empezando el miércoles: el primer choque es el lunes siguiente
+    wednesday = BASE + timedelta(days=2, minutes=30)
+    ok, reason = sched.add_event(Event("Tai Chi", wednesday, wednesday + timedelta(hours=1), resources=["Sala Yoga"],
+                                       recurrence="diario"))
+    assert not ok and "'Yoga'" in reason and "09/03/26 09:30" in reason
+    # a las 10:00 nunca coincide, sin importar cuánto se extiendan ambas series
+    ok, _ = sched.add_event(Event("Tai Chi", wednesday + timedelta(minutes=30), wednesday + timedelta(hours=2),
+                                  resources=["Sala Yoga"], recurrence="diario"))
+    assert ok
@@ -0,0 +1,67 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.event import Event
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+
+
+BASE = datetime(2026, 1, 1, 8, 0)
+
+
+def test_usage_interval_cache_invalidated_per_resource():
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=3))
+    inv.add_resource(Item("Micro", quantity=3))
+    sched = Scheduler(inv)
+    sched.add_event(Event("A", BASE, BASE + timedelta(hours=2), resources=["Proyector"]))
+
+    first = sched.format_usage_intervals("Proyector")
+    assert first == sched.format_usage_intervals("proyector")
+    revision = sched.resource_revisions["proyector"]
+
+    # una reserva de otro recurso no toca la caché del proyector
+    sched.add_event(Event("B", BASE, BASE + timedelta(hours=1), resources=["Micro"]))
+    assert sched.resource_revisions["proyector"] == revision
+    assert sched._usage_cache["proyector"][0] == revision
+
+    # los resultados devueltos son copias: modificarlos no corrompe la caché
+    sched.resource_usage_intervals("proyector")[0]["quantity"] = 99
+    assert sched.resource_usage_intervals("proyector")[0]["quantity"] == 1
+
+    sched.add_event(Event("C", BASE + timedelta(hours=1), BASE + timedelta(hours=3), resources=["Proyector"]))
+    assert [s["quantity"] for s in sched.resource_usage_intervals("proyector")] == [1, 2, 1]
+    assert len(sched.format_usage_intervals("proyector")) == 3
+    sched.remove_event("C")
+    assert sched.format_usage_intervals("proyector") == first
+
+
+def test_usage_integral_matches_segments():
+    inv = Inventory()
+    inv.add_resource(Item("Esterilla", quantity=10))
+    sched = Scheduler(inv)
+    rnd = random.Random(8)
+    for i in range(80):
+        start = BASE + timedelta(minutes=30 * rnd.randint(0, 400))
+        sched.add_event(Event(f"ev{i}", start, start + timedelta(minutes=30 * rnd.randint(1, 6)),
+                              resources=[{"name": "Esterilla", "quantity": rnd.randint(1, 4)}]))
+    sched.add_event(Event("Yoga", BASE - timedelta(days=2), BASE - timedelta(days=2) + timedelta(minutes=45),
+                          resources=[{"name": "Esterilla", "quantity": 2}], recurrence="daily"))
+
+    def brute(qs, qe):
+        return sum(s["quantity"] * (s["end"] - s["start"]).total_seconds()
+                   for s in sched.resource_usage_intervals("esterilla", qs, qe))
+
+    for _ in range(60):
+        qs = BASE + timedelta(minutes=10 * rnd.randint(-300, 1300))
+        qe = qs + timedelta(minutes=10 * rnd.randint(1, 600))
+        assert sched.usage_integral("Esterilla", qs, qe) == brute(qs, qe)
+
+    window = (BASE, BASE + timedelta(days=10))
+    before = sched.usage_hours("esterilla", *window)
+    sched.add_event(Event("Extra", BASE + timedelta(days=9, hours=14), BASE + timedelta(days=9, hours=16),
+                          resources=[{"name": "Esterilla", "quantity": 1}]))
+    assert sched.usage_hours("esterilla", *window) == before + 2
+    sched.remove_event("Extra")
+    assert sched.usage_hours("esterilla", *window) == before
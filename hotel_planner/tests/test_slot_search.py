@@ -0,0 +1,193 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from hotel_planner.models.resource import Item, Employee
+from hotel_planner.models.event import Event
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.ui.controller import Controller
+
+
+BASE = datetime(2026, 3, 2, 8, 0)
+
+
+def _busy_scheduler(seed=11):
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=2))
+    inv.add_resource(Employee("Técnico", role="audiovisual"))
+    sched = Scheduler(inv)
+    rnd = random.Random(seed)
+    for i in range(120):
+        start = BASE + timedelta(minutes=5 * rnd.randint(0, 600))
+        end = start + timedelta(minutes=5 * rnd.randint(1, 30))
+        res = [{"name": "Proyector", "quantity": rnd.randint(1, 2)}]
+        if rnd.random() < 0.5:
+            res.append({"name": "Técnico", "quantity": 1})
+        sched.add_event(Event(f"ev{i}", start, end, resources=res))
+    return sched
+
+
+def test_first_fit_is_exact_earliest_start():
+    sched = _busy_scheduler()
+    resources = [{"name": "Proyector", "quantity": 1}, {"name": "Técnico", "quantity": 1}]
+    rnd = random.Random(5)
+    for _ in range(40):
+        start_from = BASE + timedelta(minutes=rnd.randint(0, 3000))
+        duration = timedelta(minutes=5 * rnd.randint(1, 12))
+        window_end = start_from + timedelta(hours=12)
+
+        # referencia: probar cada minuto con la validación completa
+        expected = None
+        t = start_from
+        while t + duration <= window_end:
+            ok, _ = sched._can_schedule(Event("__probe__", t, t + duration, resources=resources))
+            if ok:
+                expected = (t, t + duration)
+                break
+            t += timedelta(minutes=1)
+
+        assert sched.find_next_available(duration, resources, start_from, window_end) == expected
+
+
+def test_slot_starts_right_after_blocking_event():
+    inv = Inventory()
+    inv.add_resource(Item("Salón", quantity=1))
+    sched = Scheduler(inv)
+    sched.add_event(Event("Boda", BASE, BASE + timedelta(hours=2, minutes=7), resources=["Salón"]))
+
+    slot = sched.find_next_available(timedelta(hours=1), ["Salón"], BASE, BASE + timedelta(days=1))
+    assert slot == (BASE + timedelta(hours=2, minutes=7), BASE + timedelta(hours=3, minutes=7))
+
+
+def test_invalid_requests_return_none():
+    inv = Inventory()
+    inv.add_resource(Item("Cámara", quantity=1, requires=["Operador"]))
+    sched = Scheduler(inv)
+    window = (BASE, BASE + timedelta(days=1))
+    assert sched.find_next_available(timedelta(hours=1), ["Cámara"], *window) is None
+    assert sched.find_next_available(timedelta(hours=1), ["Inexistente"], *window) is None
+    assert sched.find_next_available(timedelta(hours=1), [{"name": "Cámara", "quantity": 5}], *window) is None
+
+
+def test_free_intervals_and_top_k():
+    inv = Inventory()
+    inv.add_resource(Item("Salón", quantity=1))
+    sched = Scheduler(inv)
+    for i, (h1, h2) in enumerate([(9, 10), (11, 14), (15, 16)]):
+        sched.add_event(Event(f"ev{i}", BASE.replace(hour=h1), BASE.replace(hour=h2), resources=["Salón"]))
+
+    day_end = BASE.replace(hour=20)
+    hour = timedelta(hours=1)
+    free = list(sched.iter_free_intervals(hour, ["Salón"], BASE, day_end))
+    assert free == [
+        (BASE, BASE.replace(hour=9)),
+        (BASE.replace(hour=10), BASE.replace(hour=11)),
+        (BASE.replace(hour=14), BASE.replace(hour=15)),
+        (BASE.replace(hour=16), day_end),
+    ]
+    # huecos de 2h: sólo el último intervalo sirve
+    assert list(sched.iter_free_intervals(2 * hour, ["Salón"], BASE, day_end)) == [(BASE.replace(hour=16), day_end)]
+
+    top = sched.top_k_slots(hour, ["Salón"], BASE, day_end, k=2)
+    assert top == [(BASE, BASE + hour), (BASE.replace(hour=10), BASE.replace(hour=11))]
+    # key puntúa cada hueco: el más cercano a las 14:30
+    closest = sched.top_k_slots(hour, ["Salón"], BASE, day_end, k=2,
+                                key=lambda s, e: abs(s - BASE.replace(hour=14, minute=30)))
+    assert closest == [(BASE.replace(hour=14), BASE.replace(hour=15)), (BASE.replace(hour=16), BASE.replace(hour=17))]
+
+
+def test_top_k_fills_long_free_window():
+    inv = Inventory()
+    inv.add_resource(Item("Salón", quantity=1))
+    sched = Scheduler(inv)
+    hour = timedelta(hours=1)
+    week_end = BASE + timedelta(days=7)
+    # calendario vacío: un único intervalo libre debe dar k huecos seguidos
+    top = sched.top_k_slots(hour, ["Salón"], BASE, week_end, k=5)
+    assert top == [(BASE + i * hour, BASE + (i + 1) * hour) for i in range(5)]
+    # con paso explícito y sin pasarse del final del intervalo
+    sched.add_event(Event("ev", BASE.replace(hour=10), BASE.replace(hour=12), resources=["Salón"]))
+    stepped = sched.top_k_slots(hour, ["Salón"], BASE, week_end, k=4, step_minutes=30)
+    assert [s for s, _ in stepped] == [BASE, BASE.replace(minute=30), BASE.replace(hour=9), BASE.replace(hour=12)]
+    # key se aplica a cada hueco candidato, no al intervalo: los dos más tardíos de la semana
+    latest = sched.top_k_slots(hour, ["Salón"], BASE, week_end, k=2, key=lambda s, e: -s.timestamp())
+    assert latest == [(week_end - hour, week_end), (week_end - 2 * hour, week_end - hour)]
+
+
+def test_batch_matches_single_requests_and_commits_in_order():
+    sched = _busy_scheduler()
+    rnd = random.Random(9)
+    requests = []
+    for i in range(30):
+        start_from = BASE + timedelta(minutes=rnd.randint(0, 2000))
+        requests.append({
+            "name": f"grupo{i}",
+            "duration": timedelta(minutes=30 * rnd.randint(1, 4)),
+            "resources": [{"name": "Proyector", "quantity": 1}],
+            "start_from": start_from,
+            "window_end": start_from + timedelta(hours=8),
+        })
+
+    dry = sched.find_slots_batch(requests)
+    for req, res in zip(requests, dry):
+        single = sched.find_next_available(req["duration"], req["resources"], req["start_from"], req["window_end"])
+        assert res["slot"] == single
+
+    before = len(sched.list_events())
+    committed = sched.find_slots_batch(requests, commit=True)
+    placed = [r for r in committed if r["slot"] and r["error"] is None]
+    assert len(sched.list_events()) == before + len(placed)
+    # cada reserva confirmada sigue siendo válida con todas las demás
+    for r in placed:
+        ev = sched.name_to_event[r["name"]]
+        sched.remove_event(ev.name)
+        ok, reason = sched.add_event(ev)
+        assert ok, reason
+
+
+def test_batch_reports_bad_duration_per_request():
+    sched = _busy_scheduler()
+    window = {"resources": ["Proyector"], "start_from": BASE, "window_end": BASE + timedelta(days=1)}
+    requests = [dict(window, name="sin"), dict(window, name="cero", duration=timedelta(0)),
+                dict(window, name="texto", duration="1h"), dict(window, name="bien", duration=timedelta(hours=1))]
+    out = sched.find_slots_batch(requests)
+    assert [r["error"] for r in out[:3]] == ["Duración inválida"] * 3
+    assert out[3]["error"] is None and out[3]["slot"] is not None
+
+    controller = Controller(sched)
+    out = controller.find_slots_batch([dict(window, name="texto", duration="abc"), dict(window, name="min", duration=30),
+                                       dict(window, name="sin")])
+    assert out[0]["error"] == out[2]["error"] == "Duración inválida"
+    assert out[1]["slot"][1] - out[1]["slot"][0] == timedelta(minutes=30)
+
+    # con commit, una reserva que no se hace no devuelve hueco
+    before = len(sched.list_events())
+    out = sched.find_slots_batch([dict(window, duration=timedelta(hours=1)),
+                                  dict(window, name="ok", duration=timedelta(hours=1))], commit=True)
+    assert out[0]["slot"] is None and out[0]["error"] == "Se necesita un nombre para reservar el hueco"
+    assert out[1]["error"] is None and out[1]["slot"] is not None
+    assert len(sched.list_events()) == before + 1
+
+
+def test_slots_keep_caller_timezone_and_never_start_early():
+    inv = Inventory()
+    inv.add_resource(Item("Salón", quantity=1))
+    sched = Scheduler(inv)
+    madrid = timezone(timedelta(hours=2))
+    start = datetime(2026, 3, 2, 10, 0, tzinfo=madrid)
+    hour = timedelta(hours=1)
+
+    slot = sched.find_next_available(hour, ["Salón"], start, start + timedelta(days=1))
+    assert slot == (start, start + hour)
+    assert slot[0].utcoffset() == timedelta(hours=2) and slot[0].hour == 10
+    top = sched.top_k_slots(hour, ["Salón"], start, start + timedelta(days=1), k=1)
+    assert top[0][0].tzinfo is not None and top[0] == (start, start + hour)
+    batch = sched.find_slots_batch([{"duration": hour, "resources": ["Salón"],
+                                     "start_from": start, "window_end": start + timedelta(days=1)}])
+    assert batch[0]["slot"][0].utcoffset() == timedelta(hours=2)
+
+    # un inicio con fracción de segundo se redondea hacia arriba, nunca antes de start_from
+    half = BASE + timedelta(microseconds=500000)
+    slot = sched.find_next_available(hour, ["Salón"], half, half + timedelta(days=1))
+    assert slot[0] >= half and slot[0] == BASE + timedelta(seconds=1)
+    assert slot[1] - slot[0] >= hour
@@ -0,0 +1,40 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.event import Event, to_epoch
+from hotel_planner.core.sorted_events import SortedEventList
+
+
+BASE = datetime(2026, 7, 1, 9, 0)
+
+
+def test_sorted_event_list_behaves_like_sorted_list():
+    rnd = random.Random(2)
+    events = []
+    for i in range(400):
+        start = BASE + timedelta(minutes=15 * rnd.randint(0, 100))
+        events.append(Event(f"ev{i:03d}", start, start + timedelta(hours=1)))
+
+    container = SortedEventList(events[:100])
+    for ev in events[100:]:
+        container.add(ev)
+    for ev in events[::5]:
+        container.remove(ev)
+    alive = sorted((ev for i, ev in enumerate(events) if i % 5), key=lambda e: (e.start, e.name))
+
+    assert list(container) == alive
+    assert len(container) == len(alive)
+    assert container[0] is alive[0] and container[-1] is alive[-1]
+    assert container[37] is alive[37]
+    assert container[10:25] == alive[10:25]
+    assert container[::2] == alive[::2]
+
+    lo, hi = BASE + timedelta(hours=5), BASE + timedelta(hours=9)
+    assert container.starting_between(to_epoch(lo), to_epoch(hi)) == [e for e in alive if lo <= e.start < hi]
+
+    assert not container.discard(events[0])
+    try:
+        container.remove(events[0])
+        assert False, "remove debe lanzar ValueError como list.remove"
+    except ValueError:
+        pass
@@ -0,0 +1,103 @@
+import random
+from datetime import datetime, timedelta
+
+from hotel_planner.models.resource import Item
+from hotel_planner.models.inventory import Inventory
+from hotel_planner.models.event import Event
+from hotel_planner.models import sqlite_store
+from hotel_planner.models.sqlite_store import SqliteStore
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.ui.controller import Controller
+
+
+BASE = datetime(2026, 6, 1, 8, 0)
+
+
+def _event(name, start, hours=1, resources=("Proyector",), recurrence=None):
+    return {"name": name, "start": start.isoformat(), "end": (start + timedelta(hours=hours)).isoformat(),
+            "resources": [{"name": r, "quantity": 1} for r in resources], "recurrence": recurrence}
+
+
+def test_round_trip_and_single_row_changes(tmp_path):
+    path = tmp_path / "planner.db"
+    payload = {"version": 1,
+               "inventory": {"resources": [{"name": "Proyector", "type": "Item", "quantity": 2},
+                                           {"name": "Micro", "type": "Item", "quantity": 1}]},
+               "events": [_event("Charla", BASE), _event("Taller", BASE + timedelta(hours=3), resources=("Micro",))]}
+    sqlite_store.save_data(payload, path)
+    assert sqlite_store.load_data(path) == payload
+
+    with SqliteStore(path) as db:
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        db.add_event(_event("Cena", BASE + timedelta(hours=10)))
+        db.add_event(dict(_event("cena", BASE + timedelta(hours=10)), notes="sustituye"))
+        assert db.count_events() == 3
+        assert db.remove_event("Charla")
+        # misma clave que el Scheduler (el nombre): cambiar el inicio sustituye la fila
+        db.add_event(_event("Cena", BASE + timedelta(hours=12)))
+        assert db.count_events() == 2
+        assert db.remove_resource("micro", cascade=True)
+        assert [(ev["name"], ev["start"]) for ev in db.list_events()] == [("Cena", (BASE + timedelta(hours=12)).isoformat())]
+        assert [r["name"] for r in db.list_resources()] == ["Proyector"]
+
+
+def test_events_between_pushed_down_matches_scheduler(tmp_path):
+    rnd = random.Random(5)
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=100))
+    inv.add_resource(Item("Micro", quantity=100))
+    sched = Scheduler(inv)
+    events = []
+    for i in range(120):
+        start = BASE + timedelta(minutes=30 * rnd.randint(0, 500))
+        resources = rnd.choice([("Proyector",), ("Micro",), ("Proyector", "Micro")])
+        events.append(_event(f"ev{i}", start, hours=rnd.randint(1, 5), resources=resources))
+    yoga_start = BASE - timedelta(days=3)
+    events.append(_event("Yoga", yoga_start, resources=("Micro",), recurrence="daily"))
+    for ev in events:
+        assert sched.add_event(Event.from_dict(ev))[0]
+
+    with SqliteStore(tmp_path / "planner.db") as db:
+        db.add_events(events)
+        for _ in range(60):
+            qs = BASE + timedelta(minutes=15 * rnd.randint(-200, 1100))
+            qe = qs + timedelta(minutes=15 * rnd.randint(1, 30))
+            # la base devuelve también la serie si alguna repetición cae en la ventana
+            yoga = any(yoga_start + timedelta(days=k) < qe and yoga_start + timedelta(days=k, hours=1) > qs
+                       for k in range(40))
+            for resource in (None, "micro"):
+                expected = {e.name for e in sched.events_between(qs, qe, resource=resource)} - {"Yoga"}
+                if yoga:
+                    expected.add("Yoga")
+                got = db.events_between(qs, qe, resource=resource)
+                assert {ev["name"] for ev in got} == expected
+                assert [ev["start"] for ev in got] == sorted(ev["start"] for ev in got)
+
+
+def test_controller_state_in_sqlite(tmp_path, monkeypatch):
+    path = tmp_path / "planner.sqlite"
+    inv = Inventory()
+    inv.add_resource(Item("Proyector", quantity=2))
+    controller = Controller(Scheduler(inv), events_path=path)
+    controller.add_event(_event("Charla", BASE))
+    controller.add_event(_event("Taller", BASE + timedelta(hours=2)))
+    assert controller.save_state() == (True, None)
+
+    other = Controller(Scheduler(inv), events_path=path)
+    assert other.load_state(validate=False)[0]
+    assert [e["name"] for e in other.list_events()] == ["Charla", "Taller"]
+
+    # los guardados siguientes sólo tocan las filas que cambian
+    calls = []
+    monkeypatch.setattr(SqliteStore, "replace_events", lambda *a: calls.append("replace"))
+    real_apply = SqliteStore.apply_changes
+    monkeypatch.setattr(SqliteStore, "apply_changes",
+                        lambda db, removed, events: calls.append((list(removed), [e["name"] for e in events]))
+                        or real_apply(db, removed, events))
+    controller.remove_event("Charla")
+    controller.add_event(_event("Cena", BASE + timedelta(hours=5)))
+    assert controller.save_state() == (True, None)
+    assert controller.save_state() == (True, None)
+    assert calls == [(["Charla"], ["Cena"])]
+    assert other.load_state(validate=False)[0]
+    assert [e["name"] for e in other.list_events()] == ["Taller", "Cena"]
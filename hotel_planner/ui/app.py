@@ -13,13 +13,11 @@ from hotel_planner.ui.styles import ProfessionalTheme as Theme, PADDINGS
 from hotel_planner.ui.advanced_ui import AccessibilityHelper, ResponsiveGrid
 from pathlib import Path
 import json
-import tempfile
-import os
 from hotel_planner.models import store as unified_store
 from hotel_planner.models import inventory_store as inv_store
-from hotel_planner.models import event_store as ev_store
+from hotel_planner.models.journal import journal_for
+from hotel_planner.ui.bootstrap import bootstrap
 import tkinter.filedialog as fd
-import shutil
 customtkinter.set_appearance_mode("System")
 customtkinter.set_default_color_theme("blue")
 
@@ -43,81 +41,22 @@ class App(customtkinter.CTk):
         
         # Set minimum window size to prevent layout breakage
         self.minsize(1000, 600)
-        # controller: usar el pasado o crear uno por defecto
-        if controller is None:
-            # Prefer single DATA file ~/.hotel_planner/data.json
-            DATA_WORKING = Path.home() / ".hotel_planner" / "data.json"
-            DATA_DEFAULT = Path(__file__).resolve().parents[1] / "data" / "default_data.json"
-            # ensure default exists (use unified_store helper)
-            try:
-                default_payload = json.loads(DATA_DEFAULT.read_text(encoding="utf-8")) if DATA_DEFAULT.exists() else {"version": 1, "inventory": {"resources": []}, "events": []}
-            except Exception:
-                default_payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-            unified_store.write_default_if_missing(DATA_DEFAULT, default_payload)
-            unified_store.ensure_working_copy(DATA_DEFAULT, DATA_WORKING)
-            data = unified_store.load_data(DATA_WORKING)
-
-            # create ephemeral files for existing loaders (no persistent inventory.json/events.json)
-            tmpdir = Path(tempfile.gettempdir())
-            tmp_inv = tmpdir / f"hotel_planner_inventory_{os.getpid()}.json"
-            tmp_ev = tmpdir / f"hotel_planner_events_{os.getpid()}.json"
-            try:
-                inv_payload = {"version": data.get("version", 1), "resources": (data.get("inventory") or {}).get("resources", [])}
-                tmp_inv.write_text(json.dumps(inv_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            except Exception:
-                tmp_inv = None
-            try:
-                ev_payload = {"version": data.get("version", 1), "events": data.get("events", [])}
-                tmp_ev.write_text(json.dumps(ev_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            except Exception:
-                tmp_ev = None
-
-            # load inventory using existing loader from ephemeral file (keeps Inventory construction)
-            if tmp_inv and tmp_inv.exists():
-                inventory = inv_store.load_inventory_from_json(tmp_inv)
-            else:
-                inventory = inv_store.load_inventory_from_json(DATA_DEFAULT) if DATA_DEFAULT.exists() else None
-
-            scheduler = Scheduler(inventory)
-            controller = Controller(scheduler)
-            # cleanup ephemeral files
-            try:
-                if tmp_inv and tmp_inv.exists():
-                    tmp_inv.unlink()
-                if tmp_ev and tmp_ev.exists():
-                    tmp_ev.unlink()
-            except Exception:
-                pass
-        self.controller = controller
-
-        # asegurar que tenemos referencia al scheduler (venga del controller o de la creación anterior)
-        scheduler = getattr(self.controller, "scheduler", None)
-
-        # --- cargar eventos inmediatamente desde data.json antes de crear las vistas ---
-        # Esto asegura que al construir InventoryView la disponibilidad refleje los eventos ya cargados.
+        # controller: usar el pasado o crear uno por defecto.
+        # Una sola pasada: leer data.json (+ diario), construir Inventory desde el dict y cargar los
+        # eventos en el scheduler una vez, antes de crear las vistas (la disponibilidad ya los refleja).
         try:
-            DATA = Path.home() / ".hotel_planner" / "data.json"
-            events_now = []
-            try:
-                if DATA.exists():
-                    payload_now = json.loads(DATA.read_text(encoding="utf-8") or "{}")
-                    events_now = payload_now.get("events", []) or []
-            except Exception as _e:
-                events_now = []
-
-            if scheduler and hasattr(scheduler, "load_events_from_list"):
-                try:
-                    scheduler.load_events_from_list(events_now)
-                except Exception as e:
-                    print("DEBUG app: early scheduler.load_events_from_list error:", e)
-            elif hasattr(self.controller, "load_events"):
-                try:
-                    self.controller.load_events(events_now)
-                except Exception as e:
-                    print("DEBUG app: early controller.load_events error:", e)
-        except Exception:
-            pass
-        # --- fin carga temprana de eventos ---
+            boot = bootstrap(controller)
+            controller = boot.controller
+            self.startup_timings = boot.timings
+            print("DEBUG app: startup", ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in boot.timings.items()))
+            if boot.errors:
+                print("DEBUG app: events rejected at startup:", boot.errors)
+        except Exception as e:
+            print("DEBUG app: bootstrap error:", e)
+            self.startup_timings = {}
+            if controller is None:
+                controller = Controller(Scheduler(Inventory()))
+        self.controller = controller
 
         # configure grid layout (4x4)
         self.grid_columnconfigure(1, weight=1)
@@ -237,68 +176,6 @@ class App(customtkinter.CTk):
         self.appearance_mode_optionemenu.set("Dark")
         self.scaling_optionemenu.set("100%")
 
-        # Default events
-        WORKING_EVENTS = Path.home() / ".hotel_planner" / "events.json"
-        try:
-            events = ev_store.load_events_from_json(WORKING_EVENTS)
-        except Exception:
-            events = []
-        if hasattr(scheduler, "load_events_from_list"):
-            try:
-                scheduler.load_events_from_list(events)
-            except Exception as e:
-                print("DEBUG app: scheduler.load_events_from_list error:", e)
-        elif hasattr(controller, "load_events"):
-            try:
-                controller.load_events(events)
-            except Exception:
-                pass
-        else:
-            try:
-                scheduler._events = events
-            except Exception:
-                pass
-
-        # Use single DATA file (~/.hotel_planner/data.json) as sole source of events/inventory
-        DATA = Path.home() / ".hotel_planner" / "data.json"
-        # tell controller where to persist events
-        try:
-            if hasattr(controller, "set_events_path"):
-                controller.set_events_path(DATA)
-            else:
-                controller.events_path = DATA
-        except Exception:
-            pass
-
-        # load events from DATA file (fallback to empty list)
-        events = []
-        try:
-            if DATA.exists():
-                payload = json.loads(DATA.read_text(encoding="utf-8") or "{}")
-                events = payload.get("events", []) or []
-            else:
-                events = []
-        except Exception as e:
-            print("DEBUG app: error reading DATA data.json:", e)
-            events = []
-
-        # inject events into scheduler/controller
-        if hasattr(scheduler, "load_events_from_list"):
-            try:
-                scheduler.load_events_from_list(events)
-            except Exception as e:
-                print("DEBUG app: scheduler.load_events_from_list error:", e)
-        elif hasattr(controller, "load_events"):
-            try:
-                controller.load_events(events)
-            except Exception as e:
-                print("DEBUG app: controller.load_events error:", e)
-        else:
-            try:
-                scheduler._events = events
-            except Exception:
-                pass
-
     def change_appearance_mode_event(self, new_appearance_mode: str):
         customtkinter.set_appearance_mode(new_appearance_mode)
 
@@ -312,7 +189,8 @@ class App(customtkinter.CTk):
     def _on_export(self):
         """Export DATA data.json to chosen path."""
         DATA = Path.home() / ".hotel_planner" / "data.json"
-        if not DATA.exists():
+        journal = journal_for(DATA)
+        if not DATA.exists() and not journal.journal_path.exists():
             tkinter.messagebox.showwarning("Exportar", "No existe ~/.hotel_planner/data.json para exportar.")
             return
         # default folder: project data directory (Hotel_Planner_Project/data)
@@ -322,7 +200,8 @@ class App(customtkinter.CTk):
         if not dest:
             return
         try:
-            shutil.copyfile(str(DATA), dest)
+            # export snapshot + journal as a single data.json
+            unified_store.save_data(journal.load(), Path(dest))
             tkinter.messagebox.showinfo("Exportar", f"Datos exportados a:\n{dest}")
         except Exception as e:
             tkinter.messagebox.showerror("Exportar", f"No se pudo exportar: {e}")
@@ -348,11 +227,8 @@ class App(customtkinter.CTk):
 
         DATA = Path.home() / ".hotel_planner" / "data.json"
         try:
-            tmp = DATA.with_name(DATA.name + ".tmp")
-            DATA.parent.mkdir(parents=True, exist_ok=True)
-            with tmp.open("w", encoding="utf-8") as fh:
-                json.dump(payload, fh, ensure_ascii=False, indent=2)
-            os.replace(str(tmp), str(DATA))
+            # new snapshot; the journal of the previous data is discarded
+            journal_for(DATA).reset(payload)
         except Exception as e:
             tkinter.messagebox.showerror("Importar", f"No se pudo escribir data.json: {e}")
             return
@@ -360,29 +236,17 @@ class App(customtkinter.CTk):
         # Reload into controller/scheduler
         try:
             data = unified_store.load_data(DATA)
-            # refresh inventory in controller
-            inv_payload = {"version": data.get("version", 1), "resources": (data.get("inventory") or {}).get("resources", [])}
-            tmp_inv = None
-            try:
-                tmp_inv = Path(tempfile.gettempdir()) / f"hotel_planner_inv_{os.getpid()}.json"
-                tmp_inv.write_text(json.dumps(inv_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-                new_inv = inv_store.load_inventory_from_json(tmp_inv)
-                # set inventory in scheduler/controller
-                if hasattr(self.controller, "scheduler") and getattr(self.controller, "scheduler", None) is not None:
-                    try:
-                        setattr(self.controller.scheduler, "inventory", new_inv)
-                    except Exception:
-                        pass
+            # refresh inventory in controller (built straight from the dict)
+            new_inv = inv_store.inventory_from_dict(data)
+            if hasattr(self.controller, "scheduler") and getattr(self.controller, "scheduler", None) is not None:
                 try:
-                    setattr(self.controller, "inventory", new_inv)
-                except Exception:
-                    pass
-            finally:
-                try:
-                    if tmp_inv and tmp_inv.exists():
-                        tmp_inv.unlink()
+                    setattr(self.controller.scheduler, "inventory", new_inv)
                 except Exception:
                     pass
+            try:
+                setattr(self.controller, "inventory", new_inv)
+            except Exception:
+                pass
 
             # reload events into controller/scheduler
             events = data.get("events", []) or []
@@ -0,0 +1,101 @@
+"""
+Arranque de la aplicación en una sola pasada.
+
+Lee una vez el fichero de trabajo (~/.hotel_planner/data.json más su diario) en
+streaming: la cabecera (inventario) sale antes del primer evento, se construye el
+Inventory desde ese dict, se crea el Scheduler y los eventos pasan del decodificador a
+una única ingesta validada sin formar antes la lista completa. Devuelve también cuánto
+tardó cada fase para que el coste de arranque se pueda seguir según crecen los datos.
+"""
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from hotel_planner.core.scheduler import Scheduler
+from hotel_planner.models import store as unified_store
+from hotel_planner.models import inventory_store as inv_store
+from hotel_planner.models.journal import journal_for
+from hotel_planner.ui.controller import Controller
+
+DATA_WORKING = Path.home() / ".hotel_planner" / "data.json"
+DATA_DEFAULT = Path(__file__).resolve().parents[1] / "data" / "default_data.json"
+
+
+class Bootstrap:
+    """Resultado del arranque: controller listo, cabecera leída (version, inventory), errores de carga y tiempos por fase (segundos)."""
+
+    def __init__(self, controller: Controller, header: dict, errors: Optional[dict], timings: Dict[str, float]):
+        self.controller = controller
+        self.header = header
+        self.errors = errors
+        self.timings = timings
+
+    def __repr__(self):
+        phases = ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in self.timings.items())
+        return f"<Bootstrap {len(self.controller.scheduler.events_sorted)} eventos: {phases}>"
+
+
+def bootstrap(
+    controller: Optional[Controller] = None,
+    data_path: Optional[Union[str, Path]] = None,
+    default_path: Optional[Union[str, Path]] = None,
+) -> Bootstrap:
+    """
+    Prepara el controller a partir de data_path (por defecto ~/.hotel_planner/data.json):
+      files     -> asegura que existen el fichero por defecto y la copia de trabajo (sin releerla);
+      read      -> diario + cabecera del snapshot (Journal.stream, hasta el primer evento);
+      inventory -> Inventory desde el dict (sin ficheros temporales);
+      events    -> Scheduler nuevo (o el del controller recibido) y una ingesta validada que va
+                   consumiendo el resto del snapshot.
+    Si se pasa un controller se reutiliza su scheduler y su inventario.
+    La copia de trabajo se valida en esa misma pasada: si el JSON está mal formado se aparta
+    (data.json.corrupt, para recuperarlo a mano), se repone la copia por defecto y se repite el
+    arranque. ingest_events consume todo el iterador antes de tocar los índices, así que un
+    error a mitad de lectura no deja eventos a medias en el scheduler.
+    """
+    data_path = Path(data_path) if data_path else DATA_WORKING
+    default_path = Path(default_path) if default_path else DATA_DEFAULT
+    timings = {}
+    clock = time.perf_counter()
+
+    def lap(phase):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + now - clock
+        clock = now
+
+    unified_store.write_default_if_missing(default_path, {"version": 1, "inventory": {"resources": []}, "events": []})
+    if not data_path.exists():
+        # la copia existente se valida al leerla en streaming (abajo), sin una lectura extra
+        unified_store.ensure_working_copy(default_path, data_path)
+    lap("files")
+
+    journal = journal_for(data_path)
+    given = controller
+    for attempt in range(2):
+        try:
+            header, events = journal.stream()
+            lap("read")
+            controller = given
+            if controller is None:
+                inventory = inv_store.inventory_from_dict(header)
+                controller = Controller(Scheduler(inventory))
+            lap("inventory")
+            ok, errors = controller.scheduler.ingest_events(events, validate=True)
+            break
+        except json.JSONDecodeError as exc:
+            if attempt:
+                raise
+            print("DEBUG bootstrap: corrupt working copy, restoring default:", exc)
+            journal.wait(raise_errors=False)
+            shutil.copyfile(str(data_path), str(data_path.with_name(data_path.name + ".corrupt")))
+            shutil.copyfile(str(default_path), str(data_path))
+            lap("files")
+    controller.set_events_path(data_path)
+    controller.set_journal(journal)
+    lap("events")
+
+    timings["total"] = sum(timings.values())
+    return Bootstrap(controller, header, None if ok else errors, timings)
@@ -1,15 +1,17 @@
 from pathlib import Path
 from datetime import timedelta, datetime
-from typing import Optional, Tuple, List, Union
+from typing import Optional, Tuple, List, Union, Callable
 import threading
 import json
 import os
 import queue
-from collections import defaultdict
-from bisect import bisect_left
+from itertools import islice
 
 from hotel_planner.core.scheduler import Scheduler
 from hotel_planner.models.event import Event
+from hotel_planner.models.journal import Journal, event_key
+from hotel_planner.models import sqlite_store
+from hotel_planner.models.json_stream import iter_events, counting
 from hotel_planner.models.resource import Room, Employee, Item
 
 
@@ -20,21 +22,50 @@ class Controller:
     Provee métodos sencillos y consistentes que la UI puede llamar:
     - list_resources() -> lista de dicts serializables
     - list_events() -> lista de dicts serializables
+    - events_between(start, end, resource, category) / events_at(t, resource, category) -> lista de dicts
     - add_event(data) -> (ok: bool, reason: Optional[str])
     - remove_event(name) -> (ok: bool, reason: Optional[str])
     - find_next_available(duration, resources, start_from, window_end, step_minutes) -> (start,end) | None
+    - find_slots(duration, resources, start_from, window_end, k, key) -> [(start,end), ...]
+    - free_intervals(duration, resources, start_from, window_end, limit) -> [(start,end), ...]
+    - find_slots_batch(requests, commit=False) -> [{'name', 'slot', 'error'}, ...]
+    - usage_hours(resource_name, start, end) -> float
+    - occupancy_matrix(start, end, bucket, resources) -> {resources, buckets, occupancy, capacity, utilization}
     - save_state(path) / load_state(path, validate=True)
+
+    With a journal attached (set_journal), saving to events_path appends one add_event /
+    remove_event operation per event that changed since the last save instead of rewriting the
+    snapshot, and loading replays them.
     """
 
-    def __init__(self, scheduler: Scheduler, events_path: Optional[Union[str, Path]] = None):
+    def __init__(self, scheduler: Scheduler, events_path: Optional[Union[str, Path]] = None, journal: Optional[Journal] = None):
         self.scheduler = scheduler
         self.events_path = Path(events_path) if events_path else None
+        self.journal = journal
         self._lock = threading.Lock()
+        # events as last saved to each journal / SQLite path (resolved path -> {key: dict}),
+        # read back from the target on the first save
+        self._saved = {}
+        self._save_lock = threading.Lock()
 
     def set_events_path(self, path: Union[str, Path]):
         self.events_path = Path(path)
         return self.events_path
 
+    def set_journal(self, journal: Optional[Journal]):
+        self.journal = journal
+        self._saved.clear()
+        return self.journal
+
+    def _journal_for_path(self, p: Path) -> Optional[Journal]:
+        """The attached journal if p is its snapshot, else None."""
+        if self.journal is None:
+            return None
+        try:
+            return self.journal if p.expanduser().resolve() == self.journal.snapshot_path.expanduser().resolve() else None
+        except OSError:
+            return None
+
     # -----------------------
     # Read helpers (UI <--- backend)
     # -----------------------
@@ -43,6 +74,16 @@ class Controller:
         with self._lock:
             return [e.to_dict() for e in self.scheduler.list_events()]
 
+    def events_between(self, start: datetime, end: datetime, resource: Optional[str] = None, category: Optional[str] = None) -> List[dict]:
+        """Events overlapping [start, end), optionally only those using resource or a resource of category."""
+        with self._lock:
+            return [e.to_dict() for e in self.scheduler.events_between(start, end, resource=resource, category=category)]
+
+    def events_at(self, t: datetime, resource: Optional[str] = None, category: Optional[str] = None) -> List[dict]:
+        """Events in progress at instant t, with the same optional filters as events_between."""
+        with self._lock:
+            return [e.to_dict() for e in self.scheduler.events_at(t, resource=resource, category=category)]
+
     def list_resources(self) -> List:
         """
         Devuelve la lista actual de Resource objects desde el inventory.
@@ -54,13 +95,41 @@ class Controller:
                 return []
             return list(getattr(inv, "resources", []))
 
-    def format_usage_intervals(self, resource_name: str, fmt: str = "%d/%m/%y %H:%M") -> List[str]:
+    def usage_hours(self, resource_name: str, start: datetime, end: datetime) -> float:
+        """Unit-hours of resource_name booked in [start, end) (recurring repeats included)."""
+        with self._lock:
+            return self.scheduler.usage_hours(resource_name, start, end)
+
+    def occupancy_matrix(self, start: datetime, end: datetime, bucket: Union[str, timedelta] = "hour",
+                         resources: Optional[List[str]] = None) -> dict:
+        """
+        Resource x time-bucket occupancy and utilization (see Scheduler.occupancy_matrix).
+        bucket: "15min", "hour", "day" or a timedelta. Requires NumPy.
+        """
+        with self._lock:
+            return self.scheduler.occupancy_matrix(start, end, bucket=bucket, resources=resources)
+
+    def resolve_requirements(self, names: List[Union[str, dict]]) -> List[str]:
+        """
+        Names that must be added so the selection satisfies every co-requisite,
+        following 'requires' transitively (cycle-safe, cached per inventory version).
+        """
+        plain = [n.get("name") if isinstance(n, dict) else n for n in names]
+        with self._lock:
+            inv = getattr(self.scheduler, "inventory", None)
+            if inv is None:
+                return []
+            return inv.required_closure([n for n in plain if n])
+
+    def format_usage_intervals(self, resource_name: str, fmt: str = "%d/%m/%y %H:%M",
+                               start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
         """
         Delega directamente en scheduler.format_usage_intervals bajo lock.
         Mantenerlo simple: no fallbacks ni lógica extra aquí.
+        start/end acotan la ventana (útil con eventos recurrentes, que no tienen fin).
         """
         with self._lock:
-            return self.scheduler.format_usage_intervals(resource_name, fmt)
+            return self.scheduler.format_usage_intervals(resource_name, fmt, start, end)
 
     # -----------------------
     # Resource creation helpers (UI ---> backend)
@@ -176,14 +245,28 @@ class Controller:
             return (True, None)
         return (False, f"Evento '{name}' no encontrado")
 
-    def find_next_available(
-        self,
-        duration: Union[int, float, timedelta],
-        resources: List[Union[str, dict]],
-        start_from: datetime,
-        window_end: datetime,
-        step_minutes: int = 30,
-    ) -> Optional[Tuple[datetime, datetime]]:
+    def put_resource(self, resource) -> None:
+        """Add a Resource to the in-memory inventory (persisting it is up to the caller)."""
+        with self._lock:
+            self.scheduler.inventory.add_resource(resource)
+
+    def remove_resource_cascade(self, name: str) -> Tuple[bool, int]:
+        """
+        Remove a resource from the in-memory inventory together with the events that use it.
+        Returns (found, removed_events); persisting it is up to the caller.
+        """
+        target = name.strip().lower()
+        with self._lock:
+            inventory = self.scheduler.inventory
+            if inventory.find_by_name(name) is None:
+                return (False, 0)
+            using = [ev.name for ev in self.scheduler.list_events() if target in ev.quantities]
+            for ev_name in using:
+                self.scheduler.remove_event(ev_name)
+            inventory.remove_resource(name)
+        return (True, len(using))
+
+    def _normalize_slot_request(self, duration, resources) -> Tuple[timedelta, List[dict]]:
         """
         duration: timedelta or number of minutes
         resources: list of names or dicts {'name', 'quantity'}
@@ -197,6 +280,22 @@ class Controller:
                 normalized.append({"name": r.get("name"), "quantity": int(r.get("quantity", 1))})
             else:
                 normalized.append({"name": r, "quantity": 1})
+        return (duration, normalized)
+
+    def find_next_available(
+        self,
+        duration: Union[int, float, timedelta],
+        resources: List[Union[str, dict]],
+        start_from: datetime,
+        window_end: datetime,
+        step_minutes: int = 30,
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """
+        duration: timedelta or number of minutes
+        resources: list of names or dicts {'name', 'quantity'}
+        step_minutes is accepted for compatibility; the scheduler returns exact starts.
+        """
+        duration, normalized = self._normalize_slot_request(duration, resources)
 
         if start_from is None or window_end is None:
             return None
@@ -205,12 +304,79 @@ class Controller:
         with self._lock:
             return self.scheduler.find_next_available(duration, normalized, start_from, window_end, step_minutes=step_minutes)
 
+    def find_slots(
+        self,
+        duration: Union[int, float, timedelta],
+        resources: List[Union[str, dict]],
+        start_from: datetime,
+        window_end: datetime,
+        k: int = 5,
+        key=None,
+        step_minutes: Optional[int] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Top-k alternative slots in a single sweep. Each free interval offers a start every
+        step_minutes (default: back-to-back slots of `duration`) while the booking still fits.
+        key(slot_start, slot_end) scores each candidate slot (lower is better); default is earliest first.
+        """
+        duration, normalized = self._normalize_slot_request(duration, resources)
+        if start_from is None or window_end is None or start_from >= window_end:
+            return []
+        with self._lock:
+            return self.scheduler.top_k_slots(duration, normalized, start_from, window_end, k=k, key=key,
+                                              step_minutes=step_minutes)
+
+    def free_intervals(
+        self,
+        duration: Union[int, float, timedelta],
+        resources: List[Union[str, dict]],
+        start_from: datetime,
+        window_end: datetime,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Merged free intervals (start, end) where duration fits, stopping after limit intervals.
+        The scheduler generator is consumed under the lock so the snapshot stays consistent.
+        """
+        duration, normalized = self._normalize_slot_request(duration, resources)
+        if start_from is None or window_end is None or start_from >= window_end:
+            return []
+        with self._lock:
+            intervals = self.scheduler.iter_free_intervals(duration, normalized, start_from, window_end)
+            if limit is not None:
+                intervals = islice(intervals, limit)
+            return list(intervals)
+
+    def find_slots_batch(self, requests: List[dict], commit: bool = False) -> List[dict]:
+        """
+        Batch version of find_next_available for spreadsheets of tentative bookings.
+        Each request: {'duration', 'resources', 'start_from', 'window_end', 'name'?, 'recurrence'?}
+        (duration as timedelta or minutes). The lock is taken once for the whole batch.
+        With commit=True each slot found is booked in order so later requests see it.
+        """
+        normalized = []
+        for req in requests:
+            item = dict(req)
+            try:
+                duration, resources = self._normalize_slot_request(req.get("duration"), req.get("resources") or [])
+            except (TypeError, ValueError):
+                # left as is: the scheduler reports it in this request's 'error'
+                normalized.append(item)
+                continue
+            item["duration"] = duration
+            item["resources"] = resources
+            normalized.append(item)
+        with self._lock:
+            return self.scheduler.find_slots_batch(normalized, commit=commit)
+
     # -----------------------
     # Persistence helpersI/O 
     # -----------------------
     def save_state(self, path: Optional[Union[str, Path]] = None) -> Tuple[bool, Optional[str]]:
         """
         Snapshot events under lock, then write JSON to disk outside the lock (avoid blocking UI/other threads).
+        With a journal, and for paths ending in .db / .sqlite / .sqlite3 (sqlite_store, resources
+        kept), only the events that changed since the last save are written (see _events_diff).
         """
         p = Path(path) if path else self.events_path
         if p is None:
@@ -221,6 +387,32 @@ class Controller:
             events_snapshot = [e.to_dict() for e in self.scheduler.list_events()]
 
         # perform I/O outside lock
+        journal = self._journal_for_path(p)
+        if journal is not None:
+            # only the events that changed, one compact line each; the snapshot (and its
+            # inventory) is left untouched
+            try:
+                with self._save_lock:
+                    removed, changed, current = self._events_diff(p, events_snapshot, journal.iter_events)
+                    ops = [{"op": "remove_event", "name": name} for name in removed]
+                    ops.extend({"op": "add_event", "event": ev} for ev in changed)
+                    if ops:
+                        journal.extend(ops)
+                    self._saved[self._saved_key(p)] = current
+                return (True, None)
+            except Exception as exc:
+                return (False, str(exc))
+        if sqlite_store.is_sqlite_path(p):
+            # single-row deletes / inserts, one transaction
+            try:
+                with self._save_lock, sqlite_store.SqliteStore(p) as db:
+                    removed, changed, current = self._events_diff(p, events_snapshot, db.list_events)
+                    if removed or changed:
+                        db.apply_changes(removed, changed)
+                    self._saved[self._saved_key(p)] = current
+                return (True, None)
+            except Exception as exc:
+                return (False, str(exc))
         try:
             p.parent.mkdir(parents=True, exist_ok=True)
             tmp = p.with_suffix(p.suffix + ".tmp") if p.suffix else Path(str(p) + ".tmp")
@@ -231,56 +423,65 @@ class Controller:
         except Exception as exc:
             return (False, str(exc))
 
-    def load_state(self, path: Optional[Union[str, Path]] = None, validate: bool = True) -> Tuple[bool, Optional[Union[None, dict]]]:
+    @staticmethod
+    def _saved_key(p: Path) -> Path:
+        return p.expanduser().resolve()
+
+    def _events_diff(self, p: Path, events_snapshot: List[dict], read_saved: Callable[[], list]):
+        """
+        (removed names, new/changed event dicts, current {key: dict}) against the events last saved
+        to p. The baseline is read once with read_saved() and then kept in memory; the caller stores
+        `current` as the new baseline once the write succeeded.
+        """
+        saved = self._saved.get(self._saved_key(p))
+        if saved is None:
+            saved = {event_key(ev): ev for ev in read_saved()}
+        current = {event_key(ev): ev for ev in events_snapshot}
+        removed = [ev.get("name") for key, ev in saved.items() if key not in current]
+        changed = [ev for key, ev in current.items() if saved.get(key) != ev]
+        return removed, changed, current
+
+    def load_state(self, path: Optional[Union[str, Path]] = None, validate: bool = True,
+                   progress: Optional[Callable[[int], None]] = None) -> Tuple[bool, Optional[Union[None, dict]]]:
         """
-        Read JSON from disk (I/O) first, then apply to scheduler under lock.
-        If validate=True each event is added via add_event (applies validations).
+        Stream the events from disk and parse them outside the lock.
+        The "events" array is decoded item by item (json_stream, with the journal applied on the
+        fly by Journal.stream) and each item becomes an Event as it is read (Scheduler.parse_events),
+        so neither the raw text nor a list of dicts is built; progress(n) is called every 5000
+        events read. The lock is held only for the final ingest_events, so UI calls are not
+        blocked by the disk read.
+        If validate=True events are added on top of the current ones with the same checks as add_event.
         If validate=False the scheduler indices are reconstructed atomically.
+        Both go through Scheduler.ingest_events (sort once, build indices in one pass).
+        SQLite paths (see save_state) are read with sqlite_store.
         """
         p = Path(path) if path else self.events_path
         if p is None:
             return (False, "No events_path configured")
-        if not p.exists():
+        journal = self._journal_for_path(p)
+        if not p.exists() and (journal is None or not journal.journal_path.exists()):
             return (False, f"File not found: {p}")
+        # the file may have been replaced (e.g. imported): read the save baseline again next time
+        self._saved.pop(self._saved_key(p), None)
 
-        # Read file (I/O) outside lock
         try:
-            with p.open("r", encoding="utf-8") as f:
-                payload = json.load(f)
-            events_data = payload.get("events", [])
+            if journal is not None:
+                items = journal.iter_events()
+            elif sqlite_store.is_sqlite_path(p):
+                items = sqlite_store.load_data(p).get("events", [])
+            else:
+                items = iter_events(p)
+            parsed, errors = Scheduler.parse_events(counting(items, progress=progress))
         except Exception as exc:
-            return (False, f"Error reading JSON: {exc}")
-
-        if validate:
-            errors = {}
-            for ed in events_data:
-                try:
-                    ev = Event.from_dict(ed)
-                except Exception as exc:
-                    errors[ed.get("name", "<unknown>")] = f"Invalid event data: {exc}"
-                    continue
-                ok, reason = self.add_event(ev)  # add_event uses the lock
-                if not ok:
-                    errors[ev.name] = reason
-            if errors:
-                return (False, errors)
-            return (True, None)
-        else:
-            # reconstruct indices atomically under lock
-            with self._lock:
-                self.scheduler.events_sorted = []
-                self.scheduler.name_to_event = {}
-                self.scheduler.resource_index = defaultdict(list)
-                for ed in events_data:
-                    ev = Event.from_dict(ed)
-                    starts = [e.start for e in self.scheduler.events_sorted]
-                    idx = bisect_left(starts, ev.start)
-                    self.scheduler.events_sorted.insert(idx, ev)
-                    self.scheduler.name_to_event[self.scheduler._normalize(ev.name)] = ev
-                    for entry in ev.resources:
-                        rname = self.scheduler._normalize(entry.get("name"))
-                        self.scheduler.resource_index[rname].append(ev)
-            return (True, None)
+            return (False, f"Error reading {p.name}: {exc}")
+
+        # apply in bulk under lock (one sort, one pass over the indices)
+        with self._lock:
+            if validate:
+                # validated load adds on top of the current state
+                return self.scheduler.ingest_events(parsed, validate=True, replace=False, parse_errors=errors)
+            # reconstruct indices atomically
+            return self.scheduler.ingest_events(parsed, validate=False, parse_errors=errors)
 
     # -----------------------
     # Async helpers for UI (worker threads + result queue)
@@ -296,9 +497,11 @@ class Controller:
 
     def load_state_async(self, result_q: queue.Queue, path: Optional[Union[str, Path]] = None, validate: bool = True):
         """
-        Launch load_state in a background thread. Puts tuple ("load_done", ok, info) in result_q.
+        Launch load_state in a background thread. Puts ("load_progress", n) while reading
+        and the tuple ("load_done", ok, info) at the end in result_q.
         """
         def worker():
-            ok, info = self.load_state(path, validate=validate)
+            ok, info = self.load_state(path, validate=validate,
+                                       progress=lambda n: result_q.put(("load_progress", n)))
             result_q.put(("load_done", ok, info))
         threading.Thread(target=worker, daemon=True).start()
\ No newline at end of file
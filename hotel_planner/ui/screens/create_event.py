@@ -9,6 +9,7 @@ import json
 import os
 from tkcalendar import DateEntry
 from hotel_planner.models import event_store as ev_store
+from hotel_planner.models.journal import journal_for
 
 
 # ============================================================
@@ -243,6 +244,16 @@ class ManageEventsView(ctk.CTkFrame):
         )
         scan_btn.pack(side="left")
 
+        deps_btn = ctk.CTkButton(
+            btn_row,
+            text="🔗 Completar dependencias",
+            command=self._complete_requirements,
+            width=190,
+            corner_radius=6,
+            hover_color="#059669"
+        )
+        deps_btn.pack(side="left", padx=(8, 0))
+
         # Recurrence & notes
         bottom = ctk.CTkFrame(self)
         bottom.pack(fill="x", padx=padx, pady=(12, 16))
@@ -359,6 +370,31 @@ class ManageEventsView(ctk.CTkFrame):
         except Exception:
             pass
 
+    def _complete_requirements(self):
+        """Añade filas para los co-requisitos (directos e indirectos) que falten en la selección."""
+        selected = self._gather_resources()
+        if not selected:
+            msg.showinfo("Dependencias", "Añade primero algún recurso.")
+            return
+        try:
+            missing = self.controller.resolve_requirements(selected)
+        except Exception as e:
+            msg.showerror("Error", f"No se pudieron calcular las dependencias: {e}")
+            return
+        if not missing:
+            msg.showinfo("Dependencias", "La selección ya incluye todos sus co-requisitos.")
+            return
+        # reutilizar filas vacías antes de crear nuevas
+        empty_rows = [r for r in self._resource_rows if not r["combo"].get().strip()]
+        for name in missing:
+            if empty_rows:
+                row = empty_rows.pop(0)
+                row["combo"].set(name)
+                row["qty"].set(1)
+            else:
+                self._add_resource_row({"name": name, "quantity": 1})
+        msg.showinfo("Dependencias", "Añadidos: " + ", ".join(missing))
+
     def _update_duration(self):
         s = self.start_picker.get().strip()
         e = self.end_picker.get().strip()
@@ -426,19 +462,26 @@ class ManageEventsView(ctk.CTkFrame):
         window_end = start_from + timedelta(days=30)
 
         try:
-            res = self.controller.find_next_available(duration_mins, resources, start_from, window_end)
+            if hasattr(self.controller, "find_slots"):
+                options = self.controller.find_slots(duration_mins, resources, start_from, window_end, k=5)
+            else:
+                res = self.controller.find_next_available(duration_mins, resources, start_from, window_end)
+                options = [res] if res else []
         except Exception as e:
             msg.showerror("Error", f"Error buscando hueco: {e}")
             return
 
-        if not res:
+        if not options:
             msg.showinfo("No hay hueco", "No se encontró un intervalo disponible en el próximo mes.")
             return
 
-        proposed_start, proposed_end = res
+        proposed_start, proposed_end = options[0]
         proposed_start = proposed_start.replace(second=0, microsecond=0)
         proposed_end = proposed_end.replace(second=0, microsecond=0)
         pretty = f"{proposed_start.isoformat()} → {proposed_end.isoformat()}"
+        alternatives = "\n".join(f"  • {s.strftime('%d/%m/%y %H:%M')} → {e.strftime('%d/%m/%y %H:%M')}" for s, e in options[1:])
+        if alternatives:
+            pretty += f"\n\nOtras opciones:\n{alternatives}"
         if not msg.askyesno("Propuesta de hueco", f"Se propone el siguiente intervalo:\n\n{pretty}\n\n¿Desea usarlo?"):
             return
 
@@ -518,17 +561,9 @@ class ManageEventsView(ctk.CTkFrame):
 
                 if saved:
                     try:
+                        # sólo se añade el alta al diario (no se reescribe data.json entero)
                         DATA = Path.home() / ".hotel_planner" / "data.json"
-                        try:
-                            payload = json.loads(DATA.read_text(encoding="utf-8")) if DATA.exists() else {"version": 1, "inventory": {"resources": []}, "events": []}
-                        except Exception:
-                            payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-                        payload["events"] = existing
-                        tmp = DATA.with_name(DATA.name + ".tmp")
-                        DATA.parent.mkdir(parents=True, exist_ok=True)
-                        with tmp.open("w", encoding="utf-8") as f:
-                            json.dump(payload, f, ensure_ascii=False, indent=2)
-                        os.replace(str(tmp), str(DATA))
+                        journal_for(DATA).append({"op": "add_event", "event": event})
                         try:
                             root = self.winfo_toplevel()
                             root.event_generate("<<EventsChanged>>", when="tail")
@@ -559,16 +594,7 @@ class ManageEventsView(ctk.CTkFrame):
 
                 try:
                     DATA = Path.home() / ".hotel_planner" / "data.json"
-                    try:
-                        payload = json.loads(DATA.read_text(encoding="utf-8")) if DATA.exists() else {"version": 1, "inventory": {"resources": []}, "events": []}
-                    except Exception:
-                        payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-                    payload["events"] = existing
-                    tmp = DATA.with_name(DATA.name + ".tmp")
-                    DATA.parent.mkdir(parents=True, exist_ok=True)
-                    with tmp.open("w", encoding="utf-8") as f:
-                        json.dump(payload, f, ensure_ascii=False, indent=2)
-                    os.replace(str(tmp), str(DATA))
+                    journal_for(DATA).append({"op": "add_event", "event": event})
                     try:
                         root = self.winfo_toplevel()
                         root.event_generate("<<EventsChanged>>", when="tail")
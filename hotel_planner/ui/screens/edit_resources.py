@@ -1,7 +1,3 @@
-import json
-import os
-import tempfile
-import uuid
 import tkinter as tk
 import tkinter.messagebox as msg
 import tkinter.ttk as ttk
@@ -10,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 from hotel_planner.models import inventory_store as inv_store
+from hotel_planner.models.journal import journal_for
 from hotel_planner.ui.form_validation import ValidationFeedback, FormValidator
 
 class AddRemoveResourceView(ctk.CTkFrame):
@@ -152,23 +149,9 @@ class AddRemoveResourceView(ctk.CTkFrame):
 
     def _write_working_inventory(self, resource_dict):
         # always write to single DATA file ~/.hotel_planner/data.json
+        # (through its journal: the new resource is appended instead of rewriting the file)
         DATA = Path.home() / ".hotel_planner" / "data.json"
-        try:
-            try:
-                payload = json.loads(DATA.read_text(encoding="utf-8")) if DATA.exists() else {"version": 1, "inventory": {"resources": []}, "events": []}
-            except Exception:
-                payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-            inv = payload.get("inventory") or {"resources": []}
-            resources = inv.get("resources", [])
-            resources.append(resource_dict)
-            payload["inventory"] = {"resources": resources}
-            tmp = DATA.with_name(DATA.name + ".tmp")
-            DATA.parent.mkdir(parents=True, exist_ok=True)
-            with tmp.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            os.replace(str(tmp), str(DATA))
-        except Exception as e:
-            raise
+        journal_for(DATA).append({"op": "put_resource", "resource": resource_dict})
 
     def _on_save(self):
         name = self.name_var.get().strip()
@@ -194,17 +177,15 @@ class AddRemoveResourceView(ctk.CTkFrame):
         except Exception:
             existing_names = set()
 
-        # fallback: leer DATA data.json si controller no devolvió nada
+        # fallback: inventario en memoria del controller (sin releer data.json + diario)
         if not existing_names:
             try:
-                DATA = Path.home() / ".hotel_planner" / "data.json"
-                if DATA.exists():
-                    payload = json.loads(DATA.read_text(encoding="utf-8") or "{}")
-                    resources_list = (payload.get("inventory") or {}).get("resources", []) or []
-                    for rr in resources_list:
-                        n = rr.get("name") if isinstance(rr, dict) else getattr(rr, "name", None)
-                        if n:
-                            existing_names.add(str(n).strip().lower())
+                inventory = getattr(getattr(self.controller, "scheduler", None), "inventory", None) \
+                    or getattr(self.controller, "inventory", None)
+                for rr in getattr(inventory, "resources", []) or []:
+                    n = getattr(rr, "name", None)
+                    if n:
+                        existing_names.add(str(n).strip().lower())
             except Exception:
                 pass
 
@@ -249,42 +230,10 @@ class AddRemoveResourceView(ctk.CTkFrame):
         try:
             self._write_working_inventory(r)
 
-            # reload DATA inventory and update runtime objects so UI sees change immediately
-            DATA = Path.home() / ".hotel_planner" / "data.json"
-            new_inv = None
-            try:
-                if DATA.exists():
-                    payload = json.loads(DATA.read_text(encoding="utf-8") or "{}")
-                    inv_payload = {"version": payload.get("version", 1), "resources": (payload.get("inventory") or {}).get("resources", [])}
-                    # write ephemeral file and load via inv_store to get Inventory object
-                    tmp_name = f"hotel_planner_inv_{os.getpid()}_{uuid.uuid4().hex}.json"
-                    tmp_path = Path(tempfile.gettempdir()) / tmp_name
-                    tmp_path.write_text(json.dumps(inv_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-                    try:
-                        new_inv = inv_store.load_inventory_from_json(tmp_path)
-                    except Exception:
-                        new_inv = None
-                    try:
-                        tmp_path.unlink()
-                    except Exception:
-                        pass
-            except Exception:
-                new_inv = None
-
-            # try to update controller/scheduler in-memory inventory
+            # update the in-memory inventory directly so the UI sees the change immediately
             try:
-                if self.controller and new_inv is not None:
-                    # scheduler preferred
-                    if hasattr(self.controller, "scheduler") and getattr(self.controller, "scheduler", None) is not None:
-                        try:
-                            setattr(self.controller.scheduler, "inventory", new_inv)
-                        except Exception:
-                            pass
-                    # also set top-level controller.inventory if present
-                    try:
-                        setattr(self.controller, "inventory", new_inv)
-                    except Exception:
-                        pass
+                if self.controller is not None and hasattr(self.controller, "put_resource"):
+                    self.controller.put_resource(inv_store.resource_from_dict(r))
             except Exception:
                 pass
 
@@ -8,6 +8,7 @@ from pathlib import Path
 import json
 import os
 import tkinter.messagebox as msg
+from hotel_planner.models.journal import journal_for
 
 class PlannedEventsView(ctk.CTkFrame):
     """Pantalla para listar y gestionar eventos planificados en una tabla."""
@@ -221,6 +222,8 @@ class PlannedEventsView(ctk.CTkFrame):
             return {}
         if isinstance(ev, dict):
             out = dict(ev)
+        elif hasattr(ev, "to_dict"):
+            out = ev.to_dict()
         else:
             try:
                 out = dict(getattr(ev, "__dict__", {})) or {}
@@ -285,18 +288,9 @@ class PlannedEventsView(ctk.CTkFrame):
             removed = existing.pop(match_idx)
             # build serializable list
             serializable = [self._serialize_event(e) for e in existing]
+            removed = self._serialize_event(removed)
             DATA = Path.home() / ".hotel_planner" / "data.json"
-            try:
-                payload = json.loads(DATA.read_text(encoding="utf-8")) if DATA.exists() else {"version": 1, "inventory": {"resources": []}, "events": []}
-            except Exception:
-                payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-
-            payload["events"] = serializable
-            tmp = DATA.with_name(DATA.name + ".tmp")
-            DATA.parent.mkdir(parents=True, exist_ok=True)
-            with tmp.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            os.replace(str(tmp), str(DATA))
+            journal_for(DATA).append({"op": "remove_event", "name": removed.get("name")})
 
             # update controller/scheduler in-memory
             try:
@@ -1,11 +1,7 @@
 import tkinter as tk
 import tkinter.messagebox as msg
-import json
-import os
-import tempfile
-import uuid
 from pathlib import Path
-from hotel_planner.models import inventory_store as inv_store
+from hotel_planner.models.journal import journal_for
 import customtkinter as ctk
 from typing import Optional, Dict, List, Any
 from hotel_planner.models.resource import Resource, Room, Employee, Item
@@ -189,6 +185,8 @@ class EditResourceDialog(ctk.CTkToplevel):
             resource.requires = self._parse_csv(self.requires_entry.get())
             resource.excludes = self._parse_csv(self.excludes_entry.get())
             resource.excludes_categories = self._parse_csv(self.excl_cat_entry.get())
+            if self.inventory is not None and hasattr(self.inventory, "touch"):
+                self.inventory.touch()
 
             # Persistir los cambios en el archivo JSON y recargar en el controlador
             self._persist_changes()
@@ -208,35 +206,21 @@ class EditResourceDialog(ctk.CTkToplevel):
         if not self.inventory:
             return
 
-        # Serializar todos los recursos del inventario
-        resources_data = [r.to_dict() for r in self.inventory.resources]
-
-        # Leer el archivo data.json actual
+        # Añadir la modificación al diario: sólo el recurso editado (o todo el inventario si no se conoce)
         DATA = Path.home() / ".hotel_planner" / "data.json"
-        try:
-            if DATA.exists():
-                payload = json.loads(DATA.read_text(encoding="utf-8"))
-            else:
-                payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-        except Exception:
-            payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-
-        # Actualizar la sección de inventario
-        payload["inventory"] = {"resources": resources_data}
-
-        # Escribir de forma atómica
-        tmp = DATA.with_name(DATA.name + ".tmp")
-        DATA.parent.mkdir(parents=True, exist_ok=True)
-        with tmp.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-        os.replace(str(tmp), str(DATA))
+        journal = journal_for(DATA)
+        if self.resource is not None:
+            journal.append({"op": "put_resource", "resource": self.resource.to_dict()})
+        else:
+            journal.append({"op": "set_inventory", "resources": [r.to_dict() for r in self.inventory.resources]})
 
         # Notificar a la vista (ya se hará desde el diálogo)
         # También podemos actualizar el controlador si tiene algún método de recarga
         try:
             if self.controller and hasattr(self.controller, "load_events"):
-                # Recargar eventos por si cambiaron nombres (aunque no cambiamos nombre)
-                events = payload.get("events", [])
+                # Recargar eventos por si cambiaron nombres (aunque no cambiamos nombre);
+                # salen del estado en memoria, no de releer data.json + diario
+                events = self.controller.list_events()
                 self.controller.load_events(events)
         except Exception:
             pass
@@ -504,82 +488,22 @@ class InventoryView(ctk.CTkFrame):
         self._delete_resource_from_json(resource_name)
 
     def _delete_resource_from_json(self, name: str):
-        """Delete resource directly from JSON data file."""
+        """Delete resource from the in-memory inventory/scheduler and record it in the data journal."""
         try:
-            DATA = Path.home() / ".hotel_planner" / "data.json"
-            if DATA.exists():
-                raw = DATA.read_text(encoding="utf-8")
-                payload = json.loads(raw) if raw.strip() else {"version": 1, "inventory": {"resources": []}, "events": []}
-            else:
-                payload = {"version": 1, "inventory": {"resources": []}, "events": []}
-
-            resources = (payload.get("inventory") or {}).get("resources", [])
-            before = len(resources)
-            resources = [r for r in resources if (r.get("name") or "") != name]
-            after = len(resources)
-            
-            if after == before:
+            found, removed_count = (False, 0)
+            if self.controller is not None and hasattr(self.controller, "remove_resource_cascade"):
+                # same lock as every other scheduler access
+                found, removed_count = self.controller.remove_resource_cascade(name)
+            if not found:
                 msg.showwarning("No encontrado", f"No se encontró '{name}' en el inventario.")
                 return
-            
-            payload["inventory"] = {"resources": resources}
-
-            # Remove events using this resource
-            evs = payload.get("events", []) or []
-            keep = []
-            removed_count = 0
-            target = name.strip().lower()
-            
-            for ev in evs:
-                try:
-                    ev_resources = ev.get("resources", []) if isinstance(ev, dict) else []
-                    used = any(
-                        (er.get("name") if isinstance(er, dict) else getattr(er, "name", "")).strip().lower() == target
-                        for er in ev_resources
-                    )
-                    if not used:
-                        keep.append(ev)
-                    else:
-                        removed_count += 1
-                except Exception:
-                    keep.append(ev)
-            
-            if removed_count > 0:
-                payload["events"] = keep
 
-            # Write atomically
-            tmp = DATA.with_name(DATA.name + ".tmp")
-            DATA.parent.mkdir(parents=True, exist_ok=True)
-            with tmp.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            os.replace(str(tmp), str(DATA))
-
-            # Reload inventory
-            try:
-                inv_payload = {"version": payload.get("version", 1), "resources": (payload.get("inventory") or {}).get("resources", [])}
-                tmp_name = f"hotel_planner_inv_{os.getpid()}_{uuid.uuid4().hex}.json"
-                tmp_path = Path(tempfile.gettempdir()) / tmp_name
-                tmp_path.write_text(json.dumps(inv_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-                try:
-                    new_inv = inv_store.load_inventory_from_json(tmp_path)
-                    if self.controller:
-                        if hasattr(self.controller, "scheduler"):
-                            setattr(self.controller.scheduler, "inventory", new_inv)
-                        setattr(self.controller, "inventory", new_inv)
-                except Exception:
-                    pass
-                finally:
-                    try:
-                        tmp_path.unlink()
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            # Append to the journal (replay drops the resource and, with cascade, its events)
+            DATA = Path.home() / ".hotel_planner" / "data.json"
+            journal_for(DATA).append({"op": "remove_resource", "name": name, "cascade": removed_count > 0})
 
             # Notify listeners
             try:
-                if removed_count > 0 and self.controller and hasattr(self.controller, "load_events"):
-                    self.controller.load_events(payload.get("events", []))
                 root = self.winfo_toplevel()
                 root.event_generate("<<InventoryChanged>>", when="tail")
                 if removed_count > 0: